@@ -0,0 +1,59 @@
+from gridworld.actor import ActorWorld, Bug, Critter, Flower, Rock
+from gridworld.grid import BoundedGrid
+
+import sys
+import time
+import typing
+
+
+def legacy_loop(frame, seconds:float):
+    # the polling loop WorldFrame.mainloop used to run
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        while not frame.ui_update_actions.empty():
+            action_func = frame.ui_update_actions.get()
+            action_func()
+        frame.update()
+        frame.update_idletasks()
+
+
+def event_loop(frame, seconds:float):
+    frame.after(int(seconds * 1000), frame.quit)
+    frame.tk.mainloop()
+
+
+def idle_cpu(loop, frame, seconds:float) -> float:
+    '''
+    * @return the share of one core the process used while the window sat idle
+    '''
+    wall = time.monotonic()
+    cpu = time.process_time()
+    loop(frame, seconds)
+    return (time.process_time() - cpu) / (time.monotonic() - wall)
+
+
+def main(argv:typing.List[str]):
+    seconds = float(argv[0]) if argv else 5.0
+    from gridworld.gui import WorldFrame
+
+    world = ActorWorld(BoundedGrid(20, 20), 0)
+    for cls in (Rock, Flower, Flower, Bug, Critter):
+        for _ in range(10):
+            world.add(cls())
+    frame = WorldFrame(world)
+    world.frame = frame
+    frame.setVisible(True)
+    frame.rerender()
+    frame.wake()
+    frame.update()
+
+    print("{:<8} {:6.1f} % of a core over {} s idle".format(
+        "polling", 100 * idle_cpu(legacy_loop, frame, seconds), seconds
+    ))
+    print("{:<8} {:6.1f} % of a core over {} s idle".format(
+        "events", 100 * idle_cpu(event_loop, frame, seconds), seconds
+    ))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
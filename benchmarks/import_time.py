@@ -0,0 +1,60 @@
+import statistics
+import subprocess
+import sys
+import typing
+
+MODULES = (
+    "gridworld.grid",
+    "gridworld.world",
+    "gridworld.actor",
+    "gridworld.engine",
+    "gridworld.gui",
+)
+
+GUI_MODULES = ("tkinter", "PIL")
+
+
+def import_cost(module:str, repeat:int = 5) -> typing.Tuple[float, typing.List[str]]:
+    '''
+    * Imports the module in a fresh interpreter and reads -X importtime output.
+    * @return the median cumulative import time in milliseconds and the GUI
+    * modules that were pulled in along the way
+    '''
+    samples = list()
+    loaded = list()
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import " + module],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        loaded = list()
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            name = name.strip()
+            if name == module:
+                samples.append(int(cumulative) / 1000)
+            if name in GUI_MODULES:
+                loaded.append(name)
+    return statistics.median(samples), loaded
+
+
+def main(argv:typing.List[str]):
+    modules = argv or MODULES
+    for module in modules:
+        try:
+            ms, loaded = import_cost(module)
+        except RuntimeError as e:
+            print("{:<20} failed: {}".format(module, e))
+            continue
+        print("{:<20} {:8.2f} ms   gui modules: {}".format(
+            module, ms, ", ".join(loaded) if loaded else "none"
+        ))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
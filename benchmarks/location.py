@@ -0,0 +1,92 @@
+from gridworld.grid import BoundedGrid, Location
+
+import sys
+import time
+import tracemalloc
+import typing
+
+
+class LegacyLocation:
+    '''
+    * The dict-backed Location this module is compared against: a fresh
+    * instance with a __dict__ and an 8 entry dict literal per neighbour.
+    '''
+
+    def __init__(self, r:int, c:int):
+        self.row = r
+        self.col = c
+
+    def getAdjacentLocation(self, direction:int) -> "LegacyLocation":
+        adjustedDirection = (direction + Location.HALF_RIGHT // 2) % Location.FULL_CIRCLE
+        adjustedDirection = (adjustedDirection // Location.HALF_RIGHT) * Location.HALF_RIGHT
+        dc, dr = {
+            Location.EAST: (1, 0),
+            Location.SOUTHEAST: (1, 1),
+            Location.SOUTH: (0, 1),
+            Location.SOUTHWEST: (-1, 1),
+            Location.WEST: (-1, 0),
+            Location.NORTHWEST: (-1, -1),
+            Location.NORTH: (0, -1),
+            Location.NORTHEAST: (1, -1)
+        }[adjustedDirection]
+        return self.__class__(self.row + dr, self.col + dc)
+
+
+def stepwise_neighbors(grid:BoundedGrid, loc) -> list:
+    # one getAdjacentLocation call, and so one allocation or intern lookup,
+    # per direction, as Bug.move and Bug.can_move make them
+    found = list()
+    for d in range(Location.NORTH, Location.FULL_CIRCLE, Location.HALF_RIGHT):
+        neighbor = loc.getAdjacentLocation(d)
+        if grid.is_valid(neighbor):
+            found.append(neighbor)
+    return found
+
+
+def slotted_neighbors(grid:BoundedGrid, loc:Location) -> typing.List[Location]:
+    return list(grid.valid_adjacent_locations(loc))
+
+
+def measure(label:str, calls:int, make, query, moving:bool = False):
+    '''
+    * @param moving - make each queried location afresh, as an actor that has
+    * just moved holds one, rather than reusing the same few thousand objects
+    '''
+    grid = BoundedGrid(64, 64)
+    # a few thousand hot coordinates, like the cells a swarm keeps revisiting
+    cells = [(r, c) for r in range(grid.row_count) for c in range(grid.col_count)]
+    locations = [make(r, c) for r, c in cells]
+    start = time.perf_counter()
+    if moving:
+        for i in range(calls):
+            query(grid, make(*cells[i % len(cells)]))
+    else:
+        for i in range(calls):
+            query(grid, locations[i % len(locations)])
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    if moving:
+        kept = [query(grid, make(*cells[i % len(cells)])) for i in range(calls // 10)]
+    else:
+        kept = [query(grid, locations[i % len(locations)]) for i in range(calls // 10)]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    print("{:<12} {:8.3f} s per {} neighbour queries   {:8.1f} MiB peak per {}".format(
+        label, elapsed, calls, peak / 2**20, calls // 10
+    ))
+
+
+def main(argv:typing.List[str]):
+    calls = int(argv[0]) if argv else 1000000
+    measure("legacy", calls, LegacyLocation, stepwise_neighbors)
+    measure("uncached", calls, Location, stepwise_neighbors)
+    measure("slotted", calls, Location, slotted_neighbors)
+    measure("interned", calls, Location.of, slotted_neighbors)
+    measure("moving", calls, Location, slotted_neighbors, moving=True)
+    measure("moving lru", calls, Location.of, slotted_neighbors, moving=True)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
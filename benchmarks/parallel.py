@@ -0,0 +1,73 @@
+'''
+* Times ActorWorld stepping with the parallel engine over several worker
+* counts; the final digest must not depend on the number of workers:
+*
+*   python -m benchmarks.parallel --size 4000x4000 --workers 1,2,4,8,16
+'''
+
+from benchmarks.suite import SCENARIOS, populate
+from gridworld.grid import BoundedGrid
+from gridworld.sweep import digest
+
+import argparse
+import os
+import sys
+import time
+import typing
+
+
+def time_steps(scenario:str, rows:int, cols:int, seed:int, steps:int,
+               workers:int = None, stripe_rows:int = None) -> typing.Tuple[float, str]:
+    '''
+    * Steps a fresh world, serially when workers is None.
+    * @return the mean seconds per step and the digest of the final grid
+    '''
+    world = populate(BoundedGrid(rows, cols), scenario, rows, cols, seed)
+    if workers is not None:
+        world.use_parallel_engine(workers=workers, stripe_rows=stripe_rows)
+    start = time.perf_counter()
+    for _ in range(steps):
+        world.step()
+    elapsed = time.perf_counter() - start
+    if workers is not None:
+        world.use_parallel_engine(False)
+    return elapsed / steps, digest(world)
+
+
+def main(argv:typing.List[str]):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.parallel')
+    parser.add_argument('--size', default='1000x1000')
+    parser.add_argument('--scenario', default='critters', choices=sorted(SCENARIOS))
+    parser.add_argument('--workers', default=None, help='comma-separated worker counts')
+    parser.add_argument('--stripe-rows', type=int, default=None)
+    parser.add_argument('--steps', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--serial', action='store_true', help='also time ActorWorld.step on one core')
+    args = parser.parse_args(argv)
+
+    rows, cols = (int(n) for n in args.size.split('x'))
+    if args.workers is None:
+        counts = [1]
+        while counts[-1] * 2 <= (os.cpu_count() or 1):
+            counts.append(counts[-1] * 2)
+    else:
+        counts = [int(n) for n in args.workers.split(',')]
+
+    print("{} {}x{}, {} steps".format(args.scenario, rows, cols, args.steps))
+    if args.serial:
+        seconds, final = time_steps(args.scenario, rows, cols, args.seed, args.steps)
+        print("{:<10} {:>10.3f} s/step {:>10} {}".format("serial", seconds, "", final[:16]))
+    base = None
+    for count in counts:
+        seconds, final = time_steps(
+            args.scenario, rows, cols, args.seed, args.steps, count, args.stripe_rows
+        )
+        if base is None:
+            base = seconds
+        print("{:<10} {:>10.3f} s/step {:>9.2f}x {}".format(
+            "{} workers".format(count), seconds, base / seconds, final[:16]
+        ))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
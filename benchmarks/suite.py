@@ -0,0 +1,416 @@
+'''
+* Times grid operations, ActorWorld.step and frame rendering over fixed-seed
+* scenarios and writes the figures as JSON; compare reports the change
+* between two such files, flagging step digests that moved:
+*
+*   python -m benchmarks.suite run --out before.json
+*   python -m benchmarks.suite compare before.json after.json
+'''
+
+from gridworld.actor import ActorWorld, Rock
+from gridworld.grid import BoundedGrid, Grid, Location
+from gridworld.store import StoreGrid
+from gridworld.sweep import GRID_TYPES, digest, population, resolve_type
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import typing
+
+FORMAT_VERSION = 1
+
+SIZES = ((20, 20), (50, 50), (100, 100))
+
+# grid operations per sample; small grids repeat the operation to get there
+GRID_OPS = 50000
+
+# name -> (class, share of the cells) pairs
+SCENARIOS = {
+    'bugs-sparse': (('Bug', 0.05),),
+    'bugs-dense': (('Bug', 0.40),),
+    'critters': (('Critter', 0.20), ('Rock', 0.05)),
+    'crabs': (('critters.CrabCritter', 0.15), ('Flower', 0.10)),
+    'flowers': (('Flower', 0.60),),
+}
+
+STEP_GRIDS = ('BoundedGrid', 'UnboundedGrid')
+# grids whose cells only hold actors; the grid benchmarks put Rocks in them
+ACTOR_GRIDS = ('StoreGrid',)
+
+CELL_SIZE = 24
+
+
+def populate(grid:Grid, scenario:str, rows:int, cols:int, seed:int) -> ActorWorld:
+    '''
+    * Places the scenario's actors on distinct cells of the rows x cols block
+    * at the origin, so bounded and unbounded grids hold the same layout.
+    '''
+    world = ActorWorld(grid, seed)
+    layout = random.Random(seed)
+    kinds = list()
+    for name, share in SCENARIOS[scenario]:
+        kinds.extend([resolve_type(name)] * int(share * rows * cols))
+    cells = layout.sample(range(rows * cols), len(kinds))
+    for cls, cell in zip(kinds, cells):
+        actor = cls()
+        actor.direction = layout.randrange(0, Location.FULL_CIRCLE, Location.HALF_RIGHT)
+        world.add(actor, Location(*divmod(cell, cols)))
+    return world
+
+
+def make_grid(name:str, rows:int, cols:int) -> Grid:
+    grid_type = GRID_TYPES[name]
+    if issubclass(grid_type, (BoundedGrid, StoreGrid)):
+        return grid_type(rows, cols)
+    return grid_type()
+
+
+def timed(setup:typing.Callable[[], typing.Any], run:typing.Callable[[typing.Any], typing.Any],
+          repeat:int, rounds:int = 1) -> typing.Tuple[typing.List[float], typing.Any]:
+    '''
+    * Calls run(setup()) rounds times per repetition, timing only run. As
+    * with timeit, the collector is off while run is timed.
+    * @return the seconds of each repetition and the last run's result
+    '''
+    samples = list()
+    result = None
+    collecting = gc.isenabled()
+    for _ in range(repeat):
+        elapsed = 0.0
+        gc.collect()
+        gc.disable()
+        try:
+            for _ in range(rounds):
+                state = setup()
+                start = time.perf_counter()
+                result = run(state)
+                elapsed += time.perf_counter() - start
+        finally:
+            if collecting:
+                gc.enable()
+        samples.append(elapsed)
+    return samples, result
+
+
+def record(name:str, group:str, params:dict, samples:typing.List[float], ops:int, **extra) -> dict:
+    best = min(samples)
+    entry = {
+        'name': name,
+        'group': group,
+        'params': params,
+        'seconds': samples,
+        'best': best,
+        'median': statistics.median(samples),
+        'ops': ops,
+        'ops_per_second': ops / best if best > 0 else None,
+    }
+    entry.update(extra)
+    return entry
+
+
+def wanted(name:str, match:str) -> bool:
+    # benchmarks are skipped before anything is built for them
+    return match is None or match in name
+
+
+def grid_benchmarks(sizes, repeat:int, match:str = None) -> typing.Iterator[dict]:
+    for rows, cols in sizes:
+        cells = [Location(*divmod(i, cols)) for i in range(rows * cols)]
+        chosen = random.Random(0).sample(cells, int(0.3 * len(cells)))
+        for grid_name in GRID_TYPES:
+            params = {'grid': grid_name, 'rows': rows, 'cols': cols, 'occupants': len(chosen)}
+
+            def empty():
+                # what goes in each chosen cell is made here, outside the timing
+                if grid_name in ACTOR_GRIDS:
+                    return make_grid(grid_name, rows, cols), [Rock() for _ in chosen]
+                return make_grid(grid_name, rows, cols), chosen
+
+            def filled():
+                grid, items = empty()
+                put((grid, items))
+                return grid
+
+            def put(state):
+                grid, items = state
+                for loc, item in zip(chosen, items):
+                    grid.put(loc, item)
+
+            def get(grid):
+                for loc in cells:
+                    grid.get(loc)
+
+            def neighbors(grid):
+                for loc in chosen:
+                    grid.neighbors(loc)
+
+            def occupied(grid):
+                return len(list(grid.occupied_locations))
+
+            def remove(grid):
+                for loc in chosen:
+                    grid.remove(loc)
+
+            for op, setup, run, ops in (
+                    ('put', empty, put, len(chosen)),
+                    ('get', filled, get, len(cells)),
+                    ('neighbors', filled, neighbors, len(chosen)),
+                    ('occupied_locations', filled, occupied, len(chosen)),
+                    ('remove', filled, remove, len(chosen))):
+                name = 'grid/{}/{}/{}x{}'.format(op, grid_name, rows, cols)
+                if not wanted(name, match):
+                    continue
+                rounds = max(1, GRID_OPS // ops)
+                samples, _ = timed(setup, run, repeat, rounds)
+                yield record(name, 'grid', params, samples, ops * rounds)
+
+
+def step_benchmarks(sizes, repeat:int, steps:int, seed:int, match:str = None) -> typing.Iterator[dict]:
+    for rows, cols in sizes:
+        for scenario in SCENARIOS:
+            for grid_name in STEP_GRIDS:
+                name = 'step/{}/{}/{}x{}'.format(scenario, grid_name, rows, cols)
+                if not wanted(name, match):
+                    continue
+                params = {'scenario': scenario, 'grid': grid_name, 'rows': rows, 'cols': cols,
+                          'steps': steps, 'seed': seed}
+
+                def setup():
+                    return populate(make_grid(grid_name, rows, cols), scenario, rows, cols, seed)
+
+                def run(world):
+                    for _ in range(steps):
+                        world.step()
+                    return world
+
+                samples, world = timed(setup, run, repeat)
+                yield record(
+                    name, 'step', params, samples, steps,
+                    digest=digest(world), population=population(world)
+                )
+
+
+class OffscreenFrame:
+    '''
+    * Composes what GridPanel would put on screen into a PIL image: the grid
+    * lines and one colorized, rotated sprite per occupant, with a warm
+    * sprite cache as in a running GUI.
+    '''
+
+    def __init__(self, rows:int, cols:int, cell_size:int = CELL_SIZE):
+        from gridworld import gui
+        from gridworld.sprites import SpriteCache
+        self.gui = gui
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+        self.bd = gui.GridPanel.DEFAULT_BORDER_WIDTH
+        self.sprites = SpriteCache()
+        self.sources = dict()
+
+    def source(self, cls:type):
+        from PIL import Image
+        if cls not in self.sources:
+            self.sources[cls] = None
+            for base in cls.__mro__:
+                path = self.gui._search_for_image(base.__name__)
+                if path is not None:
+                    image = Image.open(path)
+                    image.thumbnail((480, 480), Image.LANCZOS)
+                    self.sources[cls] = image
+                    break
+        return self.sources[cls]
+
+    def draw(self, grid:Grid):
+        # grid_image only reads cell_size and bd, which this frame has too
+        frame = self.gui.GridPanel.grid_image(self, self.rows, self.cols, True)
+        step = self.cell_size + 1
+        for loc in grid.occupied_locations_in(0, 0, self.rows, self.cols):
+            occupant = grid.get(loc)
+            source = self.source(occupant.__class__)
+            if source is None:
+                continue
+            sprite = self.sprites.get(source, self.cell_size, getattr(occupant, 'color', None), occupant.direction)
+            frame.paste(sprite, (self.bd + loc.col * step, self.bd + loc.row * step),
+                        sprite if sprite.mode == 'RGBA' else None)
+        return frame
+
+
+def render_benchmarks(sizes, repeat:int, seed:int, match:str = None) -> typing.Iterator[dict]:
+    scenarios = ('bugs-dense', 'crabs')
+    for rows, cols in sizes:
+        for scenario in scenarios:
+            name = 'render/offscreen/{}/{}x{}'.format(scenario, rows, cols)
+            if not wanted(name, match):
+                continue
+            params = {'scenario': scenario, 'rows': rows, 'cols': cols, 'cell_size': CELL_SIZE}
+            world = populate(make_grid('BoundedGrid', rows, cols), scenario, rows, cols, seed)
+            frame = OffscreenFrame(rows, cols)
+            frame.draw(world.grid)
+            samples, _ = timed(lambda: world.grid, frame.draw, repeat)
+            yield record(name, 'render', params, samples, 1)
+    if not os.environ.get('DISPLAY'):
+        return
+    yield from tk_render_benchmarks(sizes, repeat, seed, match)
+
+
+def tk_render_benchmarks(sizes, repeat:int, seed:int, match:str = None) -> typing.Iterator[dict]:
+    from gridworld.gui import WorldFrame
+    for rows, cols in sizes:
+        full_name = 'render/tk-full/{}x{}'.format(rows, cols)
+        step_name = 'render/tk-step/{}x{}'.format(rows, cols)
+        if not (wanted(full_name, match) or wanted(step_name, match)):
+            continue
+        params = {'scenario': 'crabs', 'rows': rows, 'cols': cols}
+        world = populate(make_grid('BoundedGrid', rows, cols), 'crabs', rows, cols, seed)
+        frame = WorldFrame(world)
+        world.frame = frame
+        frame.setVisible(True)
+        display = frame.display
+
+        def full(_):
+            display.render()
+            frame.update_idletasks()
+
+        def incremental(_):
+            display.refresh()
+            frame.update_idletasks()
+
+        full(None)
+        if wanted(full_name, match):
+            samples, _ = timed(lambda: None, full, repeat)
+            yield record(full_name, 'render', params, samples, 1)
+        if wanted(step_name, match):
+            samples, _ = timed(world.step, incremental, repeat)
+            yield record(step_name, 'render', params, samples, 1)
+        frame.destroy()
+
+
+def machine() -> dict:
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def run_suite(groups:typing.Iterable[str], sizes, repeat:int = 5, steps:int = 20, seed:int = 0,
+              match:str = None, progress:typing.TextIO = None) -> dict:
+    benchmarks = {
+        'grid': lambda: grid_benchmarks(sizes, repeat, match),
+        'step': lambda: step_benchmarks(sizes, repeat, steps, seed, match),
+        'render': lambda: render_benchmarks(sizes, repeat, seed, match),
+    }
+    results = list()
+    for group in groups:
+        if group not in benchmarks:
+            raise ValueError("Unknown benchmark group: " + str(group))
+        for entry in benchmarks[group]():
+            results.append(entry)
+            if progress is not None:
+                progress.write("{:<48} {:10.3f} ms\n".format(entry['name'], entry['best'] * 1000))
+                progress.flush()
+    return {
+        'version': FORMAT_VERSION,
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'machine': machine(),
+        'settings': {'sizes': [list(s) for s in sizes], 'repeat': repeat, 'steps': steps, 'seed': seed},
+        'results': results,
+    }
+
+
+def compare(base:dict, new:dict, threshold:float = 0.10) -> typing.Tuple[typing.List[str], int]:
+    '''
+    * Matches results by name and compares their best times. A result more
+    * than threshold slower than the base is a regression.
+    * @return the report lines and the number of regressions
+    '''
+    old = {entry['name']: entry for entry in base['results']}
+    lines = ["{:<48} {:>10} {:>10} {:>8}".format("benchmark", "base ms", "new ms", "change")]
+    regressions = 0
+    for entry in new['results']:
+        name = entry['name']
+        if name not in old:
+            lines.append("{:<48} {:>10} {:>10.3f} {:>8}".format(name, "-", entry['best'] * 1000, "new"))
+            continue
+        before = old.pop(name)
+        change = entry['best'] / before['best'] - 1 if before['best'] > 0 else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "REGRESSION"
+            regressions += 1
+        elif change < -threshold:
+            flag = "faster"
+        if before.get('digest') != entry.get('digest'):
+            flag = (flag + " digest changed").strip()
+        lines.append("{:<48} {:>10.3f} {:>10.3f} {:>+7.1f}% {}".format(
+            name, before['best'] * 1000, entry['best'] * 1000, change * 100, flag
+        ).rstrip())
+    for name, before in old.items():
+        lines.append("{:<48} {:>10.3f} {:>10} {:>8}".format(name, before['best'] * 1000, "-", "missing"))
+    if base.get('machine') != new.get('machine'):
+        lines.append("")
+        lines.append("note: the files were recorded on different machines or interpreters")
+    return lines, regressions
+
+
+def _parse_sizes(text:str) -> typing.List[typing.Tuple[int, int]]:
+    sizes = list()
+    for part in text.split(','):
+        rows, _, cols = part.partition('x')
+        sizes.append((int(rows), int(cols or rows)))
+    return sizes
+
+
+def main(argv:typing.List[str]) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='run the benchmarks and write a results file')
+    run.add_argument('--out', default='-', help='JSON results file, - for stdout')
+    run.add_argument('--groups', default='grid,step,render')
+    run.add_argument('--sizes', default=','.join('{}x{}'.format(*s) for s in SIZES))
+    run.add_argument('--repeat', type=int, default=5)
+    run.add_argument('--steps', type=int, default=20)
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--filter', default=None, help='only keep benchmarks whose name contains this')
+
+    cmp = commands.add_parser('compare', help='compare two results files')
+    cmp.add_argument('base')
+    cmp.add_argument('new')
+    cmp.add_argument('--threshold', type=float, default=0.10, help='slowdown that counts as a regression')
+
+    args = parser.parse_args(argv)
+    if args.command == 'compare':
+        with open(args.base) as f:
+            base = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        lines, regressions = compare(base, new, args.threshold)
+        print("\n".join(lines))
+        return 1 if regressions else 0
+
+    results = run_suite(
+        args.groups.split(','), _parse_sizes(args.sizes), args.repeat, args.steps, args.seed,
+        args.filter, sys.stderr
+    )
+    text = json.dumps(results, indent=2)
+    if args.out == '-':
+        print(text)
+    else:
+        with open(args.out, 'w') as f:
+            f.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -3,8 +3,6 @@ from gridworld.actor import ActorWorld, Rock, Flower, Critter, Bug
 from gridworld.grid import Location
 from gridworld.colors import Color
 
-from random import random
-
 class CrabCritter(Critter):
     
     def __init__(self, color:Color=Color.red):
@@ -42,7 +40,7 @@ class CrabCritter(Critter):
         * If the crab critter doesn't move, it randomly turns left or right.
         '''
         if loc == self.location:
-            r = random()
+            r = self.rng.random()
             angle = None
             if r < .5:
                 angle = Location.LEFT
@@ -75,7 +73,7 @@ class ChameleonCritter(Critter):
         */
         '''
         if actors:
-            r = int(random() * len(actors))
+            r = int(self.rng.random() * len(actors))
             other = actors[r]
             self.color = other.color
     
@@ -1,18 +1,20 @@
 from gridworld.colors import Color
-from gridworld.grid import Grid, Location
-from gridworld.world import World
-from threading import Thread
+from gridworld.grid import AbstractGrid, Grid, Location, Neighborhood
+from gridworld.world import World, WorldRandom
 import typing
 
 import random
-import tkinter as tk
+import time
 
 class Actor:
 
-    grid:Grid
-    location:Location
+    grid:Grid = None
+    location:Location = None
     _direction:int
-    color:Color
+    _color:Color
+    # the world's stream, taken from the grid when the actor is put in one;
+    # None until then
+    rng:random.Random = None
 
     def __init__(self):
         self.color = Color.BLUE
@@ -27,6 +29,18 @@ class Actor:
     @direction.setter
     def direction(self, direction):
         self._direction = direction % Location.FULL_CIRCLE
+        if self.grid is not None:
+            self.grid.touch(self.location)
+
+    @property
+    def color(self) -> Color:
+        return self._color
+
+    @color.setter
+    def color(self, color:Color):
+        self._color = color
+        if self.grid is not None:
+            self.grid.touch(self.location)
 
 
     def act(self): 
@@ -40,6 +54,8 @@ class Actor:
         actor:Actor = grid.get(loc)
         if actor is not None:
             actor.remove_self_from_grid()
+        if grid.rng is not None:
+            self.rng = grid.rng
         grid.put(loc, self)
         self.grid = grid
         self.location = loc
@@ -86,9 +102,111 @@ class Actor:
 
 class ActorWorld(World):
     DEFAULT_MESSAGE = "Click on a grid location to construct or manipulate an actor."
+    # fetch every critter's neighbourhood in one Grid.neighborhoods call once
+    # a step has at least this many; None leaves each critter to look for itself
+    BATCH_NEIGHBORHOODS:int = None
+
+    engine = None
+    # a StepProfiler while profiling is enabled
+    profiler = None
+    # a JournalWriter while the run is being recorded
+    journal = None
+
+    def __init__(self, grid:Grid = None, seed:int = None):
+        super().__init__(grid, seed)
+        for loc in self.grid.occupied_locations:
+            self.grid.get(loc).rng = self.generator
+
+    def use_array_engine(self, enabled:bool = True):
+        if enabled and self.array_engine is None:
+            from gridworld.engine import ArrayEngine
+            self._stop_engine()
+            self.engine = ArrayEngine(self.grid, self.generator)
+        elif not enabled and self.array_engine is not None:
+            self._stop_engine()
+
+    def use_parallel_engine(self, enabled:bool = True, workers:int = None, stripe_rows:int = None,
+                            seed:int = None):
+        '''
+        * Steps the grid in stripes on worker processes, one per core unless
+        * workers is given; see gridworld.parallel. The stripes' random
+        * streams derive from seed, drawn from the world's own when None.
+        '''
+        from gridworld.parallel import ParallelEngine
+        if enabled:
+            self._stop_engine()
+            if seed is None:
+                seed = self.generator.getrandbits(64)
+            self.engine = ParallelEngine(self.grid, seed, self.generator, workers, stripe_rows)
+        elif isinstance(self.engine, ParallelEngine):
+            self._stop_engine()
+
+    def _stop_engine(self):
+        engine = self.engine
+        if engine is not None:
+            engine.sync()
+            self.engine = None
+            close = getattr(engine, 'close', None)
+            if close is not None:
+                close()
 
-    def __init__(self, grid:Grid = None):
-        super().__init__(grid)
+    @property
+    def array_engine(self):
+        '''
+        * @return the engine when it is an ArrayEngine, whose arrays can be
+        * read in place of the grid, or None
+        '''
+        if self.engine is None:
+            return None
+        from gridworld.engine import ArrayEngine
+        return self.engine if isinstance(self.engine, ArrayEngine) else None
+
+    def enable_profiling(self, profiler = None):
+        '''
+        * Starts recording act() timings, step latencies and grid operation
+        * counts into profiler, or a fresh StepProfiler.
+        * @return the profiler in use
+        '''
+        from gridworld.profiling import StepProfiler
+        self.disable_profiling()
+        self.profiler = profiler if profiler is not None else StepProfiler()
+        self.profiler.attach(self.grid)
+        return self.profiler
+
+    def disable_profiling(self):
+        '''
+        * @return the profiler that was in use, with its figures, or None
+        '''
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.detach()
+            self.profiler = None
+        return profiler
+
+    def start_journal(self, path:str, keyframe_interval:int = 1000):
+        '''
+        * Records every later step to the journal directory at path; see
+        * gridworld.journal.
+        * @return the JournalWriter in use
+        '''
+        from gridworld.journal import JournalWriter
+        self.stop_journal()
+        self.journal = JournalWriter(self, path, keyframe_interval)
+        return self.journal
+
+    def stop_journal(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+    def flush(self):
+        # the engine only writes actors back to the grid when asked to
+        if self.engine is not None:
+            self.engine.sync()
+
+    def flush_range(self, top:int, left:int, bottom:int, right:int):
+        if self.engine is not None:
+            self.engine.sync_range(top, left, bottom, right)
 
     def show(self):
         if(self.message is None):
@@ -96,17 +214,74 @@ class ActorWorld(World):
         super().show()
     
     def step(self):
+        self.generator.next_step()
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin_step(self.grid)
+        begin_step = getattr(self.grid, 'begin_step', None)
+        if begin_step is not None:
+            begin_step()
+        if self.engine is None:
+            self._act_all(profiler)
+        elif profiler is None:
+            self.engine.step()
+        else:
+            start = time.perf_counter()
+            self.engine.step()
+            profiler.record(self.engine.__class__.__name__, time.perf_counter() - start)
+        if self.journal is not None:
+            self.journal.record()
+        # a SharedBoundedGrid tells its readers that a step has finished
+        publish = getattr(self.grid, 'publish', None)
+        if publish is not None:
+            publish(self)
+        if profiler is None:
+            self.repaint()
+        else:
+            profiler.repaint(self)
+            profiler.end_step()
+
+    def _act_all(self, profiler):
+        occupants = getattr(self.grid, 'iter_occupants', None)
+        if occupants is not None and profiler is None and self.BATCH_NEIGHBORHOODS is None:
+            # a StoreGrid makes each actor's handle only when its turn comes
+            for a in occupants():
+                if a.grid == self.grid:
+                    a.act()
+            return
         actors:typing.List[Actor] = list()
         for loc in self.grid.occupied_locations:
             actors.append(self.grid.get(loc))
-        for a in actors:
-            if a.grid == self.grid:
-                a.act()
-        self.repaint()
+        critters = [a for a in actors if isinstance(a, Critter)]
+        changes = None
+        if (self.BATCH_NEIGHBORHOODS is not None and
+                len(critters) >= self.BATCH_NEIGHBORHOODS and
+                isinstance(self.grid, AbstractGrid)):
+            changes = self.grid.watch_changes()
+            hoods = self.grid.neighborhoods([c.location for c in critters])
+            for critter, hood in zip(critters, hoods):
+                critter.prefetch_neighborhood(hood, changes)
+        try:
+            if profiler is None:
+                for a in actors:
+                    if a.grid == self.grid:
+                        a.act()
+            else:
+                for a in actors:
+                    if a.grid == self.grid:
+                        profiler.act(a)
+        finally:
+            if changes is not None:
+                self.grid.unwatch_changes(changes)
+                for critter in critters:
+                    critter.prefetch_neighborhood(None, None)
     
     def add(self, occupant:Actor, loc:Location = None):
+        if self.engine is not None:
+            self.engine.sync()
         if loc is None:
             loc = self.getRandomEmptyLocation()
+        occupant.rng = self.generator
         if loc is not None:
             occupant.put_self_in_grid(self.grid, loc)
         qual_class_name = occupant.__module__ + '.' + occupant.__class__.__name__
@@ -114,11 +289,17 @@ class ActorWorld(World):
             self.occupant_types[qual_class_name] = occupant.__class__
             if self.frame is not None:
                 self.frame.load_class_image(occupant.__class__)
+        if self.engine is not None:
+            self.engine.load()
     
     def remove(self, loc:Location) -> Actor:
+        if self.engine is not None:
+            self.engine.sync()
         occupant:Actor = self.grid.get(loc)
         if occupant is not None:
             occupant.remove_self_from_grid()
+        if self.engine is not None:
+            self.engine.load()
         return occupant
 
     def add_default_actor_types(self):
@@ -136,10 +317,7 @@ class Flower(Actor):
         self.color = color
 
     def act(self):
-        red = int(self.color.red * (1-self.DARKENING_FACTOR))
-        green = int(self.color.green * (1-self.DARKENING_FACTOR))
-        blue = int(self.color.blue * (1-self.DARKENING_FACTOR))
-        self.color = Color(red, green, blue)
+        self.color = self.color.darker(self.DARKENING_FACTOR)
         
 
 class Bug(Actor):
@@ -192,6 +370,26 @@ class Rock(Actor):
 
 class Critter(Actor):
 
+    _neighborhood:Neighborhood = None
+    _changes:typing.Set[Location] = None
+
+    def prefetch_neighborhood(self, hood:Neighborhood, changes:typing.Set[Location]):
+        '''
+        * Hands the critter a neighbourhood fetched ahead of time, along with
+        * the set of grid changes made since; it is used while none of those
+        * changes touch it.
+        '''
+        self._neighborhood = hood
+        self._changes = changes
+
+    def _prefetched_neighborhood(self) -> typing.Tuple[Neighborhood, bool]:
+        # the valid neighbours never change while the critter stays put, but
+        # the occupied/empty split is only trusted if nothing near it changed
+        hood = self._neighborhood
+        if hood is None or hood.location != self.location:
+            return None, False
+        return hood, self._changes.isdisjoint(hood.valid)
+
     def act(self):
         if self.grid is None:
             return
@@ -202,7 +400,13 @@ class Critter(Actor):
         self.make_move(loc)
 
     def get_actors(self) -> typing.List[Actor]:
-        return list(self.grid.neighbors(self.location))
+        hood, fresh = self._prefetched_neighborhood()
+        if hood is None:
+            return list(self.grid.neighbors(self.location))
+        get = self.grid.get
+        if fresh:
+            return [get(loc) for loc in hood.occupied]
+        return [a for a in map(get, hood.valid) if a is not None]
 
     def process_actors(self, actors:typing.List[Actor]):
         for a in actors:
@@ -210,13 +414,23 @@ class Critter(Actor):
                 a.remove_self_from_grid()
             
     def get_move_locations(self) -> typing.List[Location]:
-        return list(self.grid.empty_adjacent_locations(self.location))
+        hood, fresh = self._prefetched_neighborhood()
+        if hood is None:
+            return list(self.grid.empty_adjacent_locations(self.location))
+        if fresh:
+            return list(hood.empty)
+        get = self.grid.get
+        return [loc for loc in hood.valid if get(loc) is None]
 
     def select_move_location(self, locs:typing.List[Location]) -> Location:
         n = len(locs)
         if n == 0:
             return self.location
-        r = random.randrange(0, len(locs))
+        if isinstance(self.rng, WorldRandom):
+            # keyed by where this critter stands, so it draws the same
+            # whichever actors happen to act before it
+            return locs[self.rng.randbelow_at(n, self.location)]
+        r = self.rng.randrange(0, len(locs))
         return locs[r]
 
     def make_move(self, loc:Location):
@@ -5,44 +5,236 @@ from random import choice
 def clamp(_min, _max, value):
     return max(min(value, _max), _min)
 
-class Color:
-    red:int
-    green:int
-    blue:int
-    name:str
+def _channel(value) -> int:
+    if type(value) is int and 0 <= value <= 255:
+        return value
+    return int(clamp(0, 255, value))
+
+_set_slot = object.__setattr__
+# packed 0xRRGGBB, or (packed, name) for a named one -> the shared Color for it
+_palette:dict = dict()
+# factor -> every channel value after one darkening by it
+_decay_tables:dict = dict()
+
+def _decay_table(factor:float) -> tuple:
+    table = _decay_tables.get(factor)
+    if table is None:
+        table = _decay_tables[factor] = tuple(int(c * (1 - factor)) for c in range(256))
+    return table
+
+# name -> packed value of every entry in NAMED_COLORS, built on first use
+_named_packed:dict = None
 
-    colordict = dict()
+def _named_table() -> dict:
+    global _named_packed
+    if _named_packed is None:
+        _named_packed = {name: (r << 16) | (g << 8) | b for name, r, g, b in NAMED_COLORS}
+    return _named_packed
 
-    def __init__(self, red=0, green=0, blue=0, name:str=None):
-        self.red = int(clamp(0, 255, red))
-        self.green = int(clamp(0, 255, green))
-        self.blue = int(clamp(0, 255, blue))
+class _Channel:
+    '''
+    * One channel of a color's packed value. Read on the class itself it is
+    * the named color of the same name instead, so Color.red still works.
+    '''
+
+    def __init__(self, shift:int):
+        self.shift = shift
+
+    def __set_name__(self, owner, name:str):
         self.name = name
 
-        if name is not None:
-            self.__class__.colordict[name.upper()] = self
-            self.__class__.colordict[name.lower()] = self
-            try:
-                setattr(self.__class__, name.upper(), self)
-                setattr(self.__class__, name.lower(), self)
-            except:
-                # oh well, we tried.
-                pass
+    def __get__(self, color, owner=None):
+        if color is None:
+            color = owner._named(self.name)
+            return self if color is None else color
+        return (color.packed >> self.shift) & 0xFF
+
+
+class _ColorDict:
+    '''
+    * Color.colordict, read on the class or on any color: makes the rest of
+    * NAMED_COLORS first.
+    '''
+
+    def __get__(self, color, owner=None) -> dict:
+        if not Color._loaded:
+            Color._load_all()
+        return Color._colordict
+
+
+class _ColorType(type):
+    '''
+    * Builds the named colors as they are first read: Color.PINK makes
+    * just that one, and reading colordict makes the whole table.
+    '''
+
+    def __getattr__(cls, name:str):
+        color = cls._named(name) if not name.startswith('__') else None
+        if color is None:
+            raise AttributeError("type object '" + cls.__name__ + "' has no attribute '" + name + "'")
+        return color
+
+    def __dir__(cls):
+        return sorted(set(super().__dir__()) | set(_named_table()) | {n.lower() for n in _named_table()})
+
+
+class Color(metaclass=_ColorType):
+    '''
+    * An immutable RGB color, held as one packed 0xRRGGBB int. Colors are
+    * equal, and hash alike, when their RGB values are, whatever their names.
+    * Color(r, g, b) hands back one shared instance per value, and per value
+    * and name when given one, from a palette of up to PALETTE_LIMIT colors.
+    * Only NAMED_COLORS and colors passed to register() are filed in colordict
+    * and as class attributes (Color.RED, Color.red).
+    '''
+
+    __slots__ = ('packed', 'name', '_hsv', '_hls', '_darker')
+
+    packed:int
+    name:str
+
+    # how many colors Color() keeps shared; 0 turns interning off
+    PALETTE_LIMIT:int = 1 << 16
+
+    # name -> color, in both cases; read it through colordict, which
+    # makes the rest of NAMED_COLORS first
+    _colordict:dict = dict()
+    _loaded:bool = False
+    colordict = _ColorDict()
+
+    def __new__(cls, red=0, green=0, blue=0, name:str=None):
+        packed = (_channel(red) << 16) | (_channel(green) << 8) | _channel(blue)
+        if cls is not Color:
+            return cls._make(packed, name)
+        key = packed if name is None else (packed, name)
+        color = _palette.get(key)
+        if color is None:
+            color = cls._make(packed, name)
+            if len(_palette) < cls.PALETTE_LIMIT:
+                _palette[key] = color
+        return color
+
+    @classmethod
+    def _make(cls, packed:int, name:str) -> "Color":
+        color = object.__new__(cls)
+        _set_slot(color, 'packed', packed)
+        _set_slot(color, 'name', name)
+        _set_slot(color, '_hsv', None)
+        _set_slot(color, '_hls', None)
+        _set_slot(color, '_darker', None)
+        return color
+
+    @classmethod
+    def register(cls, color:"Color") -> "Color":
+        '''
+        * Files a named color in colordict and as a class attribute, under
+        * its name in both cases. The names in NAMED_COLORS cannot be taken.
+        * @return color
+        '''
+        if color.name is None:
+            raise ValueError("Cannot register a color without a name")
+        if color.name.upper() in _named_table():
+            raise ValueError("Cannot replace the built-in color " + color.name.upper())
+        cls._register(color)
+        return color
+
+    @classmethod
+    def _register(cls, color:"Color"):
+        name = color.name
+        cls._colordict[name.upper()] = color
+        cls._colordict[name.lower()] = color
+        for attr in (name.upper(), name.lower()):
+            # never shadow a method or property with a color of the same name;
+            # the channels look theirs up in colordict
+            if isinstance(cls.__dict__.get(attr, color), Color):
+                setattr(cls, attr, color)
+
+    @staticmethod
+    def _named(name:str) -> "Color":
+        '''
+        * @return the color filed under name, building it from NAMED_COLORS
+        * if it has not been yet, or None
+        '''
+        color = Color._colordict.get(name)
+        if color is None and not Color._loaded:
+            key = name.upper()
+            packed = _named_table().get(key)
+            if packed is not None and (name == key or name == name.lower()):
+                color = Color._make(packed, key)
+                Color._register(color)
+        return color
+
+    @staticmethod
+    def _load_all():
+        # builds what is left of the table, then puts colordict back in
+        # table order, as random() depends on it
+        colordict = Color._colordict
+        for name, packed in _named_table().items():
+            if name not in colordict:
+                Color._register(Color._make(packed, name))
+        ordered = dict()
+        for name in _named_table():
+            ordered[name] = colordict[name]
+            ordered[name.lower()] = colordict[name.lower()]
+        ordered.update(colordict)
+        colordict.clear()
+        colordict.update(ordered)
+        Color._loaded = True
+
+    @classmethod
+    def of(cls, packed:int, name:str = None) -> "Color":
+        '''
+        * @return the color for a packed 0xRRGGBB value: the colordict entry
+        * when name is one with that value, else a color carrying name
+        * without filing it under it
+        '''
+        if name is None:
+            return cls(packed >> 16, (packed >> 8) & 0xFF, packed & 0xFF)
+        color = cls._named(name)
+        if color is None or color.packed != packed:
+            color = cls(packed >> 16, (packed >> 8) & 0xFF, packed & 0xFF, name)
+        return color
+
+    def __setattr__(self, name, value):
+        raise AttributeError(self.__class__.__name__ + " is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(self.__class__.__name__ + " is immutable")
+
+    def __reduce__(self):
+        return (self.__class__.of, (self.packed, self.name))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Color):
+            return NotImplemented
+        return self.packed == other.packed
+
+    def __hash__(self) -> int:
+        return hash(self.packed)
+
+    red = _Channel(16)
+    green = _Channel(8)
+    blue = _Channel(0)
+
     @property
     def hsv(self) -> tuple:
-        return colorsys.rgb_to_hsv(
-            self.red/255,
-            self.green/255,
-            self.blue/255,
-        )
+        if self._hsv is None:
+            _set_slot(self, '_hsv', colorsys.rgb_to_hsv(
+                self.red/255,
+                self.green/255,
+                self.blue/255,
+            ))
+        return self._hsv
 
     @property
     def hls(self) -> tuple:
-        return colorsys.rgb_to_hls(
-            self.red/255,
-            self.green/255,
-            self.blue/255,
-        )
+        if self._hls is None:
+            _set_slot(self, '_hls', colorsys.rgb_to_hls(
+                self.red/255,
+                self.green/255,
+                self.blue/255,
+            ))
+        return self._hls
 
     @property
     def yiq(self) -> tuple:
@@ -54,11 +246,22 @@ class Color:
     
     @property
     def rgb(self) -> tuple:
-        return (
-            self.red,
-            self.green,
-            self.blue,
-        )
+        packed = self.packed
+        return (packed >> 16, (packed >> 8) & 0xFF, packed & 0xFF)
+
+    def darker(self, factor:float) -> "Color":
+        '''
+        * @return this color with each channel scaled by 1 - factor and
+        * truncated, as a Flower darkens; the last result is remembered
+        '''
+        darker = self._darker
+        if darker is not None and darker[0] == factor:
+            return darker[1]
+        table = _decay_table(factor)
+        packed = self.packed
+        color = Color(table[packed >> 16], table[(packed >> 8) & 0xFF], table[packed & 0xFF])
+        _set_slot(self, '_darker', (factor, color))
+        return color
 
     @classmethod
     def from_hsv(cls, h, s, v):
@@ -93,563 +296,573 @@ class Color:
             b=self.blue
         )
 
-Color(240, 248, 255, 'ALICEBLUE')
-Color(250, 235, 215, 'ANTIQUEWHITE')
-Color(255, 239, 219, 'ANTIQUEWHITE1')
-Color(238, 223, 204, 'ANTIQUEWHITE2')
-Color(205, 192, 176, 'ANTIQUEWHITE3')
-Color(139, 131, 120, 'ANTIQUEWHITE4')
-Color(0, 255, 255, 'AQUA')
-Color(127, 255, 212, 'AQUAMARINE1')
-Color(118, 238, 198, 'AQUAMARINE2')
-Color(102, 205, 170, 'AQUAMARINE3')
-Color(69, 139, 116, 'AQUAMARINE4')
-Color(240, 255, 255, 'AZURE1')
-Color(224, 238, 238, 'AZURE2')
-Color(193, 205, 205, 'AZURE3')
-Color(131, 139, 139, 'AZURE4')
-Color(227, 207, 87, 'BANANA')
-Color(245, 245, 220, 'BEIGE')
-Color(255, 228, 196, 'BISQUE1')
-Color(238, 213, 183, 'BISQUE2')
-Color(205, 183, 158, 'BISQUE3')
-Color(139, 125, 107, 'BISQUE4')
-Color(0, 0, 0, 'BLACK')
-Color(255, 235, 205, 'BLANCHEDALMOND')
-Color(0, 0, 255, 'BLUE')
-Color(0, 0, 238, 'BLUE2')
-Color(0, 0, 205, 'BLUE3')
-Color(0, 0, 139, 'BLUE4')
-Color(138, 43, 226, 'BLUEVIOLET')
-Color(156, 102, 31, 'BRICK')
-Color(165, 42, 42, 'BROWN')
-Color(255, 64, 64, 'BROWN1')
-Color(238, 59, 59, 'BROWN2')
-Color(205, 51, 51, 'BROWN3')
-Color(139, 35, 35, 'BROWN4')
-Color(222, 184, 135, 'BURLYWOOD')
-Color(255, 211, 155, 'BURLYWOOD1')
-Color(238, 197, 145, 'BURLYWOOD2')
-Color(205, 170, 125, 'BURLYWOOD3')
-Color(139, 115, 85, 'BURLYWOOD4')
-Color(138, 54, 15, 'BURNTSIENNA')
-Color(138, 51, 36, 'BURNTUMBER')
-Color(95, 158, 160, 'CADETBLUE')
-Color(152, 245, 255, 'CADETBLUE1')
-Color(142, 229, 238, 'CADETBLUE2')
-Color(122, 197, 205, 'CADETBLUE3')
-Color(83, 134, 139, 'CADETBLUE4')
-Color(255, 97, 3, 'CADMIUMORANGE')
-Color(255, 153, 18, 'CADMIUMYELLOW')
-Color(237, 145, 33, 'CARROT')
-Color(127, 255, 0, 'CHARTREUSE1')
-Color(118, 238, 0, 'CHARTREUSE2')
-Color(102, 205, 0, 'CHARTREUSE3')
-Color(69, 139, 0, 'CHARTREUSE4')
-Color(210, 105, 30, 'CHOCOLATE')
-Color(255, 127, 36, 'CHOCOLATE1')
-Color(238, 118, 33, 'CHOCOLATE2')
-Color(205, 102, 29, 'CHOCOLATE3')
-Color(139, 69, 19, 'CHOCOLATE4')
-Color(61, 89, 171, 'COBALT')
-Color(61, 145, 64, 'COBALTGREEN')
-Color(128, 138, 135, 'COLDGREY')
-Color(255, 127, 80, 'CORAL')
-Color(255, 114, 86, 'CORAL1')
-Color(238, 106, 80, 'CORAL2')
-Color(205, 91, 69, 'CORAL3')
-Color(139, 62, 47, 'CORAL4')
-Color(100, 149, 237, 'CORNFLOWERBLUE')
-Color(255, 248, 220, 'CORNSILK1')
-Color(238, 232, 205, 'CORNSILK2')
-Color(205, 200, 177, 'CORNSILK3')
-Color(139, 136, 120, 'CORNSILK4')
-Color(220, 20, 60, 'CRIMSON')
-Color(0, 238, 238, 'CYAN2')
-Color(0, 205, 205, 'CYAN3')
-Color(0, 139, 139, 'CYAN4')
-Color(184, 134, 11, 'DARKGOLDENROD')
-Color(255, 185, 15, 'DARKGOLDENROD1')
-Color(238, 173, 14, 'DARKGOLDENROD2')
-Color(205, 149, 12, 'DARKGOLDENROD3')
-Color(139, 101, 8, 'DARKGOLDENROD4')
-Color(169, 169, 169, 'DARKGRAY')
-Color(0, 100, 0, 'DARKGREEN')
-Color(189, 183, 107, 'DARKKHAKI')
-Color(85, 107, 47, 'DARKOLIVEGREEN')
-Color(202, 255, 112, 'DARKOLIVEGREEN1')
-Color(188, 238, 104, 'DARKOLIVEGREEN2')
-Color(162, 205, 90, 'DARKOLIVEGREEN3')
-Color(110, 139, 61, 'DARKOLIVEGREEN4')
-Color(255, 140, 0, 'DARKORANGE')
-Color(255, 127, 0, 'DARKORANGE1')
-Color(238, 118, 0, 'DARKORANGE2')
-Color(205, 102, 0, 'DARKORANGE3')
-Color(139, 69, 0, 'DARKORANGE4')
-Color(153, 50, 204, 'DARKORCHID')
-Color(191, 62, 255, 'DARKORCHID1')
-Color(178, 58, 238, 'DARKORCHID2')
-Color(154, 50, 205, 'DARKORCHID3')
-Color(104, 34, 139, 'DARKORCHID4')
-Color(233, 150, 122, 'DARKSALMON')
-Color(143, 188, 143, 'DARKSEAGREEN')
-Color(193, 255, 193, 'DARKSEAGREEN1')
-Color(180, 238, 180, 'DARKSEAGREEN2')
-Color(155, 205, 155, 'DARKSEAGREEN3')
-Color(105, 139, 105, 'DARKSEAGREEN4')
-Color(72, 61, 139, 'DARKSLATEBLUE')
-Color(47, 79, 79, 'DARKSLATEGRAY')
-Color(151, 255, 255, 'DARKSLATEGRAY1')
-Color(141, 238, 238, 'DARKSLATEGRAY2')
-Color(121, 205, 205, 'DARKSLATEGRAY3')
-Color(82, 139, 139, 'DARKSLATEGRAY4')
-Color(0, 206, 209, 'DARKTURQUOISE')
-Color(148, 0, 211, 'DARKVIOLET')
-Color(255, 20, 147, 'DEEPPINK1')
-Color(238, 18, 137, 'DEEPPINK2')
-Color(205, 16, 118, 'DEEPPINK3')
-Color(139, 10, 80, 'DEEPPINK4')
-Color(0, 191, 255, 'DEEPSKYBLUE1')
-Color(0, 178, 238, 'DEEPSKYBLUE2')
-Color(0, 154, 205, 'DEEPSKYBLUE3')
-Color(0, 104, 139, 'DEEPSKYBLUE4')
-Color(105, 105, 105, 'DIMGRAY')
-Color(105, 105, 105, 'DIMGRAY')
-Color(30, 144, 255, 'DODGERBLUE1')
-Color(28, 134, 238, 'DODGERBLUE2')
-Color(24, 116, 205, 'DODGERBLUE3')
-Color(16, 78, 139, 'DODGERBLUE4')
-Color(252, 230, 201, 'EGGSHELL')
-Color(0, 201, 87, 'EMERALDGREEN')
-Color(178, 34, 34, 'FIREBRICK')
-Color(255, 48, 48, 'FIREBRICK1')
-Color(238, 44, 44, 'FIREBRICK2')
-Color(205, 38, 38, 'FIREBRICK3')
-Color(139, 26, 26, 'FIREBRICK4')
-Color(255, 125, 64, 'FLESH')
-Color(255, 250, 240, 'FLORALWHITE')
-Color(34, 139, 34, 'FORESTGREEN')
-Color(220, 220, 220, 'GAINSBORO')
-Color(248, 248, 255, 'GHOSTWHITE')
-Color(255, 215, 0, 'GOLD1')
-Color(238, 201, 0, 'GOLD2')
-Color(205, 173, 0, 'GOLD3')
-Color(139, 117, 0, 'GOLD4')
-Color(218, 165, 32, 'GOLDENROD')
-Color(255, 193, 37, 'GOLDENROD1')
-Color(238, 180, 34, 'GOLDENROD2')
-Color(205, 155, 29, 'GOLDENROD3')
-Color(139, 105, 20, 'GOLDENROD4')
-Color(128, 128, 128, 'GRAY')
-Color(3, 3, 3, 'GRAY1')
-Color(5, 5, 5, 'GRAY2')
-Color(8, 8, 8, 'GRAY3')
-Color(10, 10, 10, 'GRAY4')
-Color(13, 13, 13, 'GRAY5')
-Color(15, 15, 15, 'GRAY6')
-Color(18, 18, 18, 'GRAY7')
-Color(20, 20, 20, 'GRAY8')
-Color(23, 23, 23, 'GRAY9')
-Color(26, 26, 26, 'GRAY10')
-Color(28, 28, 28, 'GRAY11')
-Color(31, 31, 31, 'GRAY12')
-Color(33, 33, 33, 'GRAY13')
-Color(36, 36, 36, 'GRAY14')
-Color(38, 38, 38, 'GRAY15')
-Color(41, 41, 41, 'GRAY16')
-Color(43, 43, 43, 'GRAY17')
-Color(46, 46, 46, 'GRAY18')
-Color(48, 48, 48, 'GRAY19')
-Color(51, 51, 51, 'GRAY20')
-Color(54, 54, 54, 'GRAY21')
-Color(56, 56, 56, 'GRAY22')
-Color(59, 59, 59, 'GRAY23')
-Color(61, 61, 61, 'GRAY24')
-Color(64, 64, 64, 'GRAY25')
-Color(66, 66, 66, 'GRAY26')
-Color(69, 69, 69, 'GRAY27')
-Color(71, 71, 71, 'GRAY28')
-Color(74, 74, 74, 'GRAY29')
-Color(77, 77, 77, 'GRAY30')
-Color(79, 79, 79, 'GRAY31')
-Color(82, 82, 82, 'GRAY32')
-Color(84, 84, 84, 'GRAY33')
-Color(87, 87, 87, 'GRAY34')
-Color(89, 89, 89, 'GRAY35')
-Color(92, 92, 92, 'GRAY36')
-Color(94, 94, 94, 'GRAY37')
-Color(97, 97, 97, 'GRAY38')
-Color(99, 99, 99, 'GRAY39')
-Color(102, 102, 102, 'GRAY40')
-Color(107, 107, 107, 'GRAY42')
-Color(110, 110, 110, 'GRAY43')
-Color(112, 112, 112, 'GRAY44')
-Color(115, 115, 115, 'GRAY45')
-Color(117, 117, 117, 'GRAY46')
-Color(120, 120, 120, 'GRAY47')
-Color(122, 122, 122, 'GRAY48')
-Color(125, 125, 125, 'GRAY49')
-Color(127, 127, 127, 'GRAY50')
-Color(130, 130, 130, 'GRAY51')
-Color(133, 133, 133, 'GRAY52')
-Color(135, 135, 135, 'GRAY53')
-Color(138, 138, 138, 'GRAY54')
-Color(140, 140, 140, 'GRAY55')
-Color(143, 143, 143, 'GRAY56')
-Color(145, 145, 145, 'GRAY57')
-Color(148, 148, 148, 'GRAY58')
-Color(150, 150, 150, 'GRAY59')
-Color(153, 153, 153, 'GRAY60')
-Color(156, 156, 156, 'GRAY61')
-Color(158, 158, 158, 'GRAY62')
-Color(161, 161, 161, 'GRAY63')
-Color(163, 163, 163, 'GRAY64')
-Color(166, 166, 166, 'GRAY65')
-Color(168, 168, 168, 'GRAY66')
-Color(171, 171, 171, 'GRAY67')
-Color(173, 173, 173, 'GRAY68')
-Color(176, 176, 176, 'GRAY69')
-Color(179, 179, 179, 'GRAY70')
-Color(181, 181, 181, 'GRAY71')
-Color(184, 184, 184, 'GRAY72')
-Color(186, 186, 186, 'GRAY73')
-Color(189, 189, 189, 'GRAY74')
-Color(191, 191, 191, 'GRAY75')
-Color(194, 194, 194, 'GRAY76')
-Color(196, 196, 196, 'GRAY77')
-Color(199, 199, 199, 'GRAY78')
-Color(201, 201, 201, 'GRAY79')
-Color(204, 204, 204, 'GRAY80')
-Color(207, 207, 207, 'GRAY81')
-Color(209, 209, 209, 'GRAY82')
-Color(212, 212, 212, 'GRAY83')
-Color(214, 214, 214, 'GRAY84')
-Color(217, 217, 217, 'GRAY85')
-Color(219, 219, 219, 'GRAY86')
-Color(222, 222, 222, 'GRAY87')
-Color(224, 224, 224, 'GRAY88')
-Color(227, 227, 227, 'GRAY89')
-Color(229, 229, 229, 'GRAY90')
-Color(232, 232, 232, 'GRAY91')
-Color(235, 235, 235, 'GRAY92')
-Color(237, 237, 237, 'GRAY93')
-Color(240, 240, 240, 'GRAY94')
-Color(242, 242, 242, 'GRAY95')
-Color(247, 247, 247, 'GRAY97')
-Color(250, 250, 250, 'GRAY98')
-Color(252, 252, 252, 'GRAY99')
-Color(0, 128, 0, 'GREEN')
-Color(0, 255, 0, 'GREEN1')
-Color(0, 238, 0, 'GREEN2')
-Color(0, 205, 0, 'GREEN3')
-Color(0, 139, 0, 'GREEN4')
-Color(173, 255, 47, 'GREENYELLOW')
-Color(240, 255, 240, 'HONEYDEW1')
-Color(224, 238, 224, 'HONEYDEW2')
-Color(193, 205, 193, 'HONEYDEW3')
-Color(131, 139, 131, 'HONEYDEW4')
-Color(255, 105, 180, 'HOTPINK')
-Color(255, 110, 180, 'HOTPINK1')
-Color(238, 106, 167, 'HOTPINK2')
-Color(205, 96, 144, 'HOTPINK3')
-Color(139, 58, 98, 'HOTPINK4')
-Color(176, 23, 31, 'INDIANRED')
-Color(205, 92, 92, 'INDIANRED')
-Color(255, 106, 106, 'INDIANRED1')
-Color(238, 99, 99, 'INDIANRED2')
-Color(205, 85, 85, 'INDIANRED3')
-Color(139, 58, 58, 'INDIANRED4')
-Color(75, 0, 130, 'INDIGO')
-Color(255, 255, 240, 'IVORY1')
-Color(238, 238, 224, 'IVORY2')
-Color(205, 205, 193, 'IVORY3')
-Color(139, 139, 131, 'IVORY4')
-Color(41, 36, 33, 'IVORYBLACK')
-Color(240, 230, 140, 'KHAKI')
-Color(255, 246, 143, 'KHAKI1')
-Color(238, 230, 133, 'KHAKI2')
-Color(205, 198, 115, 'KHAKI3')
-Color(139, 134, 78, 'KHAKI4')
-Color(230, 230, 250, 'LAVENDER')
-Color(255, 240, 245, 'LAVENDERBLUSH1')
-Color(238, 224, 229, 'LAVENDERBLUSH2')
-Color(205, 193, 197, 'LAVENDERBLUSH3')
-Color(139, 131, 134, 'LAVENDERBLUSH4')
-Color(124, 252, 0, 'LAWNGREEN')
-Color(255, 250, 205, 'LEMONCHIFFON1')
-Color(238, 233, 191, 'LEMONCHIFFON2')
-Color(205, 201, 165, 'LEMONCHIFFON3')
-Color(139, 137, 112, 'LEMONCHIFFON4')
-Color(173, 216, 230, 'LIGHTBLUE')
-Color(191, 239, 255, 'LIGHTBLUE1')
-Color(178, 223, 238, 'LIGHTBLUE2')
-Color(154, 192, 205, 'LIGHTBLUE3')
-Color(104, 131, 139, 'LIGHTBLUE4')
-Color(240, 128, 128, 'LIGHTCORAL')
-Color(224, 255, 255, 'LIGHTCYAN1')
-Color(209, 238, 238, 'LIGHTCYAN2')
-Color(180, 205, 205, 'LIGHTCYAN3')
-Color(122, 139, 139, 'LIGHTCYAN4')
-Color(255, 236, 139, 'LIGHTGOLDENROD1')
-Color(238, 220, 130, 'LIGHTGOLDENROD2')
-Color(205, 190, 112, 'LIGHTGOLDENROD3')
-Color(139, 129, 76, 'LIGHTGOLDENROD4')
-Color(250, 250, 210, 'LIGHTGOLDENRODYELLOW')
-Color(211, 211, 211, 'LIGHTGREY')
-Color(255, 182, 193, 'LIGHTPINK')
-Color(255, 174, 185, 'LIGHTPINK1')
-Color(238, 162, 173, 'LIGHTPINK2')
-Color(205, 140, 149, 'LIGHTPINK3')
-Color(139, 95, 101, 'LIGHTPINK4')
-Color(255, 160, 122, 'LIGHTSALMON1')
-Color(238, 149, 114, 'LIGHTSALMON2')
-Color(205, 129, 98, 'LIGHTSALMON3')
-Color(139, 87, 66, 'LIGHTSALMON4')
-Color(32, 178, 170, 'LIGHTSEAGREEN')
-Color(135, 206, 250, 'LIGHTSKYBLUE')
-Color(176, 226, 255, 'LIGHTSKYBLUE1')
-Color(164, 211, 238, 'LIGHTSKYBLUE2')
-Color(141, 182, 205, 'LIGHTSKYBLUE3')
-Color(96, 123, 139, 'LIGHTSKYBLUE4')
-Color(132, 112, 255, 'LIGHTSLATEBLUE')
-Color(119, 136, 153, 'LIGHTSLATEGRAY')
-Color(176, 196, 222, 'LIGHTSTEELBLUE')
-Color(202, 225, 255, 'LIGHTSTEELBLUE1')
-Color(188, 210, 238, 'LIGHTSTEELBLUE2')
-Color(162, 181, 205, 'LIGHTSTEELBLUE3')
-Color(110, 123, 139, 'LIGHTSTEELBLUE4')
-Color(255, 255, 224, 'LIGHTYELLOW1')
-Color(238, 238, 209, 'LIGHTYELLOW2')
-Color(205, 205, 180, 'LIGHTYELLOW3')
-Color(139, 139, 122, 'LIGHTYELLOW4')
-Color(50, 205, 50, 'LIMEGREEN')
-Color(250, 240, 230, 'LINEN')
-Color(255, 0, 255, 'MAGENTA')
-Color(238, 0, 238, 'MAGENTA2')
-Color(205, 0, 205, 'MAGENTA3')
-Color(139, 0, 139, 'MAGENTA4')
-Color(3, 168, 158, 'MANGANESEBLUE')
-Color(128, 0, 0, 'MAROON')
-Color(255, 52, 179, 'MAROON1')
-Color(238, 48, 167, 'MAROON2')
-Color(205, 41, 144, 'MAROON3')
-Color(139, 28, 98, 'MAROON4')
-Color(186, 85, 211, 'MEDIUMORCHID')
-Color(224, 102, 255, 'MEDIUMORCHID1')
-Color(209, 95, 238, 'MEDIUMORCHID2')
-Color(180, 82, 205, 'MEDIUMORCHID3')
-Color(122, 55, 139, 'MEDIUMORCHID4')
-Color(147, 112, 219, 'MEDIUMPURPLE')
-Color(171, 130, 255, 'MEDIUMPURPLE1')
-Color(159, 121, 238, 'MEDIUMPURPLE2')
-Color(137, 104, 205, 'MEDIUMPURPLE3')
-Color(93, 71, 139, 'MEDIUMPURPLE4')
-Color(60, 179, 113, 'MEDIUMSEAGREEN')
-Color(123, 104, 238, 'MEDIUMSLATEBLUE')
-Color(0, 250, 154, 'MEDIUMSPRINGGREEN')
-Color(72, 209, 204, 'MEDIUMTURQUOISE')
-Color(199, 21, 133, 'MEDIUMVIOLETRED')
-Color(227, 168, 105, 'MELON')
-Color(25, 25, 112, 'MIDNIGHTBLUE')
-Color(189, 252, 201, 'MINT')
-Color(245, 255, 250, 'MINTCREAM')
-Color(255, 228, 225, 'MISTYROSE1')
-Color(238, 213, 210, 'MISTYROSE2')
-Color(205, 183, 181, 'MISTYROSE3')
-Color(139, 125, 123, 'MISTYROSE4')
-Color(255, 228, 181, 'MOCCASIN')
-Color(255, 222, 173, 'NAVAJOWHITE1')
-Color(238, 207, 161, 'NAVAJOWHITE2')
-Color(205, 179, 139, 'NAVAJOWHITE3')
-Color(139, 121, 94, 'NAVAJOWHITE4')
-Color(0, 0, 128, 'NAVY')
-Color(253, 245, 230, 'OLDLACE')
-Color(128, 128, 0, 'OLIVE')
-Color(107, 142, 35, 'OLIVEDRAB')
-Color(192, 255, 62, 'OLIVEDRAB1')
-Color(179, 238, 58, 'OLIVEDRAB2')
-Color(154, 205, 50, 'OLIVEDRAB3')
-Color(105, 139, 34, 'OLIVEDRAB4')
-Color(255, 128, 0, 'ORANGE')
-Color(255, 165, 0, 'ORANGE1')
-Color(238, 154, 0, 'ORANGE2')
-Color(205, 133, 0, 'ORANGE3')
-Color(139, 90, 0, 'ORANGE4')
-Color(255, 69, 0, 'ORANGERED1')
-Color(238, 64, 0, 'ORANGERED2')
-Color(205, 55, 0, 'ORANGERED3')
-Color(139, 37, 0, 'ORANGERED4')
-Color(218, 112, 214, 'ORCHID')
-Color(255, 131, 250, 'ORCHID1')
-Color(238, 122, 233, 'ORCHID2')
-Color(205, 105, 201, 'ORCHID3')
-Color(139, 71, 137, 'ORCHID4')
-Color(238, 232, 170, 'PALEGOLDENROD')
-Color(152, 251, 152, 'PALEGREEN')
-Color(154, 255, 154, 'PALEGREEN1')
-Color(144, 238, 144, 'PALEGREEN2')
-Color(124, 205, 124, 'PALEGREEN3')
-Color(84, 139, 84, 'PALEGREEN4')
-Color(187, 255, 255, 'PALETURQUOISE1')
-Color(174, 238, 238, 'PALETURQUOISE2')
-Color(150, 205, 205, 'PALETURQUOISE3')
-Color(102, 139, 139, 'PALETURQUOISE4')
-Color(219, 112, 147, 'PALEVIOLETRED')
-Color(255, 130, 171, 'PALEVIOLETRED1')
-Color(238, 121, 159, 'PALEVIOLETRED2')
-Color(205, 104, 137, 'PALEVIOLETRED3')
-Color(139, 71, 93, 'PALEVIOLETRED4')
-Color(255, 239, 213, 'PAPAYAWHIP')
-Color(255, 218, 185, 'PEACHPUFF1')
-Color(238, 203, 173, 'PEACHPUFF2')
-Color(205, 175, 149, 'PEACHPUFF3')
-Color(139, 119, 101, 'PEACHPUFF4')
-Color(51, 161, 201, 'PEACOCK')
-Color(255, 192, 203, 'PINK')
-Color(255, 181, 197, 'PINK1')
-Color(238, 169, 184, 'PINK2')
-Color(205, 145, 158, 'PINK3')
-Color(139, 99, 108, 'PINK4')
-Color(221, 160, 221, 'PLUM')
-Color(255, 187, 255, 'PLUM1')
-Color(238, 174, 238, 'PLUM2')
-Color(205, 150, 205, 'PLUM3')
-Color(139, 102, 139, 'PLUM4')
-Color(176, 224, 230, 'POWDERBLUE')
-Color(128, 0, 128, 'PURPLE')
-Color(155, 48, 255, 'PURPLE1')
-Color(145, 44, 238, 'PURPLE2')
-Color(125, 38, 205, 'PURPLE3')
-Color(85, 26, 139, 'PURPLE4')
-Color(135, 38, 87, 'RASPBERRY')
-Color(199, 97, 20, 'RAWSIENNA')
-Color(255, 0, 0, 'RED')
-Color(255, 0, 0, 'RED1')
-Color(238, 0, 0, 'RED2')
-Color(205, 0, 0, 'RED3')
-Color(139, 0, 0, 'RED4')
-Color(188, 143, 143, 'ROSYBROWN')
-Color(255, 193, 193, 'ROSYBROWN1')
-Color(238, 180, 180, 'ROSYBROWN2')
-Color(205, 155, 155, 'ROSYBROWN3')
-Color(139, 105, 105, 'ROSYBROWN4')
-Color(65, 105, 225, 'ROYALBLUE')
-Color(72, 118, 255, 'ROYALBLUE1')
-Color(67, 110, 238, 'ROYALBLUE2')
-Color(58, 95, 205, 'ROYALBLUE3')
-Color(39, 64, 139, 'ROYALBLUE4')
-Color(250, 128, 114, 'SALMON')
-Color(255, 140, 105, 'SALMON1')
-Color(238, 130, 98, 'SALMON2')
-Color(205, 112, 84, 'SALMON3')
-Color(139, 76, 57, 'SALMON4')
-Color(244, 164, 96, 'SANDYBROWN')
-Color(48, 128, 20, 'SAPGREEN')
-Color(84, 255, 159, 'SEAGREEN1')
-Color(78, 238, 148, 'SEAGREEN2')
-Color(67, 205, 128, 'SEAGREEN3')
-Color(46, 139, 87, 'SEAGREEN4')
-Color(255, 245, 238, 'SEASHELL1')
-Color(238, 229, 222, 'SEASHELL2')
-Color(205, 197, 191, 'SEASHELL3')
-Color(139, 134, 130, 'SEASHELL4')
-Color(94, 38, 18, 'SEPIA')
-Color(142, 56, 142, 'SGIBEET')
-Color(197, 193, 170, 'SGIBRIGHTGRAY')
-Color(113, 198, 113, 'SGICHARTREUSE')
-Color(85, 85, 85, 'SGIDARKGRAY')
-Color(30, 30, 30, 'SGIGRAY12')
-Color(40, 40, 40, 'SGIGRAY16')
-Color(81, 81, 81, 'SGIGRAY32')
-Color(91, 91, 91, 'SGIGRAY36')
-Color(132, 132, 132, 'SGIGRAY52')
-Color(142, 142, 142, 'SGIGRAY56')
-Color(183, 183, 183, 'SGIGRAY72')
-Color(193, 193, 193, 'SGIGRAY76')
-Color(234, 234, 234, 'SGIGRAY92')
-Color(244, 244, 244, 'SGIGRAY96')
-Color(125, 158, 192, 'SGILIGHTBLUE')
-Color(170, 170, 170, 'SGILIGHTGRAY')
-Color(142, 142, 56, 'SGIOLIVEDRAB')
-Color(198, 113, 113, 'SGISALMON')
-Color(113, 113, 198, 'SGISLATEBLUE')
-Color(56, 142, 142, 'SGITEAL')
-Color(160, 82, 45, 'SIENNA')
-Color(255, 130, 71, 'SIENNA1')
-Color(238, 121, 66, 'SIENNA2')
-Color(205, 104, 57, 'SIENNA3')
-Color(139, 71, 38, 'SIENNA4')
-Color(192, 192, 192, 'SILVER')
-Color(135, 206, 235, 'SKYBLUE')
-Color(135, 206, 255, 'SKYBLUE1')
-Color(126, 192, 238, 'SKYBLUE2')
-Color(108, 166, 205, 'SKYBLUE3')
-Color(74, 112, 139, 'SKYBLUE4')
-Color(106, 90, 205, 'SLATEBLUE')
-Color(131, 111, 255, 'SLATEBLUE1')
-Color(122, 103, 238, 'SLATEBLUE2')
-Color(105, 89, 205, 'SLATEBLUE3')
-Color(71, 60, 139, 'SLATEBLUE4')
-Color(112, 128, 144, 'SLATEGRAY')
-Color(198, 226, 255, 'SLATEGRAY1')
-Color(185, 211, 238, 'SLATEGRAY2')
-Color(159, 182, 205, 'SLATEGRAY3')
-Color(108, 123, 139, 'SLATEGRAY4')
-Color(255, 250, 250, 'SNOW1')
-Color(238, 233, 233, 'SNOW2')
-Color(205, 201, 201, 'SNOW3')
-Color(139, 137, 137, 'SNOW4')
-Color(0, 255, 127, 'SPRINGGREEN')
-Color(0, 238, 118, 'SPRINGGREEN1')
-Color(0, 205, 102, 'SPRINGGREEN2')
-Color(0, 139, 69, 'SPRINGGREEN3')
-Color(70, 130, 180, 'STEELBLUE')
-Color(99, 184, 255, 'STEELBLUE1')
-Color(92, 172, 238, 'STEELBLUE2')
-Color(79, 148, 205, 'STEELBLUE3')
-Color(54, 100, 139, 'STEELBLUE4')
-Color(210, 180, 140, 'TAN')
-Color(255, 165, 79, 'TAN1')
-Color(238, 154, 73, 'TAN2')
-Color(205, 133, 63, 'TAN3')
-Color(139, 90, 43, 'TAN4')
-Color(0, 128, 128, 'TEAL')
-Color(216, 191, 216, 'THISTLE')
-Color(255, 225, 255, 'THISTLE1')
-Color(238, 210, 238, 'THISTLE2')
-Color(205, 181, 205, 'THISTLE3')
-Color(139, 123, 139, 'THISTLE4')
-Color(255, 99, 71, 'TOMATO1')
-Color(238, 92, 66, 'TOMATO2')
-Color(205, 79, 57, 'TOMATO3')
-Color(139, 54, 38, 'TOMATO4')
-Color(64, 224, 208, 'TURQUOISE')
-Color(0, 245, 255, 'TURQUOISE1')
-Color(0, 229, 238, 'TURQUOISE2')
-Color(0, 197, 205, 'TURQUOISE3')
-Color(0, 134, 139, 'TURQUOISE4')
-Color(0, 199, 140, 'TURQUOISEBLUE')
-Color(238, 130, 238, 'VIOLET')
-Color(208, 32, 144, 'VIOLETRED')
-Color(255, 62, 150, 'VIOLETRED1')
-Color(238, 58, 140, 'VIOLETRED2')
-Color(205, 50, 120, 'VIOLETRED3')
-Color(139, 34, 82, 'VIOLETRED4')
-Color(128, 128, 105, 'WARMGREY')
-Color(245, 222, 179, 'WHEAT')
-Color(255, 231, 186, 'WHEAT1')
-Color(238, 216, 174, 'WHEAT2')
-Color(205, 186, 150, 'WHEAT3')
-Color(139, 126, 102, 'WHEAT4')
-Color(255, 255, 255, 'WHITE')
-Color(245, 245, 245, 'WHITESMOKE')
-Color(255, 255, 0, 'YELLOW')
-Color(255, 255, 0, 'YELLOW1')
-Color(238, 238, 0, 'YELLOW2')
-Color(205, 205, 0, 'YELLOW3')
-Color(139, 139, 0, 'YELLOW4')
-
-colors = Color.colordict
-
-__primary_names = ('RED', 'ORANGE', 'YELLOW', 'GREEN', 'BLUE', 'INDIGO', 'VIOLET', 'BLACK', 'WHITE')
-primaries = dict(filter(lambda elem: elem[0] in __primary_names, colors.items()))
\ No newline at end of file
+# name, red, green, blue; Color builds each one the first time it is asked for
+NAMED_COLORS = (
+    ('ALICEBLUE', 240, 248, 255),
+    ('ANTIQUEWHITE', 250, 235, 215),
+    ('ANTIQUEWHITE1', 255, 239, 219),
+    ('ANTIQUEWHITE2', 238, 223, 204),
+    ('ANTIQUEWHITE3', 205, 192, 176),
+    ('ANTIQUEWHITE4', 139, 131, 120),
+    ('AQUA', 0, 255, 255),
+    ('AQUAMARINE1', 127, 255, 212),
+    ('AQUAMARINE2', 118, 238, 198),
+    ('AQUAMARINE3', 102, 205, 170),
+    ('AQUAMARINE4', 69, 139, 116),
+    ('AZURE1', 240, 255, 255),
+    ('AZURE2', 224, 238, 238),
+    ('AZURE3', 193, 205, 205),
+    ('AZURE4', 131, 139, 139),
+    ('BANANA', 227, 207, 87),
+    ('BEIGE', 245, 245, 220),
+    ('BISQUE1', 255, 228, 196),
+    ('BISQUE2', 238, 213, 183),
+    ('BISQUE3', 205, 183, 158),
+    ('BISQUE4', 139, 125, 107),
+    ('BLACK', 0, 0, 0),
+    ('BLANCHEDALMOND', 255, 235, 205),
+    ('BLUE', 0, 0, 255),
+    ('BLUE2', 0, 0, 238),
+    ('BLUE3', 0, 0, 205),
+    ('BLUE4', 0, 0, 139),
+    ('BLUEVIOLET', 138, 43, 226),
+    ('BRICK', 156, 102, 31),
+    ('BROWN', 165, 42, 42),
+    ('BROWN1', 255, 64, 64),
+    ('BROWN2', 238, 59, 59),
+    ('BROWN3', 205, 51, 51),
+    ('BROWN4', 139, 35, 35),
+    ('BURLYWOOD', 222, 184, 135),
+    ('BURLYWOOD1', 255, 211, 155),
+    ('BURLYWOOD2', 238, 197, 145),
+    ('BURLYWOOD3', 205, 170, 125),
+    ('BURLYWOOD4', 139, 115, 85),
+    ('BURNTSIENNA', 138, 54, 15),
+    ('BURNTUMBER', 138, 51, 36),
+    ('CADETBLUE', 95, 158, 160),
+    ('CADETBLUE1', 152, 245, 255),
+    ('CADETBLUE2', 142, 229, 238),
+    ('CADETBLUE3', 122, 197, 205),
+    ('CADETBLUE4', 83, 134, 139),
+    ('CADMIUMORANGE', 255, 97, 3),
+    ('CADMIUMYELLOW', 255, 153, 18),
+    ('CARROT', 237, 145, 33),
+    ('CHARTREUSE1', 127, 255, 0),
+    ('CHARTREUSE2', 118, 238, 0),
+    ('CHARTREUSE3', 102, 205, 0),
+    ('CHARTREUSE4', 69, 139, 0),
+    ('CHOCOLATE', 210, 105, 30),
+    ('CHOCOLATE1', 255, 127, 36),
+    ('CHOCOLATE2', 238, 118, 33),
+    ('CHOCOLATE3', 205, 102, 29),
+    ('CHOCOLATE4', 139, 69, 19),
+    ('COBALT', 61, 89, 171),
+    ('COBALTGREEN', 61, 145, 64),
+    ('COLDGREY', 128, 138, 135),
+    ('CORAL', 255, 127, 80),
+    ('CORAL1', 255, 114, 86),
+    ('CORAL2', 238, 106, 80),
+    ('CORAL3', 205, 91, 69),
+    ('CORAL4', 139, 62, 47),
+    ('CORNFLOWERBLUE', 100, 149, 237),
+    ('CORNSILK1', 255, 248, 220),
+    ('CORNSILK2', 238, 232, 205),
+    ('CORNSILK3', 205, 200, 177),
+    ('CORNSILK4', 139, 136, 120),
+    ('CRIMSON', 220, 20, 60),
+    ('CYAN2', 0, 238, 238),
+    ('CYAN3', 0, 205, 205),
+    ('CYAN4', 0, 139, 139),
+    ('DARKGOLDENROD', 184, 134, 11),
+    ('DARKGOLDENROD1', 255, 185, 15),
+    ('DARKGOLDENROD2', 238, 173, 14),
+    ('DARKGOLDENROD3', 205, 149, 12),
+    ('DARKGOLDENROD4', 139, 101, 8),
+    ('DARKGRAY', 169, 169, 169),
+    ('DARKGREEN', 0, 100, 0),
+    ('DARKKHAKI', 189, 183, 107),
+    ('DARKOLIVEGREEN', 85, 107, 47),
+    ('DARKOLIVEGREEN1', 202, 255, 112),
+    ('DARKOLIVEGREEN2', 188, 238, 104),
+    ('DARKOLIVEGREEN3', 162, 205, 90),
+    ('DARKOLIVEGREEN4', 110, 139, 61),
+    ('DARKORANGE', 255, 140, 0),
+    ('DARKORANGE1', 255, 127, 0),
+    ('DARKORANGE2', 238, 118, 0),
+    ('DARKORANGE3', 205, 102, 0),
+    ('DARKORANGE4', 139, 69, 0),
+    ('DARKORCHID', 153, 50, 204),
+    ('DARKORCHID1', 191, 62, 255),
+    ('DARKORCHID2', 178, 58, 238),
+    ('DARKORCHID3', 154, 50, 205),
+    ('DARKORCHID4', 104, 34, 139),
+    ('DARKSALMON', 233, 150, 122),
+    ('DARKSEAGREEN', 143, 188, 143),
+    ('DARKSEAGREEN1', 193, 255, 193),
+    ('DARKSEAGREEN2', 180, 238, 180),
+    ('DARKSEAGREEN3', 155, 205, 155),
+    ('DARKSEAGREEN4', 105, 139, 105),
+    ('DARKSLATEBLUE', 72, 61, 139),
+    ('DARKSLATEGRAY', 47, 79, 79),
+    ('DARKSLATEGRAY1', 151, 255, 255),
+    ('DARKSLATEGRAY2', 141, 238, 238),
+    ('DARKSLATEGRAY3', 121, 205, 205),
+    ('DARKSLATEGRAY4', 82, 139, 139),
+    ('DARKTURQUOISE', 0, 206, 209),
+    ('DARKVIOLET', 148, 0, 211),
+    ('DEEPPINK1', 255, 20, 147),
+    ('DEEPPINK2', 238, 18, 137),
+    ('DEEPPINK3', 205, 16, 118),
+    ('DEEPPINK4', 139, 10, 80),
+    ('DEEPSKYBLUE1', 0, 191, 255),
+    ('DEEPSKYBLUE2', 0, 178, 238),
+    ('DEEPSKYBLUE3', 0, 154, 205),
+    ('DEEPSKYBLUE4', 0, 104, 139),
+    ('DIMGRAY', 105, 105, 105),
+    ('DIMGRAY', 105, 105, 105),
+    ('DODGERBLUE1', 30, 144, 255),
+    ('DODGERBLUE2', 28, 134, 238),
+    ('DODGERBLUE3', 24, 116, 205),
+    ('DODGERBLUE4', 16, 78, 139),
+    ('EGGSHELL', 252, 230, 201),
+    ('EMERALDGREEN', 0, 201, 87),
+    ('FIREBRICK', 178, 34, 34),
+    ('FIREBRICK1', 255, 48, 48),
+    ('FIREBRICK2', 238, 44, 44),
+    ('FIREBRICK3', 205, 38, 38),
+    ('FIREBRICK4', 139, 26, 26),
+    ('FLESH', 255, 125, 64),
+    ('FLORALWHITE', 255, 250, 240),
+    ('FORESTGREEN', 34, 139, 34),
+    ('GAINSBORO', 220, 220, 220),
+    ('GHOSTWHITE', 248, 248, 255),
+    ('GOLD1', 255, 215, 0),
+    ('GOLD2', 238, 201, 0),
+    ('GOLD3', 205, 173, 0),
+    ('GOLD4', 139, 117, 0),
+    ('GOLDENROD', 218, 165, 32),
+    ('GOLDENROD1', 255, 193, 37),
+    ('GOLDENROD2', 238, 180, 34),
+    ('GOLDENROD3', 205, 155, 29),
+    ('GOLDENROD4', 139, 105, 20),
+    ('GRAY', 128, 128, 128),
+    ('GRAY1', 3, 3, 3),
+    ('GRAY2', 5, 5, 5),
+    ('GRAY3', 8, 8, 8),
+    ('GRAY4', 10, 10, 10),
+    ('GRAY5', 13, 13, 13),
+    ('GRAY6', 15, 15, 15),
+    ('GRAY7', 18, 18, 18),
+    ('GRAY8', 20, 20, 20),
+    ('GRAY9', 23, 23, 23),
+    ('GRAY10', 26, 26, 26),
+    ('GRAY11', 28, 28, 28),
+    ('GRAY12', 31, 31, 31),
+    ('GRAY13', 33, 33, 33),
+    ('GRAY14', 36, 36, 36),
+    ('GRAY15', 38, 38, 38),
+    ('GRAY16', 41, 41, 41),
+    ('GRAY17', 43, 43, 43),
+    ('GRAY18', 46, 46, 46),
+    ('GRAY19', 48, 48, 48),
+    ('GRAY20', 51, 51, 51),
+    ('GRAY21', 54, 54, 54),
+    ('GRAY22', 56, 56, 56),
+    ('GRAY23', 59, 59, 59),
+    ('GRAY24', 61, 61, 61),
+    ('GRAY25', 64, 64, 64),
+    ('GRAY26', 66, 66, 66),
+    ('GRAY27', 69, 69, 69),
+    ('GRAY28', 71, 71, 71),
+    ('GRAY29', 74, 74, 74),
+    ('GRAY30', 77, 77, 77),
+    ('GRAY31', 79, 79, 79),
+    ('GRAY32', 82, 82, 82),
+    ('GRAY33', 84, 84, 84),
+    ('GRAY34', 87, 87, 87),
+    ('GRAY35', 89, 89, 89),
+    ('GRAY36', 92, 92, 92),
+    ('GRAY37', 94, 94, 94),
+    ('GRAY38', 97, 97, 97),
+    ('GRAY39', 99, 99, 99),
+    ('GRAY40', 102, 102, 102),
+    ('GRAY42', 107, 107, 107),
+    ('GRAY43', 110, 110, 110),
+    ('GRAY44', 112, 112, 112),
+    ('GRAY45', 115, 115, 115),
+    ('GRAY46', 117, 117, 117),
+    ('GRAY47', 120, 120, 120),
+    ('GRAY48', 122, 122, 122),
+    ('GRAY49', 125, 125, 125),
+    ('GRAY50', 127, 127, 127),
+    ('GRAY51', 130, 130, 130),
+    ('GRAY52', 133, 133, 133),
+    ('GRAY53', 135, 135, 135),
+    ('GRAY54', 138, 138, 138),
+    ('GRAY55', 140, 140, 140),
+    ('GRAY56', 143, 143, 143),
+    ('GRAY57', 145, 145, 145),
+    ('GRAY58', 148, 148, 148),
+    ('GRAY59', 150, 150, 150),
+    ('GRAY60', 153, 153, 153),
+    ('GRAY61', 156, 156, 156),
+    ('GRAY62', 158, 158, 158),
+    ('GRAY63', 161, 161, 161),
+    ('GRAY64', 163, 163, 163),
+    ('GRAY65', 166, 166, 166),
+    ('GRAY66', 168, 168, 168),
+    ('GRAY67', 171, 171, 171),
+    ('GRAY68', 173, 173, 173),
+    ('GRAY69', 176, 176, 176),
+    ('GRAY70', 179, 179, 179),
+    ('GRAY71', 181, 181, 181),
+    ('GRAY72', 184, 184, 184),
+    ('GRAY73', 186, 186, 186),
+    ('GRAY74', 189, 189, 189),
+    ('GRAY75', 191, 191, 191),
+    ('GRAY76', 194, 194, 194),
+    ('GRAY77', 196, 196, 196),
+    ('GRAY78', 199, 199, 199),
+    ('GRAY79', 201, 201, 201),
+    ('GRAY80', 204, 204, 204),
+    ('GRAY81', 207, 207, 207),
+    ('GRAY82', 209, 209, 209),
+    ('GRAY83', 212, 212, 212),
+    ('GRAY84', 214, 214, 214),
+    ('GRAY85', 217, 217, 217),
+    ('GRAY86', 219, 219, 219),
+    ('GRAY87', 222, 222, 222),
+    ('GRAY88', 224, 224, 224),
+    ('GRAY89', 227, 227, 227),
+    ('GRAY90', 229, 229, 229),
+    ('GRAY91', 232, 232, 232),
+    ('GRAY92', 235, 235, 235),
+    ('GRAY93', 237, 237, 237),
+    ('GRAY94', 240, 240, 240),
+    ('GRAY95', 242, 242, 242),
+    ('GRAY97', 247, 247, 247),
+    ('GRAY98', 250, 250, 250),
+    ('GRAY99', 252, 252, 252),
+    ('GREEN', 0, 128, 0),
+    ('GREEN1', 0, 255, 0),
+    ('GREEN2', 0, 238, 0),
+    ('GREEN3', 0, 205, 0),
+    ('GREEN4', 0, 139, 0),
+    ('GREENYELLOW', 173, 255, 47),
+    ('HONEYDEW1', 240, 255, 240),
+    ('HONEYDEW2', 224, 238, 224),
+    ('HONEYDEW3', 193, 205, 193),
+    ('HONEYDEW4', 131, 139, 131),
+    ('HOTPINK', 255, 105, 180),
+    ('HOTPINK1', 255, 110, 180),
+    ('HOTPINK2', 238, 106, 167),
+    ('HOTPINK3', 205, 96, 144),
+    ('HOTPINK4', 139, 58, 98),
+    ('INDIANRED', 176, 23, 31),
+    ('INDIANRED', 205, 92, 92),
+    ('INDIANRED1', 255, 106, 106),
+    ('INDIANRED2', 238, 99, 99),
+    ('INDIANRED3', 205, 85, 85),
+    ('INDIANRED4', 139, 58, 58),
+    ('INDIGO', 75, 0, 130),
+    ('IVORY1', 255, 255, 240),
+    ('IVORY2', 238, 238, 224),
+    ('IVORY3', 205, 205, 193),
+    ('IVORY4', 139, 139, 131),
+    ('IVORYBLACK', 41, 36, 33),
+    ('KHAKI', 240, 230, 140),
+    ('KHAKI1', 255, 246, 143),
+    ('KHAKI2', 238, 230, 133),
+    ('KHAKI3', 205, 198, 115),
+    ('KHAKI4', 139, 134, 78),
+    ('LAVENDER', 230, 230, 250),
+    ('LAVENDERBLUSH1', 255, 240, 245),
+    ('LAVENDERBLUSH2', 238, 224, 229),
+    ('LAVENDERBLUSH3', 205, 193, 197),
+    ('LAVENDERBLUSH4', 139, 131, 134),
+    ('LAWNGREEN', 124, 252, 0),
+    ('LEMONCHIFFON1', 255, 250, 205),
+    ('LEMONCHIFFON2', 238, 233, 191),
+    ('LEMONCHIFFON3', 205, 201, 165),
+    ('LEMONCHIFFON4', 139, 137, 112),
+    ('LIGHTBLUE', 173, 216, 230),
+    ('LIGHTBLUE1', 191, 239, 255),
+    ('LIGHTBLUE2', 178, 223, 238),
+    ('LIGHTBLUE3', 154, 192, 205),
+    ('LIGHTBLUE4', 104, 131, 139),
+    ('LIGHTCORAL', 240, 128, 128),
+    ('LIGHTCYAN1', 224, 255, 255),
+    ('LIGHTCYAN2', 209, 238, 238),
+    ('LIGHTCYAN3', 180, 205, 205),
+    ('LIGHTCYAN4', 122, 139, 139),
+    ('LIGHTGOLDENROD1', 255, 236, 139),
+    ('LIGHTGOLDENROD2', 238, 220, 130),
+    ('LIGHTGOLDENROD3', 205, 190, 112),
+    ('LIGHTGOLDENROD4', 139, 129, 76),
+    ('LIGHTGOLDENRODYELLOW', 250, 250, 210),
+    ('LIGHTGREY', 211, 211, 211),
+    ('LIGHTPINK', 255, 182, 193),
+    ('LIGHTPINK1', 255, 174, 185),
+    ('LIGHTPINK2', 238, 162, 173),
+    ('LIGHTPINK3', 205, 140, 149),
+    ('LIGHTPINK4', 139, 95, 101),
+    ('LIGHTSALMON1', 255, 160, 122),
+    ('LIGHTSALMON2', 238, 149, 114),
+    ('LIGHTSALMON3', 205, 129, 98),
+    ('LIGHTSALMON4', 139, 87, 66),
+    ('LIGHTSEAGREEN', 32, 178, 170),
+    ('LIGHTSKYBLUE', 135, 206, 250),
+    ('LIGHTSKYBLUE1', 176, 226, 255),
+    ('LIGHTSKYBLUE2', 164, 211, 238),
+    ('LIGHTSKYBLUE3', 141, 182, 205),
+    ('LIGHTSKYBLUE4', 96, 123, 139),
+    ('LIGHTSLATEBLUE', 132, 112, 255),
+    ('LIGHTSLATEGRAY', 119, 136, 153),
+    ('LIGHTSTEELBLUE', 176, 196, 222),
+    ('LIGHTSTEELBLUE1', 202, 225, 255),
+    ('LIGHTSTEELBLUE2', 188, 210, 238),
+    ('LIGHTSTEELBLUE3', 162, 181, 205),
+    ('LIGHTSTEELBLUE4', 110, 123, 139),
+    ('LIGHTYELLOW1', 255, 255, 224),
+    ('LIGHTYELLOW2', 238, 238, 209),
+    ('LIGHTYELLOW3', 205, 205, 180),
+    ('LIGHTYELLOW4', 139, 139, 122),
+    ('LIMEGREEN', 50, 205, 50),
+    ('LINEN', 250, 240, 230),
+    ('MAGENTA', 255, 0, 255),
+    ('MAGENTA2', 238, 0, 238),
+    ('MAGENTA3', 205, 0, 205),
+    ('MAGENTA4', 139, 0, 139),
+    ('MANGANESEBLUE', 3, 168, 158),
+    ('MAROON', 128, 0, 0),
+    ('MAROON1', 255, 52, 179),
+    ('MAROON2', 238, 48, 167),
+    ('MAROON3', 205, 41, 144),
+    ('MAROON4', 139, 28, 98),
+    ('MEDIUMORCHID', 186, 85, 211),
+    ('MEDIUMORCHID1', 224, 102, 255),
+    ('MEDIUMORCHID2', 209, 95, 238),
+    ('MEDIUMORCHID3', 180, 82, 205),
+    ('MEDIUMORCHID4', 122, 55, 139),
+    ('MEDIUMPURPLE', 147, 112, 219),
+    ('MEDIUMPURPLE1', 171, 130, 255),
+    ('MEDIUMPURPLE2', 159, 121, 238),
+    ('MEDIUMPURPLE3', 137, 104, 205),
+    ('MEDIUMPURPLE4', 93, 71, 139),
+    ('MEDIUMSEAGREEN', 60, 179, 113),
+    ('MEDIUMSLATEBLUE', 123, 104, 238),
+    ('MEDIUMSPRINGGREEN', 0, 250, 154),
+    ('MEDIUMTURQUOISE', 72, 209, 204),
+    ('MEDIUMVIOLETRED', 199, 21, 133),
+    ('MELON', 227, 168, 105),
+    ('MIDNIGHTBLUE', 25, 25, 112),
+    ('MINT', 189, 252, 201),
+    ('MINTCREAM', 245, 255, 250),
+    ('MISTYROSE1', 255, 228, 225),
+    ('MISTYROSE2', 238, 213, 210),
+    ('MISTYROSE3', 205, 183, 181),
+    ('MISTYROSE4', 139, 125, 123),
+    ('MOCCASIN', 255, 228, 181),
+    ('NAVAJOWHITE1', 255, 222, 173),
+    ('NAVAJOWHITE2', 238, 207, 161),
+    ('NAVAJOWHITE3', 205, 179, 139),
+    ('NAVAJOWHITE4', 139, 121, 94),
+    ('NAVY', 0, 0, 128),
+    ('OLDLACE', 253, 245, 230),
+    ('OLIVE', 128, 128, 0),
+    ('OLIVEDRAB', 107, 142, 35),
+    ('OLIVEDRAB1', 192, 255, 62),
+    ('OLIVEDRAB2', 179, 238, 58),
+    ('OLIVEDRAB3', 154, 205, 50),
+    ('OLIVEDRAB4', 105, 139, 34),
+    ('ORANGE', 255, 128, 0),
+    ('ORANGE1', 255, 165, 0),
+    ('ORANGE2', 238, 154, 0),
+    ('ORANGE3', 205, 133, 0),
+    ('ORANGE4', 139, 90, 0),
+    ('ORANGERED1', 255, 69, 0),
+    ('ORANGERED2', 238, 64, 0),
+    ('ORANGERED3', 205, 55, 0),
+    ('ORANGERED4', 139, 37, 0),
+    ('ORCHID', 218, 112, 214),
+    ('ORCHID1', 255, 131, 250),
+    ('ORCHID2', 238, 122, 233),
+    ('ORCHID3', 205, 105, 201),
+    ('ORCHID4', 139, 71, 137),
+    ('PALEGOLDENROD', 238, 232, 170),
+    ('PALEGREEN', 152, 251, 152),
+    ('PALEGREEN1', 154, 255, 154),
+    ('PALEGREEN2', 144, 238, 144),
+    ('PALEGREEN3', 124, 205, 124),
+    ('PALEGREEN4', 84, 139, 84),
+    ('PALETURQUOISE1', 187, 255, 255),
+    ('PALETURQUOISE2', 174, 238, 238),
+    ('PALETURQUOISE3', 150, 205, 205),
+    ('PALETURQUOISE4', 102, 139, 139),
+    ('PALEVIOLETRED', 219, 112, 147),
+    ('PALEVIOLETRED1', 255, 130, 171),
+    ('PALEVIOLETRED2', 238, 121, 159),
+    ('PALEVIOLETRED3', 205, 104, 137),
+    ('PALEVIOLETRED4', 139, 71, 93),
+    ('PAPAYAWHIP', 255, 239, 213),
+    ('PEACHPUFF1', 255, 218, 185),
+    ('PEACHPUFF2', 238, 203, 173),
+    ('PEACHPUFF3', 205, 175, 149),
+    ('PEACHPUFF4', 139, 119, 101),
+    ('PEACOCK', 51, 161, 201),
+    ('PINK', 255, 192, 203),
+    ('PINK1', 255, 181, 197),
+    ('PINK2', 238, 169, 184),
+    ('PINK3', 205, 145, 158),
+    ('PINK4', 139, 99, 108),
+    ('PLUM', 221, 160, 221),
+    ('PLUM1', 255, 187, 255),
+    ('PLUM2', 238, 174, 238),
+    ('PLUM3', 205, 150, 205),
+    ('PLUM4', 139, 102, 139),
+    ('POWDERBLUE', 176, 224, 230),
+    ('PURPLE', 128, 0, 128),
+    ('PURPLE1', 155, 48, 255),
+    ('PURPLE2', 145, 44, 238),
+    ('PURPLE3', 125, 38, 205),
+    ('PURPLE4', 85, 26, 139),
+    ('RASPBERRY', 135, 38, 87),
+    ('RAWSIENNA', 199, 97, 20),
+    ('RED', 255, 0, 0),
+    ('RED1', 255, 0, 0),
+    ('RED2', 238, 0, 0),
+    ('RED3', 205, 0, 0),
+    ('RED4', 139, 0, 0),
+    ('ROSYBROWN', 188, 143, 143),
+    ('ROSYBROWN1', 255, 193, 193),
+    ('ROSYBROWN2', 238, 180, 180),
+    ('ROSYBROWN3', 205, 155, 155),
+    ('ROSYBROWN4', 139, 105, 105),
+    ('ROYALBLUE', 65, 105, 225),
+    ('ROYALBLUE1', 72, 118, 255),
+    ('ROYALBLUE2', 67, 110, 238),
+    ('ROYALBLUE3', 58, 95, 205),
+    ('ROYALBLUE4', 39, 64, 139),
+    ('SALMON', 250, 128, 114),
+    ('SALMON1', 255, 140, 105),
+    ('SALMON2', 238, 130, 98),
+    ('SALMON3', 205, 112, 84),
+    ('SALMON4', 139, 76, 57),
+    ('SANDYBROWN', 244, 164, 96),
+    ('SAPGREEN', 48, 128, 20),
+    ('SEAGREEN1', 84, 255, 159),
+    ('SEAGREEN2', 78, 238, 148),
+    ('SEAGREEN3', 67, 205, 128),
+    ('SEAGREEN4', 46, 139, 87),
+    ('SEASHELL1', 255, 245, 238),
+    ('SEASHELL2', 238, 229, 222),
+    ('SEASHELL3', 205, 197, 191),
+    ('SEASHELL4', 139, 134, 130),
+    ('SEPIA', 94, 38, 18),
+    ('SGIBEET', 142, 56, 142),
+    ('SGIBRIGHTGRAY', 197, 193, 170),
+    ('SGICHARTREUSE', 113, 198, 113),
+    ('SGIDARKGRAY', 85, 85, 85),
+    ('SGIGRAY12', 30, 30, 30),
+    ('SGIGRAY16', 40, 40, 40),
+    ('SGIGRAY32', 81, 81, 81),
+    ('SGIGRAY36', 91, 91, 91),
+    ('SGIGRAY52', 132, 132, 132),
+    ('SGIGRAY56', 142, 142, 142),
+    ('SGIGRAY72', 183, 183, 183),
+    ('SGIGRAY76', 193, 193, 193),
+    ('SGIGRAY92', 234, 234, 234),
+    ('SGIGRAY96', 244, 244, 244),
+    ('SGILIGHTBLUE', 125, 158, 192),
+    ('SGILIGHTGRAY', 170, 170, 170),
+    ('SGIOLIVEDRAB', 142, 142, 56),
+    ('SGISALMON', 198, 113, 113),
+    ('SGISLATEBLUE', 113, 113, 198),
+    ('SGITEAL', 56, 142, 142),
+    ('SIENNA', 160, 82, 45),
+    ('SIENNA1', 255, 130, 71),
+    ('SIENNA2', 238, 121, 66),
+    ('SIENNA3', 205, 104, 57),
+    ('SIENNA4', 139, 71, 38),
+    ('SILVER', 192, 192, 192),
+    ('SKYBLUE', 135, 206, 235),
+    ('SKYBLUE1', 135, 206, 255),
+    ('SKYBLUE2', 126, 192, 238),
+    ('SKYBLUE3', 108, 166, 205),
+    ('SKYBLUE4', 74, 112, 139),
+    ('SLATEBLUE', 106, 90, 205),
+    ('SLATEBLUE1', 131, 111, 255),
+    ('SLATEBLUE2', 122, 103, 238),
+    ('SLATEBLUE3', 105, 89, 205),
+    ('SLATEBLUE4', 71, 60, 139),
+    ('SLATEGRAY', 112, 128, 144),
+    ('SLATEGRAY1', 198, 226, 255),
+    ('SLATEGRAY2', 185, 211, 238),
+    ('SLATEGRAY3', 159, 182, 205),
+    ('SLATEGRAY4', 108, 123, 139),
+    ('SNOW1', 255, 250, 250),
+    ('SNOW2', 238, 233, 233),
+    ('SNOW3', 205, 201, 201),
+    ('SNOW4', 139, 137, 137),
+    ('SPRINGGREEN', 0, 255, 127),
+    ('SPRINGGREEN1', 0, 238, 118),
+    ('SPRINGGREEN2', 0, 205, 102),
+    ('SPRINGGREEN3', 0, 139, 69),
+    ('STEELBLUE', 70, 130, 180),
+    ('STEELBLUE1', 99, 184, 255),
+    ('STEELBLUE2', 92, 172, 238),
+    ('STEELBLUE3', 79, 148, 205),
+    ('STEELBLUE4', 54, 100, 139),
+    ('TAN', 210, 180, 140),
+    ('TAN1', 255, 165, 79),
+    ('TAN2', 238, 154, 73),
+    ('TAN3', 205, 133, 63),
+    ('TAN4', 139, 90, 43),
+    ('TEAL', 0, 128, 128),
+    ('THISTLE', 216, 191, 216),
+    ('THISTLE1', 255, 225, 255),
+    ('THISTLE2', 238, 210, 238),
+    ('THISTLE3', 205, 181, 205),
+    ('THISTLE4', 139, 123, 139),
+    ('TOMATO1', 255, 99, 71),
+    ('TOMATO2', 238, 92, 66),
+    ('TOMATO3', 205, 79, 57),
+    ('TOMATO4', 139, 54, 38),
+    ('TURQUOISE', 64, 224, 208),
+    ('TURQUOISE1', 0, 245, 255),
+    ('TURQUOISE2', 0, 229, 238),
+    ('TURQUOISE3', 0, 197, 205),
+    ('TURQUOISE4', 0, 134, 139),
+    ('TURQUOISEBLUE', 0, 199, 140),
+    ('VIOLET', 238, 130, 238),
+    ('VIOLETRED', 208, 32, 144),
+    ('VIOLETRED1', 255, 62, 150),
+    ('VIOLETRED2', 238, 58, 140),
+    ('VIOLETRED3', 205, 50, 120),
+    ('VIOLETRED4', 139, 34, 82),
+    ('WARMGREY', 128, 128, 105),
+    ('WHEAT', 245, 222, 179),
+    ('WHEAT1', 255, 231, 186),
+    ('WHEAT2', 238, 216, 174),
+    ('WHEAT3', 205, 186, 150),
+    ('WHEAT4', 139, 126, 102),
+    ('WHITE', 255, 255, 255),
+    ('WHITESMOKE', 245, 245, 245),
+    ('YELLOW', 255, 255, 0),
+    ('YELLOW1', 255, 255, 0),
+    ('YELLOW2', 238, 238, 0),
+    ('YELLOW3', 205, 205, 0),
+    ('YELLOW4', 139, 139, 0),
+)
+
+PRIMARY_NAMES = ('RED', 'ORANGE', 'YELLOW', 'GREEN', 'BLUE', 'INDIGO', 'VIOLET', 'BLACK', 'WHITE')
+
+
+def __getattr__(name:str):
+    # colors and primaries would build the whole table, so only on request
+    if name == 'colors':
+        return Color.colordict
+    if name == 'primaries':
+        colors = Color.colordict
+        return {name: colors[name] for name in _named_table() if name in PRIMARY_NAMES}
+    raise AttributeError("module '" + __name__ + "' has no attribute '" + name + "'")
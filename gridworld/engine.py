@@ -0,0 +1,397 @@
+from gridworld.actor import Actor, Bug, Critter, Flower, Rock
+from gridworld.colors import Color
+from gridworld.grid import BoundedGrid, Grid, Location
+from gridworld.world import MIX_FINAL_SHIFT, MIX_INCREMENT, MIX_STEPS, WorldRandom
+
+import typing
+
+import numpy as np
+
+
+EMPTY, ACTOR, ROCK, FLOWER, BUG, CRITTER = range(6)
+OFFGRID = 255
+
+# row/col offsets for the eight compass headings, indexed by direction // 45
+HEADING_DR = np.array((-1, -1, 0, 1, 1, 1, 0, -1), dtype=np.intp)
+HEADING_DC = np.array((0, 1, 1, 1, 0, -1, -1, -1), dtype=np.intp)
+
+
+class ArrayEngine:
+    '''
+    * Steps the built-in actors of a BoundedGrid as batched array operations.
+    *
+    * Every cell of the grid has a slot in the kind, direction and color arrays.
+    * Rocks and Flowers only touch their own cell, so Rocks are skipped and a
+    * Flower's color is worked out from its age whenever it is read. Bugs and
+    * Critters are stepped in waves: a wave takes every pending actor whose
+    * cells no earlier pending actor can read or write, so the outcome is the
+    * same as ActorWorld.step running act() one actor at a time. A Critter's
+    * draw comes from WorldRandom.randbelow_at, which does not depend on the
+    * order of draws. Once a wave clears less than a quarter of what is left,
+    * the rest act one at a time.
+    '''
+
+    actor_kinds:typing.Dict[type, int] = {
+        Actor: ACTOR,
+        Rock: ROCK,
+        Flower: FLOWER,
+        Bug: BUG,
+        Critter: CRITTER,
+    }
+
+    # pending actors below this many are stepped one at a time
+    SEQUENTIAL_BELOW:int = 64
+
+    grid:BoundedGrid
+    kind:np.ndarray
+    direction:np.ndarray
+    color:np.ndarray
+    born:np.ndarray
+    mobile:np.ndarray
+    step_count:int
+
+    def __init__(self, grid:Grid, rng:WorldRandom = None):
+        '''
+        * @param rng the world's stream, which ActorWorld.step moves on to the
+        * next step's key before stepping the engine
+        '''
+        if not isinstance(grid, BoundedGrid):
+            raise ValueError("The array engine requires a BoundedGrid")
+        if rng is None:
+            rng = WorldRandom()
+        elif not isinstance(rng, WorldRandom):
+            raise ValueError("The array engine requires a WorldRandom")
+        self.grid = grid
+        self.rng = rng
+        self.rows = grid.row_count
+        self.cols = grid.col_count
+        self.size = self.rows * self.cols
+        self.step_count = 0
+        # cell index offsets for the eight compass headings
+        self._offsets = HEADING_DR * self.cols + HEADING_DC
+        # cell index offsets for the cells within two rows and columns of
+        # one that come before it
+        self._earlier = np.array(
+            [dr * self.cols + dc for dr in (-2, -1) for dc in range(-2, 3)] + [-2, -1],
+            dtype=np.intp,
+        )
+        self._decay = self._build_decay_table(1 - Flower.DARKENING_FACTOR)
+        self._is_mobile = np.zeros(256, dtype=bool)
+        self._is_mobile[[ACTOR, BUG, CRITTER]] = True
+        # what a Critter eats
+        self._is_edible = np.ones(256, dtype=bool)
+        self._is_edible[[EMPTY, ROCK, CRITTER, OFFGRID]] = False
+        self.load()
+
+    @staticmethod
+    def _build_decay_table(factor:float) -> np.ndarray:
+        # row n holds every channel value after n Flower.act() calls
+        rows = [list(range(256))]
+        while any(rows[-1]):
+            rows.append([int(c * factor) for c in rows[-1]])
+        return np.array(rows, dtype=np.uint8)
+
+    def load(self):
+        # one extra slot at the end stands in for every location off the grid
+        self.kind = np.full(self.size + 1, EMPTY, dtype=np.uint8)
+        self.kind[self.size] = OFFGRID
+        self.direction = np.zeros(self.size + 1, dtype=np.int16)
+        self.color = np.zeros((self.size + 1, 3), dtype=np.uint8)
+        # each cell's three channels as one item, which copies far faster
+        self._cell_colors = self.color.view(np.dtype((np.void, 3))).reshape(-1)
+        self.born = np.full(self.size + 1, self.step_count, dtype=np.int64)
+        # scratch space for _unreached, small enough to stay in cache longer
+        self._reader = np.zeros(self.size + 1, dtype=np.int32 if self.size < 2**31 else np.intp)
+        # the cells of actors yet to act in the current step
+        self._waiting = np.zeros(self.size + 1, dtype=bool)
+        for loc in self.grid.occupied_locations:
+            occupant = self.grid.get(loc)
+            kind = self.actor_kinds.get(type(occupant))
+            if kind is None:
+                raise TypeError(
+                    occupant.__class__.__name__ + " is not supported by the array engine"
+                )
+            cell = loc.row * self.cols + loc.col
+            self.kind[cell] = kind
+            self.direction[cell] = occupant.direction
+            self.color[cell] = occupant.color.rgb
+        self.mobile = np.flatnonzero(self._is_mobile[self.kind[:self.size]])
+
+    def settle_colors(self, cells:np.ndarray = None):
+        # only the flowers among cells, when given
+        if cells is None:
+            flowers = np.flatnonzero(self.kind[:self.size] == FLOWER)
+        else:
+            flowers = cells[self.kind[cells] == FLOWER]
+        age = np.minimum(self.step_count - self.born[flowers], len(self._decay) - 1)
+        self.color[flowers] = self._decay[age[:, None], self.color[flowers]]
+        self.born[flowers] = self.step_count
+
+    def sync(self):
+        self.settle_colors()
+        for loc in list(self.grid.occupied_locations):
+            self.grid.get(loc).remove_self_from_grid()
+        self._write_back(np.flatnonzero(self.kind[:self.size]))
+
+    def sync_range(self, top:int, left:int, bottom:int, right:int):
+        '''
+        * Writes back only the actors in rows top..bottom-1 and columns
+        * left..right-1, which is all a view of part of a large grid needs.
+        '''
+        top, left = max(top, 0), max(left, 0)
+        bottom, right = min(bottom, self.rows), min(right, self.cols)
+        if top >= bottom or left >= right:
+            return
+        cells = (np.arange(top, bottom)[:, None] * self.cols + np.arange(left, right)).ravel()
+        self.settle_colors(cells)
+        for loc in list(self.grid.occupied_locations_in(top, left, bottom, right)):
+            self.grid.get(loc).remove_self_from_grid()
+        self._write_back(cells[self.kind[cells] != EMPTY])
+
+    def _write_back(self, occupied:np.ndarray):
+        # puts a new actor in the grid for each of the occupied cells
+        types = {kind: cls for cls, kind in self.actor_kinds.items()}
+        for cell, kind, direction, rgb in zip(
+            occupied.tolist(),
+            self.kind[occupied].tolist(),
+            self.direction[occupied].tolist(),
+            self.color[occupied].tolist(),
+        ):
+            occupant = types[kind]()
+            occupant.color = Color(*rgb)
+            occupant.direction = direction
+            occupant.rng = self.rng
+            occupant.put_self_in_grid(self.grid, Location(*divmod(cell, self.cols)))
+
+    @property
+    def actor_count(self) -> int:
+        return int(np.count_nonzero(self.kind[:self.size]))
+
+    def step(self):
+        self.step_count += 1
+        cells = self.mobile
+        kinds = self.kind[cells]
+        actors = cells[kinds == ACTOR]
+        self.direction[actors] = (self.direction[actors] + Location.HALF_CIRCLE) % Location.FULL_CIRCLE
+
+        movers = kinds != ACTOR
+        cells = cells[movers]
+        kinds = kinds[movers]
+        self._waiting[cells] = True
+        pending = np.arange(cells.size)
+        while pending.size:
+            count = pending.size
+            if count < self.SEQUENTIAL_BELOW:
+                self._step_sequential(cells, kinds, pending)
+                break
+            pending = self._step_wave(cells, kinds, pending)
+            if 4 * (count - pending.size) < count:
+                self._step_sequential(cells, kinds, pending)
+                break
+
+        # eaten actors leave stale or duplicate entries behind
+        mobile = np.sort(np.concatenate((actors, cells)))
+        keep = self._is_mobile[self.kind[mobile]]
+        keep[1:] &= mobile[1:] != mobile[:-1]
+        self.mobile = mobile[keep]
+
+    def _headings(self, cells:np.ndarray) -> np.ndarray:
+        # the compass heading, 0..7, each actor faces
+        return ((self.direction[cells] + Location.HALF_RIGHT // 2) % Location.FULL_CIRCLE) // Location.HALF_RIGHT
+
+    def _neighbor_cells(self, cells:np.ndarray, headings:np.ndarray) -> np.ndarray:
+        rows, cols = np.divmod(cells, self.cols)
+        rows = rows + HEADING_DR[headings]
+        cols = cols + HEADING_DC[headings]
+        valid = (0 <= rows) & (rows < self.rows) & (0 <= cols) & (cols < self.cols)
+        return np.where(valid, rows * self.cols + cols, self.size)
+
+    def _read_cells(self, at:np.ndarray, is_bug:np.ndarray) -> np.ndarray:
+        # cells each actor may read or write, one column per actor: its own,
+        # then the cell ahead (Bug) or all eight neighbours (Critter), and
+        # self.size when off the grid or unused
+        bugs = np.flatnonzero(is_bug)
+        critters = np.flatnonzero(~is_bug)
+        reads = np.empty((9 if critters.size else 2, at.size), dtype=np.intp)
+        reads[0] = at
+        if critters.size:
+            np.add(self._offsets[:, None], at, out=reads[1:])
+            reads[1, bugs] = at[bugs] + self._offsets[self._headings(at[bugs])]
+            reads[2:, bugs] = self.size
+        else:
+            reads[1] = at + self._offsets[self._headings(at)]
+        # only an actor on the edge can look off the grid
+        rows, cols = np.divmod(at, self.cols)
+        edge = (rows == 0) | (rows == self.rows - 1) | (cols == 0) | (cols == self.cols - 1)
+        if edge.any():
+            bugs = bugs[edge[bugs]]
+            reads[1, bugs] = self._neighbor_cells(at[bugs], self._headings(at[bugs]))
+            critters = critters[edge[critters]]
+            if critters.size:
+                reads[1:, critters] = self._neighbor_cells(
+                    at[critters][None, :], np.arange(8)[:, None]
+                )
+        return reads
+
+    def _unreached(self, at:np.ndarray, is_bug:np.ndarray, reads:np.ndarray) -> np.ndarray:
+        # for each actor, whether no actor before it can read or write any of
+        # its cells
+        unreached = np.empty(at.size, dtype=bool)
+        critters = ~is_bug
+        if critters.any():
+            # whatever reaches a Critter's cells stands within two cells of
+            # it; a location off the grid wraps round to some other cell,
+            # which at worst holds a Critter back a wave
+            cells = at[critters]
+            waiting = self._waiting
+            blocked = waiting.take(cells + self._earlier[0], mode='wrap')
+            for offset in self._earlier[1:]:
+                blocked |= waiting.take(cells + offset, mode='wrap')
+            unreached[critters] = ~blocked
+        bugs = np.flatnonzero(is_bug)
+        if bugs.size:
+            width, count = reads.shape
+            # when an index repeats, the value written last stays, so writing
+            # the actors last to first leaves each cell its first reader
+            reader = self._reader
+            reader[reads[:, ::-1].T.ravel()] = np.repeat(
+                np.arange(count - 1, -1, -1, dtype=reader.dtype), width
+            )
+            reader[self.size] = count
+            if bugs.size < count:
+                reads = reads[:2, bugs]
+            unreached[bugs] = reader[reads[:2]].min(axis=0) >= bugs
+        return unreached
+
+    def _draw_keys(self, cells:np.ndarray) -> np.ndarray:
+        # the top half of WorldRandom.randbelow_at's hash for each cell
+        rows, cols = np.divmod(cells, self.cols)
+        z = (rows.astype(np.uint64) << 32) ^ cols.astype(np.uint64) ^ np.uint64(self.rng.step_key)
+        z += MIX_INCREMENT
+        for shift, multiplier in MIX_STEPS:
+            z ^= z >> shift
+            z *= multiplier
+        z ^= z >> MIX_FINAL_SHIFT
+        return z >> 32
+
+    def _step_bugs(self, src:np.ndarray, ahead:np.ndarray) -> np.ndarray:
+        # moves or turns Bugs that cannot get in each other's way
+        # @return which of them moved
+        kind = self.kind
+        movable = (kind[ahead] == EMPTY) | (kind[ahead] == FLOWER)
+        turning = src[~movable]
+        self.direction[turning] = (self.direction[turning] + Location.HALF_RIGHT) % Location.FULL_CIRCLE
+        src = src[movable]
+        dst = ahead[movable]
+        kind[dst] = BUG
+        self.direction[dst] = self.direction[src]
+        self._cell_colors[dst] = self._cell_colors[src]
+        kind[src] = FLOWER
+        self.direction[src] = Location.NORTH
+        self.born[src] = self.step_count
+        return movable
+
+    def _step_critters(self, src:np.ndarray, neighbors:np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray]:
+        # Critters that cannot get in each other's way eat what is around
+        # them and move to one of the open cells, neighbors holding a column
+        # of eight cells for each
+        # @return which of them moved, and where to
+        kind = self.kind
+        neighbor_kind = kind[neighbors]
+        edible = self._is_edible.take(neighbor_kind)
+        eaten = neighbors[edible]
+        kind[eaten] = EMPTY
+        # an eaten actor that had yet to act never will
+        self._waiting[eaten] = False
+        # the number of open cells up to and including each heading
+        rank = np.cumsum(edible | (neighbor_kind == EMPTY), axis=0, dtype=np.int8)
+        counts = rank[-1]
+        picks = (self._draw_keys(src) * counts.astype(np.uint64)) >> 32
+        # the picks-th open cell follows every heading with no more open
+        # cells than that
+        headings = (rank <= picks.astype(np.int8)).sum(axis=0)
+        moved = np.flatnonzero(counts)
+        src = src[moved]
+        targets = neighbors[headings[moved], moved]
+        kind[targets] = CRITTER
+        self.direction[targets] = self.direction[src]
+        self._cell_colors[targets] = self._cell_colors[src]
+        kind[src] = EMPTY
+        return moved, targets
+
+    def _step_wave(self, cells:np.ndarray, kinds:np.ndarray, pending:np.ndarray) -> np.ndarray:
+        # steps every pending actor no earlier one can get in the way of, and
+        # returns the rest that are still on the grid
+        waiting = self._waiting
+        pending = pending[waiting[cells[pending]]]
+        at = cells[pending]
+        is_bug = kinds[pending] == BUG
+        reads = self._read_cells(at, is_bug)
+        ready = self._unreached(at, is_bug, reads)
+        waiting[at[ready]] = False
+        bugs = ready & is_bug
+        if bugs.any():
+            ahead = reads[1, bugs]
+            moved = self._step_bugs(at[bugs], ahead)
+            cells[pending[bugs][moved]] = ahead[moved]
+        critters = ready & ~is_bug
+        if critters.any():
+            moved, targets = self._step_critters(at[critters], reads[1:, critters])
+            cells[pending[critters][moved]] = targets
+        return pending[~ready]
+
+    def _step_sequential(self, cells:np.ndarray, kinds:np.ndarray, pending:np.ndarray):
+        # steps the pending actors one at a time, in order
+        at = cells[pending]
+        is_bug = kinds[pending] == BUG
+        reads = self._read_cells(at, is_bug)
+        # memoryviews index far faster than numpy scalars in a Python loop
+        kind = memoryview(self.kind)
+        direction = memoryview(self.direction)
+        color = memoryview(self.color.reshape(-1))
+        born = memoryview(self.born)
+        waiting = memoryview(self._waiting)
+        is_edible = self._is_edible.tolist()
+        moved = list()
+        targets = list()
+        for index, cell, bug, cell_reads, key in zip(
+            pending.tolist(), at.tolist(), is_bug.tolist(), reads.T.tolist(),
+            self._draw_keys(at).tolist(),
+        ):
+            if not waiting[cell]:
+                # eaten by a Critter earlier in the step
+                continue
+            waiting[cell] = False
+            if bug:
+                ahead = cell_reads[1]
+                if kind[ahead] in (EMPTY, FLOWER):
+                    kind[ahead] = BUG
+                    direction[ahead] = direction[cell]
+                    color[3 * ahead:3 * ahead + 3] = color[3 * cell:3 * cell + 3]
+                    kind[cell] = FLOWER
+                    direction[cell] = Location.NORTH
+                    born[cell] = self.step_count
+                    moved.append(index)
+                    targets.append(ahead)
+                else:
+                    direction[cell] = (direction[cell] + Location.HALF_RIGHT) % Location.FULL_CIRCLE
+                continue
+            empty = list()
+            for neighbor in cell_reads[1:]:
+                neighbor_kind = kind[neighbor]
+                if neighbor_kind == EMPTY:
+                    empty.append(neighbor)
+                elif is_edible[neighbor_kind]:
+                    kind[neighbor] = EMPTY
+                    waiting[neighbor] = False
+                    empty.append(neighbor)
+            if empty:
+                target = empty[(key * len(empty)) >> 32]
+                kind[target] = CRITTER
+                direction[target] = direction[cell]
+                color[3 * target:3 * target + 3] = color[3 * cell:3 * cell + 3]
+                kind[cell] = EMPTY
+                moved.append(index)
+                targets.append(target)
+        if moved:
+            cells[moved] = targets
@@ -1,9 +1,31 @@
+import collections
 import typing 
 import math
-import tkinter as tk
+import random
+
+if typing.TYPE_CHECKING:
+    import tkinter as tk
+
+
+# (row, col) steps for each compass heading, indexed by direction // 45
+DIRECTION_OFFSETS = (
+    (-1, 0),    # NORTH
+    (-1, 1),    # NORTHEAST
+    (0, 1),     # EAST
+    (1, 1),     # SOUTHEAST
+    (1, 0),     # SOUTH
+    (1, -1),    # SOUTHWEST
+    (0, -1),    # WEST
+    (-1, -1),   # NORTHWEST
+)
+
+_set_slot = object.__setattr__
+# (row, col) -> the shared Location for it, least recently used first
+_interned:collections.OrderedDict = collections.OrderedDict()
 
 
 class Location:
+    __slots__ = ('row', 'col', '_adjacent')
 
     row: int
     col: int
@@ -25,28 +47,55 @@ class Location:
     WEST:int = 270
     NORTHWEST:int = 315
 
+    # how many locations Location.of keeps around, dropping the least
+    # recently used beyond that; 0 turns interning off
+    INTERN_LIMIT:int = 1 << 16
+
     def __init__(self, r:int, c:int):
-        self.row = r
-        self.col = c
+        _set_slot(self, 'row', r)
+        _set_slot(self, 'col', c)
+
+    @classmethod
+    def of(cls, r:int, c:int) -> "Location":
+        if cls is not Location:
+            return cls(r, c)
+        key = (r, c)
+        loc = _interned.get(key)
+        if loc is not None:
+            _interned.move_to_end(key)
+            return loc
+        loc = cls(r, c)
+        if cls.INTERN_LIMIT > 0:
+            _interned[key] = loc
+            if len(_interned) > cls.INTERN_LIMIT:
+                _interned.popitem(last=False)
+        return loc
+
+    def __setattr__(self, name, value):
+        raise AttributeError(self.__class__.__name__ + " is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(self.__class__.__name__ + " is immutable")
+
+    def __reduce__(self):
+        return (self.__class__, (self.row, self.col))
 
     def getAdjacentLocation(self, direction:int) -> "Location":
-        adjustedDirection:int = (direction + self.HALF_RIGHT // 2) % self.FULL_CIRCLE
-        if adjustedDirection < 0:
-            adjustedDirection += self.FULL_CIRCLE
-
-        adjustedDirection = (adjustedDirection // self.HALF_RIGHT) * self.HALF_RIGHT
-        dc, dr = {
-            self.EAST: (1, 0),
-            self.SOUTHEAST: (1, 1),
-            self.SOUTH: (0, 1),
-            self.SOUTHWEST: (-1, 1),
-            self.WEST: (-1, 0),
-            self.NORTHWEST: (-1, -1),
-            self.NORTH: (0, -1),
-            self.NORTHEAST: (1, -1)
-        }[adjustedDirection]
-        
-        return self.__class__(self.row + dr, self.col + dc)
+        dr, dc = DIRECTION_OFFSETS[
+            ((direction + self.HALF_RIGHT // 2) % self.FULL_CIRCLE) // self.HALF_RIGHT
+        ]
+        return self.of(self.row + dr, self.col + dc)
+
+    def getAdjacentLocations(self) -> typing.Tuple["Location", ...]:
+        try:
+            return self._adjacent
+        except AttributeError:
+            pass
+        of = self.of
+        r, c = self.row, self.col
+        adjacent = tuple(of(r + dr, c + dc) for dr, dc in DIRECTION_OFFSETS)
+        _set_slot(self, '_adjacent', adjacent)
+        return adjacent
 
     def getDirectionToward(self, target:"Location") -> int:
         dx = target.col - self.col
@@ -83,7 +132,57 @@ class Location:
         return self.__class__.__name__ + str(self)
         
 
+class Neighborhood:
+    '''
+    * The valid, occupied and empty neighbours of one location, in compass
+    * order starting from NORTH, as returned by Grid.neighborhoods.
+    '''
+    __slots__ = ('location', 'valid', 'occupied', 'empty')
+
+    location:Location
+    valid:typing.List[Location]
+    occupied:typing.List[Location]
+    empty:typing.List[Location]
+
+    def __init__(self, location:Location, valid:list, occupied:list, empty:list):
+        self.location = location
+        self.valid = valid
+        self.occupied = occupied
+        self.empty = empty
+
+    @property
+    def occupied_count(self) -> int:
+        return len(self.occupied)
+
+    @property
+    def empty_count(self) -> int:
+        return len(self.empty)
+
+    def __repr__(self) -> str:
+        return "{name}({loc}, occupied={occupied}, empty={empty})".format(
+            name=self.__class__.__name__,
+            loc=self.location,
+            occupied=self.occupied,
+            empty=self.empty,
+        )
+
+
+def _neighbor_sum(occupied):
+    # number of occupied neighbours of every cell, from eight shifted views
+    import numpy as np
+    rows, cols = occupied.shape
+    padded = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+    padded[1:-1, 1:-1] = occupied != 0
+    counts = np.zeros((rows, cols), dtype=np.uint8)
+    for dr, dc in DIRECTION_OFFSETS:
+        counts += padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+    return counts
+
+
 class Grid:
+    # the stream of the world showing this grid, which an actor put in the
+    # grid draws from
+    rng:random.Random = None
 
     @property
     def row_count(self) -> int:
@@ -109,6 +208,25 @@ class Grid:
     def occupied_locations(self) -> typing.List[Location]:
         raise NotImplementedError()
 
+    def occupied_locations_in(self, top:int, left:int, bottom:int, right:int) -> typing.Iterable[Location]:
+        raise NotImplementedError()
+
+    @property
+    def occupants(self) -> list:
+        # every occupant, in occupied_locations order
+        return [self.get(loc) for loc in self.occupied_locations]
+
+    @property
+    def occupied_bounds(self) -> typing.Optional[typing.Tuple[int, int, int, int]]:
+        raise NotImplementedError()
+
+    @property
+    def empty_count(self) -> int:
+        raise NotImplementedError()
+
+    def random_empty_location(self, generator:random.Random) -> Location:
+        raise NotImplementedError()
+
     def valid_adjacent_locations(self, loc:Location):
         raise NotImplementedError()
 
@@ -121,20 +239,94 @@ class Grid:
     def neighbors(self, loc:Location):
         raise NotImplementedError()
 
+    def neighborhoods(self, locs:typing.Iterable[Location]) -> typing.List[Neighborhood]:
+        raise NotImplementedError()
+
+    def neighbor_counts(self, locs:typing.Iterable[Location]) -> typing.List[int]:
+        raise NotImplementedError()
+
+    def watch_changes(self) -> typing.Set[Location]:
+        raise NotImplementedError()
+
+    def unwatch_changes(self, changes:typing.Set[Location]):
+        raise NotImplementedError()
+
+    def touch(self, loc:Location):
+        # an occupant changed in place (color, direction); grids that don't
+        # track changes can ignore it
+        pass
+
     @classmethod
-    def builder(cls, parent: tk.Toplevel):
+    def builder(cls, parent: "tk.Toplevel"):
         raise NotImplementedError()
 
 
 class AbstractGrid(Grid):
 
+    _change_sets:tuple = ()
+
     def neighbors(self, loc:Location) -> typing.Iterable:
         for neighborLoc in self.occupied_adjacent_locations(loc):
             yield self.get(neighborLoc)
 
+    def neighborhoods(self, locs:typing.Iterable[Location]) -> typing.List[Neighborhood]:
+        is_valid = self.is_valid
+        get = self.get
+        hoods = list()
+        for loc in locs:
+            valid = [n for n in loc.getAdjacentLocations() if is_valid(n)]
+            occupied = list()
+            empty = list()
+            for n in valid:
+                if get(n) is None:
+                    empty.append(n)
+                else:
+                    occupied.append(n)
+            hoods.append(Neighborhood(loc, valid, occupied, empty))
+        return hoods
+
+    def neighbor_counts(self, locs:typing.Iterable[Location]) -> typing.List[int]:
+        return [hood.occupied_count for hood in self.neighborhoods(locs)]
+
+    def watch_changes(self) -> typing.Set[Location]:
+        # every later put or remove adds its location to the returned set
+        changes = set()
+        self._change_sets = self._change_sets + (changes,)
+        return changes
+
+    def unwatch_changes(self, changes:typing.Set[Location]):
+        self._change_sets = tuple(s for s in self._change_sets if s is not changes)
+
+    def touch(self, loc:Location):
+        if self._change_sets:
+            self._record_change(loc)
+
+    def _record_change(self, loc:Location):
+        for changes in self._change_sets:
+            changes.add(loc)
+
+    def occupied_locations_in(self, top:int, left:int, bottom:int, right:int) -> typing.Iterable[Location]:
+        # rows top..bottom-1, cols left..right-1
+        for loc in self.occupied_locations:
+            if top <= loc.row < bottom and left <= loc.col < right:
+                yield loc
+
+    @property
+    def occupied_bounds(self) -> typing.Optional[typing.Tuple[int, int, int, int]]:
+        # (min row, min col, max row, max col) of the occupants, or None
+        bounds = None
+        for loc in self.occupied_locations:
+            if bounds is None:
+                bounds = [loc.row, loc.col, loc.row, loc.col]
+            else:
+                bounds[0] = min(bounds[0], loc.row)
+                bounds[1] = min(bounds[1], loc.col)
+                bounds[2] = max(bounds[2], loc.row)
+                bounds[3] = max(bounds[3], loc.col)
+        return tuple(bounds) if bounds is not None else None
+
     def valid_adjacent_locations(self, loc:Location) -> typing.Iterable[Location]:
-        for d in range(Location.NORTH, Location.FULL_CIRCLE, Location.HALF_RIGHT):
-            neighborLoc = loc.getAdjacentLocation(d)
+        for neighborLoc in loc.getAdjacentLocations():
             if(self.is_valid(neighborLoc)):
                 yield neighborLoc
 
@@ -171,22 +363,19 @@ class BoundedGrid(AbstractGrid):
         if cols <= 0:
             raise ValueError("cols <= 0")
         self.occupant_array = [[None for c in range(cols)] for r in range(rows)]
+        self._rows = rows
+        self._cols = cols
 
     @property
     def row_count(self):
-        return len(self.occupant_array)
+        return self._rows
 
     @property
     def col_count(self):
-        return len(self.occupant_array[0])
+        return self._cols
 
     def is_valid(self, loc:Location):
-        return (
-            0 <= loc.row and
-            loc.row < self.row_count and
-            0 <= loc.col and 
-            loc.col < self.col_count
-        )
+        return 0 <= loc.row < self._rows and 0 <= loc.col < self._cols
     
     @property
     def occupied_locations(self):
@@ -195,10 +384,39 @@ class BoundedGrid(AbstractGrid):
                 if item is not None:
                     yield Location(r,c)
 
+    def occupied_locations_in(self, top:int, left:int, bottom:int, right:int) -> typing.Iterable[Location]:
+        top, left = max(top, 0), max(left, 0)
+        bottom, right = min(bottom, self.row_count), min(right, self.col_count)
+        for r in range(top, bottom):
+            row = self.occupant_array[r]
+            for c in range(left, right):
+                if row[c] is not None:
+                    yield Location(r,c)
+
+    @property
+    def occupants(self) -> list:
+        return [item for row in self.occupant_array for item in row if item is not None]
+
+    @property
+    def empty_count(self) -> int:
+        return sum(row.count(None) for row in self.occupant_array)
+
+    def random_empty_location(self, generator:random.Random) -> Location:
+        emptyLocs = list()
+        for r, row in enumerate(self.occupant_array):
+            for c, item in enumerate(row):
+                if item is None:
+                    emptyLocs.append(Location(r,c))
+        if(len(emptyLocs) == 0):
+            return None
+        r = int(generator.random() * len(emptyLocs))
+        return emptyLocs[r]
+
     def get(self, loc:Location):
-        if not self.is_valid(loc):
+        r, c = loc.row, loc.col
+        if not (0 <= r < self._rows and 0 <= c < self._cols):
             raise ValueError("Location" + str(loc) + "is not valid")
-        return self.occupant_array[loc.row][loc.col]
+        return self.occupant_array[r][c]
 
     def put(self, loc:Location, obj):
         if not self.is_valid(loc):
@@ -207,6 +425,8 @@ class BoundedGrid(AbstractGrid):
             raise ValueError("obj is None")
         old_occupant = self.get(loc)
         self.occupant_array[loc.row][loc.col] = obj
+        if self._change_sets:
+            self._record_change(loc)
         return old_occupant
 
     def remove(self, loc:Location):
@@ -214,8 +434,175 @@ class BoundedGrid(AbstractGrid):
             raise ValueError("Location" + str(loc) + "is not valid")
         old_occupant = self.get(loc)
         self.occupant_array[loc.row][loc.col] = None
+        if self._change_sets:
+            self._record_change(loc)
         return old_occupant
 
+    def neighborhoods(self, locs:typing.Iterable[Location]) -> typing.List[Neighborhood]:
+        # same as AbstractGrid, minus the is_valid and get calls per neighbour
+        rows = self._rows
+        cols = self._cols
+        array = self.occupant_array
+        hoods = list()
+        for loc in locs:
+            valid = list()
+            occupied = list()
+            empty = list()
+            for n in loc.getAdjacentLocations():
+                r, c = n.row, n.col
+                if 0 <= r < rows and 0 <= c < cols:
+                    valid.append(n)
+                    if array[r][c] is None:
+                        empty.append(n)
+                    else:
+                        occupied.append(n)
+            hoods.append(Neighborhood(loc, valid, occupied, empty))
+        return hoods
+
+    def neighbor_count_array(self):
+        '''
+        * @return a rows x cols NumPy array holding the number of occupied
+        * neighbours of every cell
+        '''
+        import numpy as np
+        occupied = np.array(
+            [[item is not None for item in row] for row in self.occupant_array],
+            dtype=np.uint8
+        )
+        return _neighbor_sum(occupied)
+
+
+class IndexedBoundedGrid(BoundedGrid):
+    '''
+    * A BoundedGrid that also tracks which cells are occupied, in a bitmap and
+    * a set of flat (row * cols + col) indices, so that listing occupants,
+    * counting empty cells and picking a random empty cell never scan the
+    * whole grid.
+    '''
+    occupancy: bytearray
+    _occupied: typing.Set[int]
+
+    SAMPLE_BLOCK:int = 4096
+
+    def __init__(self, rows:int=10, cols:int=10):
+        super().__init__(rows, cols)
+        self._size = rows * cols
+        self.occupancy = bytearray(self._size)
+        self._occupied = set()
+
+    @property
+    def occupied_locations(self):
+        # sorted so that actors still act in row-major order
+        cols = self._cols
+        for index in sorted(self._occupied):
+            r, c = divmod(index, cols)
+            yield Location.of(r, c)
+
+    def occupied_locations_in(self, top:int, left:int, bottom:int, right:int) -> typing.Iterable[Location]:
+        area = max(0, bottom - top) * max(0, right - left)
+        if area <= len(self._occupied):
+            return super().occupied_locations_in(top, left, bottom, right)
+        return AbstractGrid.occupied_locations_in(self, top, left, bottom, right)
+
+    @property
+    def occupied_count(self) -> int:
+        return len(self._occupied)
+
+    @property
+    def empty_count(self) -> int:
+        return self._size - len(self._occupied)
+
+    def random_empty_location(self, generator:random.Random) -> Location:
+        empty = self.empty_count
+        if empty == 0:
+            return None
+        if 4 * empty >= self._size:
+            # mostly empty: a handful of random probes finds a free cell
+            while True:
+                index = generator.randrange(self._size)
+                if not self.occupancy[index]:
+                    return Location(*divmod(index, self._cols))
+        # mostly full: skip whole blocks by counting their free cells
+        n = generator.randrange(empty)
+        occupancy = self.occupancy
+        start = 0
+        free = occupancy.count(0, start, start + self.SAMPLE_BLOCK)
+        while n >= free:
+            n -= free
+            start += self.SAMPLE_BLOCK
+            free = occupancy.count(0, start, start + self.SAMPLE_BLOCK)
+        index = occupancy.find(0, start)
+        for _ in range(n):
+            index = occupancy.find(0, index + 1)
+        return Location(*divmod(index, self._cols))
+
+    # below this many locations the plain loop beats setting up arrays
+    BATCH_THRESHOLD:int = 64
+
+    def occupancy_array(self):
+        # a NumPy view of the bitmap, shared rather than copied
+        import numpy as np
+        return np.frombuffer(self.occupancy, dtype=np.uint8).reshape(self._rows, self._cols)
+
+    def neighbor_count_array(self):
+        return _neighbor_sum(self.occupancy_array())
+
+    def _neighbor_bits(self, locs:typing.List[Location]):
+        import numpy as np
+        rows, cols = self._rows, self._cols
+        offsets = np.array(DIRECTION_OFFSETS)
+        r = np.fromiter((loc.row for loc in locs), dtype=np.intp, count=len(locs))
+        c = np.fromiter((loc.col for loc in locs), dtype=np.intp, count=len(locs))
+        nr = r[:, None] + offsets[:, 0]
+        nc = c[:, None] + offsets[:, 1]
+        valid = (0 <= nr) & (nr < rows) & (0 <= nc) & (nc < cols)
+        bits = np.zeros(valid.shape, dtype=bool)
+        flat = np.frombuffer(self.occupancy, dtype=np.uint8)
+        bits[valid] = flat[(nr * cols + nc)[valid]] != 0
+        return valid, bits
+
+    def neighborhoods(self, locs:typing.Iterable[Location]) -> typing.List[Neighborhood]:
+        locs = list(locs)
+        if len(locs) < self.BATCH_THRESHOLD:
+            return super().neighborhoods(locs)
+        valid, bits = self._neighbor_bits(locs)
+        hoods = list()
+        for loc, valid_row, bits_row in zip(locs, valid.tolist(), bits.tolist()):
+            valid_locs = list()
+            occupied = list()
+            empty = list()
+            for n, is_valid, is_occupied in zip(loc.getAdjacentLocations(), valid_row, bits_row):
+                if is_valid:
+                    valid_locs.append(n)
+                    if is_occupied:
+                        occupied.append(n)
+                    else:
+                        empty.append(n)
+            hoods.append(Neighborhood(loc, valid_locs, occupied, empty))
+        return hoods
+
+    def neighbor_counts(self, locs:typing.Iterable[Location]) -> typing.List[int]:
+        locs = list(locs)
+        if len(locs) < self.BATCH_THRESHOLD:
+            return super().neighbor_counts(locs)
+        _, bits = self._neighbor_bits(locs)
+        return bits.sum(axis=1).tolist()
+
+    def put(self, loc:Location, obj):
+        old_occupant = super().put(loc, obj)
+        index = loc.row * self._cols + loc.col
+        self.occupancy[index] = 1
+        self._occupied.add(index)
+        return old_occupant
+
+    def remove(self, loc:Location):
+        old_occupant = super().remove(loc)
+        index = loc.row * self._cols + loc.col
+        self.occupancy[index] = 0
+        self._occupied.discard(index)
+        return old_occupant
+
+
 class UnboundedGrid(AbstractGrid):
 
     occupant_map:dict
@@ -237,11 +624,27 @@ class UnboundedGrid(AbstractGrid):
     @property
     def occupied_locations(self) -> typing.List[Location]:
         return list(self.occupant_map.keys())
+
+    @property
+    def occupants(self) -> list:
+        return list(self.occupant_map.values())
     
     def get(self, loc:Location):
         if loc is None:
             raise ValueError("loc is None")
         return self.occupant_map.get(loc)
+
+    def occupied_locations_in(self, top:int, left:int, bottom:int, right:int) -> typing.Iterable[Location]:
+        # probe the rectangle cell by cell while that is cheaper than filtering
+        area = max(0, bottom - top) * max(0, right - left)
+        if area > len(self.occupant_map):
+            return AbstractGrid.occupied_locations_in(self, top, left, bottom, right)
+        occupants = self.occupant_map
+        return [
+            loc for loc in (
+                Location.of(r, c) for r in range(top, bottom) for c in range(left, right)
+            ) if loc in occupants
+        ]
     
     def put(self, loc:Location, obj):
         if loc is None:
@@ -250,11 +653,154 @@ class UnboundedGrid(AbstractGrid):
             raise ValueError("obj is None")
         old_occupant = self.occupant_map.get(loc)
         self.occupant_map[loc] = obj
+        if self._change_sets:
+            self._record_change(loc)
         return old_occupant
 
     def remove(self, loc:Location):
         if loc is None:
             raise ValueError("loc is None")
-        old_occupant = self.occupant_map.get(loc)
-        self.occupant_map[loc] = None
+        if self._change_sets:
+            self._record_change(loc)
+        return self.occupant_map.pop(loc, None)
+
+
+class TiledUnboundedGrid(AbstractGrid):
+    '''
+    * An UnboundedGrid that files occupants into TILE_SIZE x TILE_SIZE tiles
+    * keyed by tile coordinate. A tile is dropped as soon as its last occupant
+    * leaves, and rectangle queries only visit the tiles they overlap.
+    '''
+    TILE_SIZE:int = 64
+
+    tiles:typing.Dict[typing.Tuple[int, int], typing.Dict[int, object]]
+
+    def __init__(self):
+        self.tiles = dict()
+        self._count = 0
+
+    @property
+    def row_count(self) -> int:
+        return -1
+
+    @property
+    def col_count(self) -> int:
+        return -1
+
+    def is_valid(self, loc:Location) -> bool:
+        return True
+
+    @property
+    def occupied_count(self) -> int:
+        return self._count
+
+    @property
+    def occupied_locations(self) -> typing.List[Location]:
+        size = self.TILE_SIZE
+        locs = list()
+        for (tile_row, tile_col), tile in self.tiles.items():
+            for offset in tile:
+                r, c = divmod(offset, size)
+                locs.append(Location.of(tile_row * size + r, tile_col * size + c))
+        return locs
+
+    def occupied_locations_in(self, top:int, left:int, bottom:int, right:int) -> typing.List[Location]:
+        size = self.TILE_SIZE
+        if bottom <= top or right <= left:
+            return list()
+        first_row, last_row = top // size, (bottom - 1) // size
+        first_col, last_col = left // size, (right - 1) // size
+        span = (last_row - first_row + 1) * (last_col - first_col + 1)
+        if span <= len(self.tiles):
+            keys = (
+                (tile_row, tile_col)
+                for tile_row in range(first_row, last_row + 1)
+                for tile_col in range(first_col, last_col + 1)
+                if (tile_row, tile_col) in self.tiles
+            )
+        else:
+            keys = (
+                key for key in self.tiles
+                if first_row <= key[0] <= last_row and first_col <= key[1] <= last_col
+            )
+        locs = list()
+        for tile_row, tile_col in keys:
+            row0, col0 = tile_row * size, tile_col * size
+            inside = top <= row0 and row0 + size <= bottom and left <= col0 and col0 + size <= right
+            for offset in self.tiles[(tile_row, tile_col)]:
+                r, c = divmod(offset, size)
+                r += row0
+                c += col0
+                if inside or (top <= r < bottom and left <= c < right):
+                    locs.append(Location.of(r, c))
+        return locs
+
+    @property
+    def occupied_bounds(self) -> typing.Optional[typing.Tuple[int, int, int, int]]:
+        if not self.tiles:
+            return None
+        size = self.TILE_SIZE
+        keys = self.tiles.keys()
+        # only the outermost tiles can hold the extreme rows and columns
+        min_tile_row = min(k[0] for k in keys)
+        max_tile_row = max(k[0] for k in keys)
+        min_tile_col = min(k[1] for k in keys)
+        max_tile_col = max(k[1] for k in keys)
+        def edge(tile_index, axis, pick):
+            return pick(
+                tile_index * size + divmod(offset, size)[axis]
+                for key, tile in self.tiles.items() if key[axis] == tile_index
+                for offset in tile
+            )
+        return (
+            edge(min_tile_row, 0, min),
+            edge(min_tile_col, 1, min),
+            edge(max_tile_row, 0, max),
+            edge(max_tile_col, 1, max),
+        )
+
+    def get(self, loc:Location):
+        if loc is None:
+            raise ValueError("loc is None")
+        tile_row, r = divmod(loc.row, self.TILE_SIZE)
+        tile_col, c = divmod(loc.col, self.TILE_SIZE)
+        tile = self.tiles.get((tile_row, tile_col))
+        if tile is None:
+            return None
+        return tile.get(r * self.TILE_SIZE + c)
+
+    def put(self, loc:Location, obj):
+        if loc is None:
+            raise ValueError("loc is None")
+        if obj is None:
+            raise ValueError("obj is None")
+        tile_row, r = divmod(loc.row, self.TILE_SIZE)
+        tile_col, c = divmod(loc.col, self.TILE_SIZE)
+        tile = self.tiles.get((tile_row, tile_col))
+        if tile is None:
+            tile = self.tiles[(tile_row, tile_col)] = dict()
+        offset = r * self.TILE_SIZE + c
+        old_occupant = tile.get(offset)
+        if old_occupant is None:
+            self._count += 1
+        tile[offset] = obj
+        if self._change_sets:
+            self._record_change(loc)
+        return old_occupant
+
+    def remove(self, loc:Location):
+        if loc is None:
+            raise ValueError("loc is None")
+        tile_row, r = divmod(loc.row, self.TILE_SIZE)
+        tile_col, c = divmod(loc.col, self.TILE_SIZE)
+        tile = self.tiles.get((tile_row, tile_col))
+        if tile is None:
+            return None
+        old_occupant = tile.pop(r * self.TILE_SIZE + c, None)
+        if self._change_sets:
+            self._record_change(loc)
+        if old_occupant is not None:
+            self._count -= 1
+            if not tile:
+                del self.tiles[(tile_row, tile_col)]
         return old_occupant
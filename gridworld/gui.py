@@ -1,48 +1,54 @@
-
 from gridworld.colors import Color, primaries as primary_colors
-from gridworld.grid import Grid, UnboundedGrid, BoundedGrid, Location
+from gridworld.grid import Grid, UnboundedGrid, BoundedGrid, IndexedBoundedGrid, TiledUnboundedGrid, Location
+from gridworld.sprites import ImageIndex, SpriteCache, default_directory
 from gridworld.world import World
 from gridworld.timer import RepeatTimer
+import copy
 import inspect
 
-import glob
 import os
-from PIL import Image, ImageTk, ImageOps
+from PIL import Image, ImageDraw, ImageTk
 import sys
+import typing
 from time import time, sleep
-from threading import Thread, Event
+from threading import Thread, Event, RLock
 import tkinter as tk
 import tkinter.dialog as dialog
 import tkinter.messagebox as messagebox
 from queue import Queue
 
-root = tk.Tk()
-root.overrideredirect(1)
-root.withdraw()
-root.overrideredirect(0) 
-
 dir_path = os.path.dirname(os.path.realpath(__file__))
 resource_path = os.path.join(dir_path, 'resources')
 icon_path = os.path.join(resource_path, 'ui', 'GridWorld.gif')
-root.wm_iconphoto(True, ImageTk.PhotoImage(Image.open(icon_path)))
 
+_root:tk.Tk = None
 
-def _search_for_image(name):
-    paths_to_search = [
+def get_root() -> tk.Tk:
+    # the Tk root needs a display, so it is only created once a window is shown
+    global _root
+    if _root is None:
+        _root = tk.Tk()
+        _root.overrideredirect(1)
+        _root.withdraw()
+        _root.overrideredirect(0) 
+        _root.wm_iconphoto(True, ImageTk.PhotoImage(Image.open(icon_path)))
+    return _root
+
+
+def _image_roots():
+    return [
         os.getcwd(),
         resource_path,
         *sys.path
     ]
-    image_endings = [
-        "jpg", "jpeg",
-        "png", "gif"
-    ]
-    for path in paths_to_search:
-        for ending in image_endings:
-            g = glob.glob(os.path.join(path, '**', f'{name}.{ending}'), recursive=True)
-            if g:
-                return g[0]
-    return None
+
+image_index = ImageIndex(_image_roots)
+
+def register_image(name, path:str):
+    image_index.register(name, path)
+
+def _search_for_image(name):
+    return image_index.find(name)
 
 
 class WorldFrame(tk.Toplevel):
@@ -57,14 +63,20 @@ class WorldFrame(tk.Toplevel):
     grid_classes:tuple
     newGridMenu:tk.Menu
 
+    # frames painted per second at most; steps in between are never drawn
+    FRAME_RATE:int = 30
+    # how often an idle window looks for work other threads left it
+    IDLE_POLL_MS:int = 200
+
     # private variables
     __needs_render:bool
+    __next_frame:float
     _control:"GUIController" = None
 
     # classwide variables
     count:int = 0
     def __init__(self, world:World):
-        super().__init__(root, padx=5, pady=5)
+        super().__init__(get_root(), padx=5, pady=5)
     
         self.overrideredirect(1)
         self.withdraw()
@@ -72,11 +84,16 @@ class WorldFrame(tk.Toplevel):
         self.visible = False
         self.running = True
         self.ui_update_actions = Queue()
+        # held by the simulation thread while it steps the world
+        self.world_lock = RLock()
+        self.__needs_render = False
+        self.__next_frame = 0.0
+        self.__poll_id = None
 
         self.world = world
         self.__class__.count += 1
         self.resources = dict()
-        self.grid_classes = (BoundedGrid, UnboundedGrid)
+        self.grid_classes = (BoundedGrid, IndexedBoundedGrid, UnboundedGrid, TiledUnboundedGrid)
         self.wm_title('GridWorld')
         
 
@@ -126,6 +143,7 @@ class WorldFrame(tk.Toplevel):
         self.running = True
         self.setVisible(True)
         self.rerender()
+        self.wake()
         self.wm_protocol('WM_DELETE_WINDOW', self.hide)
         self.mainloop()
 
@@ -136,20 +154,61 @@ class WorldFrame(tk.Toplevel):
             if self.control.running:
                 self.control.stop()
             exit()
-        
+        self.quit()
+
     def mainloop(self):
+        # Tk's own loop sleeps until there is an event, timer or posted action
         while self.running:
-            while not self.ui_update_actions.empty():
-                action_func = self.ui_update_actions.get()
-                action_func()
-            if self.__needs_render:
-                self.__needs_render = False
-                self.display.render()
-            self.update()
-            self.update_idletasks()
+            super().mainloop()
+
+    def post(self, action):
+        '''
+        * Queues an action for the Tk thread's next poll. Safe to call from
+        * any thread, with or without the world lock, as it never calls Tk.
+        '''
+        self.ui_update_actions.put(action)
+
+    def run_actions(self) -> bool:
+        ran = False
+        while not self.ui_update_actions.empty():
+            action_func = self.ui_update_actions.get()
+            action_func()
+            ran = True
+        return ran
 
     def rerender(self):
+        # safe to call from any thread: it only raises a flag, so a step
+        # holding the world lock never waits on Tk; every request made
+        # before the next paint is merged into it
         self.__needs_render = True
+
+    def wake(self):
+        # polls again as soon as the frame rate allows; from the Tk thread
+        # only, and never with the world lock held
+        self.__schedule_poll(max(0, int((self.__next_frame - time()) * 1000)))
+
+    def __schedule_poll(self, delay_ms:int):
+        if self.__poll_id is not None:
+            self.after_cancel(self.__poll_id)
+        self.__poll_id = self.after(delay_ms, self.poll)
+
+    def poll(self):
+        '''
+        * Runs the queued actions and paints the latest state of the world,
+        * then polls again a frame later while anything is going on, or
+        * after IDLE_POLL_MS when nothing is.
+        '''
+        self.__poll_id = None
+        busy = self.run_actions()
+        if self.__needs_render:
+            self.__needs_render = False
+            self.__next_frame = time() + 1 / self.FRAME_RATE
+            self.display.refresh()
+            busy = True
+        if busy or self.control.running:
+            self.__schedule_poll(1000 // self.FRAME_RATE)
+        else:
+            self.__schedule_poll(self.IDLE_POLL_MS)
         
     def make_menus(self):
         mbar = tk.Menu(self)
@@ -177,6 +236,12 @@ class WorldFrame(tk.Toplevel):
         view_menu.add_command(label="Delete", command=self.control.delete_location)
         view_menu.add_command(label="Zoom In", command=self.display.zoom_in)
         view_menu.add_command(label="Zoom Out", command=self.display.zoom_out)
+        self.heatmap = tk.BooleanVar(value=False)
+        view_menu.add_checkbutton(
+            label="Heatmap",
+            variable=self.heatmap,
+            command=lambda:self.display.set_raster(self.heatmap.get())
+        )
 
         mbar.add_cascade(label="Location", menu=view_menu)
 
@@ -216,6 +281,7 @@ class WorldFrame(tk.Toplevel):
             if new_grid.is_valid(loc):
                 self.world.add(occupant, loc)
         self.rerender()
+        self.wake()
 
     def show_about(self):
         pass
@@ -244,6 +310,7 @@ class GridPanel(tk.Frame):
     TAG_GRID='GRID'
     TAG_BACKGROUND='BACKGROUND'
     TAG_CURRENTLOC='CURRENTLOC'
+    TAG_RASTER='RASTER'
 
     # static constants
     MIN_CELL_SIZE:int = 12
@@ -251,8 +318,10 @@ class GridPanel(tk.Frame):
     DEFAULT_CELL_COUNT:int = 10
     DEFAULT_BORDER_WIDTH:int = 1
     TIP_DELAY:int = 1000
+    # rows and cols drawn past the bottom right edge of the canvas
+    VIEW_MARGIN:int = 2
 
-    _grid:Grid
+    _grid:Grid = None
     num_rows:int
     num_cols:int
     origin_row:int
@@ -263,6 +332,19 @@ class GridPanel(tk.Frame):
     current_location:Location
     image_sources:dict
     used_images:dict
+    sprites:SpriteCache
+    # location -> (canvas item, occupant key) for every occupant on the canvas
+    cell_items:typing.Dict[Location, tuple]
+    _changes:typing.Set[Location] = None
+    _drawn_range:tuple = None
+    _grid_image:ImageTk.PhotoImage = None
+    _grid_image_key:tuple = None
+    # heatmap mode: one pixel block per cell in a single image, used when
+    # cells would be smaller than MIN_CELL_SIZE or when forced from the menu
+    allow_raster:bool = True
+    force_raster:bool = False
+    _raster_pixels = None
+    _raster_image:ImageTk.PhotoImage = None
 
 
 
@@ -276,6 +358,9 @@ class GridPanel(tk.Frame):
         self.current_location = Location(0,0)
         self.image_sources = dict()
         self.used_images = dict()
+        self.sprites = SpriteCache(default_directory())
+        self.cell_items = dict()
+        self.lock = parent.world_lock
         self.grid = parent.world.grid
         width = (self.grid.col_count * (self.cell_size + 1)) + (self.bd)
         height = (self.grid.row_count * (self.cell_size + 1)) + (self.bd)
@@ -311,6 +396,13 @@ class GridPanel(tk.Frame):
 
     @grid.setter
     def grid(self, grid:Grid):
+        if self._changes is not None:
+            self._grid.unwatch_changes(self._changes)
+        try:
+            self._changes = grid.watch_changes()
+        except (AttributeError, NotImplementedError):
+            self._changes = None
+        self._drawn_range = None
         try:
             self._grid = grid
             self.current_location = Location(0,0)
@@ -345,7 +437,46 @@ class GridPanel(tk.Frame):
         else:
             pass
 
+    @property
+    def raster(self) -> bool:
+        return self.force_raster or self.cell_size < self.MIN_CELL_SIZE
+
+    def set_raster(self, enabled:bool):
+        self.force_raster = enabled
+        self._drawn_range = None
+        self.render()
+
+    def refresh(self):
+        '''
+        * Brings the canvas up to date with the grid, redrawing everything
+        * only when the layout changed since the last full render.
+        '''
+        if self.raster:
+            # the heatmap reads an array engine directly, without a flush
+            self.draw_raster()
+            return
+        # an engine only writes back the cells on the canvas, so a frame
+        # costs what it shows however large the world is
+        with self.lock:
+            self.world.flush_range(*self.visible_range())
+        if self._drawn_range is None or self._drawn_range != self.visible_range():
+            self.render()
+        else:
+            self.update_occupants()
+
     def render(self, draw_grid=True, draw_current_loc=True):
+        if self.raster:
+            self.canvas.delete(self.TAG_GRID)
+            self.canvas.delete(self.TAG_BACKGROUND)
+            self.canvas.delete(self.TAG_OCCUPANTS)
+            self.cell_items.clear()
+            self._raster_pixels = None
+            self.draw_raster()
+            if draw_current_loc:
+                self.draw_current_location()
+            return
+        self.canvas.delete(self.TAG_RASTER)
+        self._raster_image = None
         if draw_grid:
             self.draw_grid(True)
         if draw_current_loc:
@@ -353,64 +484,217 @@ class GridPanel(tk.Frame):
         self.draw_occupants()
 
     def draw_grid(self, draw_background=False):
-        width = self.num_cols * (self.cell_size + 1)
-        height = self.num_rows * (self.cell_size + 1)
+        # the lines (and background) of the visible cells are a single image;
+        # every cell looks alike, so panning never has to redraw it
+        _, _, bottom, right = self.visible_range()
+        rows = bottom - self.origin_row
+        cols = right - self.origin_col
+        key = (self.cell_size, rows, cols, draw_background)
+        if key != self._grid_image_key:
+            self._grid_image = ImageTk.PhotoImage(self.grid_image(rows, cols, draw_background))
+            self._grid_image_key = key
         self.canvas.delete(self.TAG_GRID)
+        self.canvas.delete(self.TAG_BACKGROUND)
+        self.canvas.create_image(
+            0,
+            0,
+            image=self._grid_image,
+            anchor=tk.NW,
+            tags=self.TAG_BACKGROUND if draw_background else self.TAG_GRID
+        )
+
+    def grid_image(self, rows:int, cols:int, draw_background=False) -> Image.Image:
+        width = cols * (self.cell_size + self.bd)
+        height = rows * (self.cell_size + self.bd)
+        background = Color.WHITE.rgb + (255,) if draw_background else (0, 0, 0, 0)
+        image = Image.new('RGBA', (width + 1, height + 1), background)
+        draw = ImageDraw.Draw(image)
+        line = Color.BLACK.rgb + (255,)
         if draw_background:
-            self.canvas.delete(self.TAG_BACKGROUND)
-            self.canvas.create_rectangle(
-                0,
-                0, 
-                width,
-                height, 
-                fill=str(Color.WHITE),
-                width=1,
-                tags=self.TAG_BACKGROUND
-            )
-        self.draw_grid_lines()
-
-    def draw_grid_lines(self):
-        width = self.num_cols * (self.cell_size + self.bd)
-        height = self.num_rows * (self.cell_size + self.bd)
-        for row_index in range(1,self.num_rows):
-            self.canvas.create_line(
-                0,      self.bd + (self.cell_size + 1) * row_index,
-                width,  self.bd + (self.cell_size + 1) * row_index,
-                width=self.bd,
-                tags=self.TAG_GRID
-            )
-        for col_index in range(1,self.num_cols):
-            self.canvas.create_line(
-                self.bd + (self.cell_size + 1) * col_index, 0,
-                self.bd + (self.cell_size + 1) * col_index, height,
-                width=self.bd,
-                tags=self.TAG_GRID
+            draw.rectangle((0, 0, width, height), outline=line, width=1)
+        for row_index in range(1, rows):
+            y = self.bd + (self.cell_size + 1) * row_index
+            draw.line((0, y, width, y), fill=line, width=self.bd)
+        for col_index in range(1, cols):
+            x = self.bd + (self.cell_size + 1) * col_index
+            draw.line((x, 0, x, height), fill=line, width=self.bd)
+        return image
+
+    def viewport_size(self) -> tuple:
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        if width <= 1: # not mapped yet, go by the size it asked for
+            width = self.canvas.winfo_reqwidth()
+            height = self.canvas.winfo_reqheight()
+        return max(width, 1), max(height, 1)
+
+    def visible_range(self) -> tuple:
+        # (top, left, bottom, right) of the cells on the canvas, plus a margin
+        width, height = self.viewport_size()
+        rows = min(self.num_rows, height // (self.cell_size + 1) + 1 + self.VIEW_MARGIN)
+        cols = min(self.num_cols, width // (self.cell_size + 1) + 1 + self.VIEW_MARGIN)
+        return (
+            self.origin_row,
+            self.origin_col,
+            self.origin_row + rows,
+            self.origin_col + cols,
+        )
+
+    def draw_raster(self):
+        '''
+        * Draws every visible cell as a (cell_size + 1) pixel square colored
+        * like its occupant, into one canvas image. With an array engine the
+        * colors come straight from its arrays; otherwise a pixel buffer is
+        * kept and only the cells the grid reports as changed are rewritten.
+        '''
+        import numpy as np
+        view = self.visible_range()
+        top, left, bottom, right = view
+        engine = getattr(self.world, 'array_engine', None)
+        with self.lock:
+            if engine is None:
+                # any other engine only needs to write back what is shown
+                self.world.flush_range(*view)
+            if engine is not None:
+                engine.settle_colors()
+                rows, cols = engine.rows, engine.cols
+                occupied = engine.kind[:engine.size].reshape(rows, cols)[top:bottom, left:right]
+                colors = engine.color[:engine.size].reshape(rows, cols, 3)[top:bottom, left:right]
+                pixels = np.where(occupied[:, :, None] != 0, colors, np.uint8(255))
+            elif self._raster_pixels is None or self._drawn_range != view or self._changes is None:
+                pixels = np.full((bottom - top, right - left, 3), 255, dtype=np.uint8)
+                for loc in self.grid.occupied_locations_in(*view):
+                    pixels[loc.row - top, loc.col - left] = self.raster_color(self.grid.get(loc))
+                if self._changes is not None:
+                    self._changes.clear()
+            else:
+                pixels = self._raster_pixels
+                changes = self._changes
+                self._changes = self.grid.watch_changes()
+                self.grid.unwatch_changes(changes)
+                get = self.grid.get
+                for loc in changes:
+                    if top <= loc.row < bottom and left <= loc.col < right:
+                        pixels[loc.row - top, loc.col - left] = self.raster_color(get(loc))
+        self._raster_pixels = pixels
+        self._drawn_range = view
+
+        image = Image.fromarray(pixels, 'RGB')
+        scale = self.cell_size + 1
+        if scale > 1:
+            image = image.resize((image.width * scale, image.height * scale), Image.NEAREST)
+        self._raster_image = ImageTk.PhotoImage(image)
+        items = self.canvas.find_withtag(self.TAG_RASTER)
+        if items:
+            self.canvas.itemconfigure(items[0], image=self._raster_image)
+        else:
+            offset = 1 + self.DEFAULT_BORDER_WIDTH
+            self.canvas.create_image(
+                offset,
+                offset,
+                image=self._raster_image,
+                anchor=tk.NW,
+                tags=self.TAG_RASTER
             )
 
+    @staticmethod
+    def raster_color(occupant) -> tuple:
+        if occupant is None:
+            return Color.WHITE.rgb
+        color = getattr(occupant, 'color', None)
+        return color.rgb if isinstance(color, Color) else Color.BLACK.rgb
+
     def draw_occupants(self):
+        if self.raster:
+            self.render()
+            return
         self.canvas.delete(self.TAG_OCCUPANTS)
-
-        for loc in self.grid.occupied_locations:
-            occupant = self.grid.get(loc)
+        self.cell_items.clear()
+        self._drawn_range = self.visible_range()
+
+        # as in update_occupants, Tk is only called once the lock is released
+        with self.lock:
+            if self._changes is not None:
+                self._changes.clear()
+            snap = self.snapshot(self.grid.occupied_locations_in(*self._drawn_range))
+        for loc, key, occupant in snap:
             if occupant is not None:
                 x,y = self.point_for_location(loc)
-                self.draw_occupant(x, y, occupant)
-
-    def draw_occupant(self, x:int, y:int, occupant):
-        image = None
-        occ_desc = "{name}[col:{color}; dir:{direction}]".format(
-            name=occupant.__class__.__name__,
-            color=str(occupant.color),
-            direction=str(int(occupant.direction))
+                self.cell_items[loc] = (self.draw_occupant(x, y, occupant, key), key)
+
+    def snapshot(self, locs:typing.Iterable[Location]) -> typing.List[tuple]:
+        '''
+        * @return (location, key, occupant) for each visible location, key
+        * None where it is empty. Occupants without a cached image are copied,
+        * so the image can be drawn after the simulation moves on.
+        '''
+        top, left, bottom, right = self._drawn_range
+        get = self.grid.get
+        snap = list()
+        for loc in locs:
+            if not (top <= loc.row < bottom and left <= loc.col < right):
+                continue
+            occupant = get(loc)
+            if occupant is None:
+                snap.append((loc, None, None))
+                continue
+            key = self.occupant_key(occupant)
+            if key not in self.used_images:
+                occupant = copy.copy(occupant)
+            snap.append((loc, key, occupant))
+        return snap
+
+    def update_occupants(self):
+        '''
+        * Redraws only the cells the grid reported as changed since the last
+        * frame, reusing each cell's canvas item where it can.
+        '''
+        if self._changes is None or self._drawn_range != self.visible_range():
+            self.draw_occupants()
+            return
+        # only reading the grid holds up the simulation, not the drawing
+        with self.lock:
+            changes = self._changes
+            self._changes = self.grid.watch_changes()
+            self.grid.unwatch_changes(changes)
+            snap = self.snapshot(changes)
+        for loc, key, occupant in snap:
+            drawn = self.cell_items.get(loc)
+            if occupant is None:
+                if drawn is not None:
+                    self.canvas.delete(drawn[0])
+                    del self.cell_items[loc]
+                continue
+            if drawn is not None:
+                item, drawn_key = drawn
+                if drawn_key == key:
+                    continue
+                image = self.occupant_image(occupant, key)
+                if image is not None and self.used_images.get(drawn_key) is not None:
+                    self.canvas.itemconfigure(item, image=image)
+                    self.cell_items[loc] = (item, key)
+                    continue
+                self.canvas.delete(item)
+            x,y = self.point_for_location(loc)
+            self.cell_items[loc] = (self.draw_occupant(x, y, occupant, key), key)
+
+    def occupant_key(self, occupant) -> tuple:
+        # occupants with the same key share a sprite
+        return (occupant.__class__.__name__,) + self.sprites.key(
+            getattr(occupant, 'color', None), occupant.direction
         )
-        if occ_desc in self.used_images:
-            image = self.used_images.get(occ_desc)
 
-        else:
-            image = self.generate_image(occupant)
-            self.used_images[occ_desc] = image
+    def occupant_image(self, occupant, key:tuple):
+        if key in self.used_images:
+            return self.used_images.get(key)
+        image = self.generate_image(occupant)
+        self.used_images[key] = image
+        return image
+
+    def draw_occupant(self, x:int, y:int, occupant, key:tuple = None) -> int:
+        image = self.occupant_image(occupant, key or self.occupant_key(occupant))
         if image is not None:
-            self.canvas.create_image(
+            return self.canvas.create_image(
                 int(x), 
                 int(y), 
                 image=image,
@@ -418,7 +702,7 @@ class GridPanel(tk.Frame):
                 tags=self.TAG_OCCUPANTS
                 )
         else:
-            self.canvas.create_text(
+            return self.canvas.create_text(
                 x - self.cell_size//2, 
                 y - self.cell_size//2, 
                 text=occupant.__class__.__name__[0:4],
@@ -427,31 +711,25 @@ class GridPanel(tk.Frame):
             )
 
     def generate_image(self, occupant):
-        image = self.get_source_image(occupant)
-        if image:
-            image.thumbnail((self.cell_size, self.cell_size))
-            if hasattr(occupant, 'color') and isinstance(occupant.color, Color):
-                greyscale = ImageOps.grayscale(image)
-                h,s,v = occupant.color.hsv
-                white_map = Color.from_hsv(h,s,min(1.0, v*2))
-                colorized = ImageOps.colorize(
-                    greyscale, 
-                    Color.GRAY15.rgb, 
-                    white_map.rgb, 
-                    mid=occupant.color.rgb,
-                    midpoint=80
-                )
-                try:
-                    a = image.getchannel('A')
-                    colorized.putalpha(a)
-                except:
-                    pass
-                image = colorized.rotate(-occupant.direction)
-            output = ImageTk.PhotoImage(image)
-            return output
+        source = self.source_image(occupant)
+        if source is not None:
+            sprite = self.sprites.get(
+                source,
+                self.cell_size,
+                getattr(occupant, 'color', None),
+                occupant.direction
+            )
+            return ImageTk.PhotoImage(sprite)
         return None
 
     def get_source_image(self, obj):
+        image = self.source_image(obj)
+        if image is not None:
+            return image.copy()
+        return None
+
+    def source_image(self, obj):
+        # the shared, uncopied source; callers must not modify it
         if isinstance(obj, type):
             _cls = obj
         else:
@@ -459,16 +737,16 @@ class GridPanel(tk.Frame):
         while _cls is not None:
             name = _cls.__name__
             if name in self.image_sources:
-                return self.image_sources.get(name).copy()
+                return self.image_sources.get(name)
             path = _search_for_image(name)
             if path is None:
                 _cls = _cls.__base__
                 continue
             image = Image.open(path)
             maxsize = (480, 480)
-            image.thumbnail(maxsize, Image.ANTIALIAS) # no need for the images to be huge. crop this down.
+            image.thumbnail(maxsize, Image.LANCZOS) # no need for the images to be huge. crop this down.
             self.image_sources[name] = image
-            return image.copy()
+            return image
         return None
 
     def draw_current_location(self):
@@ -490,8 +768,8 @@ class GridPanel(tk.Frame):
             if self.num_rows == 0 or self.num_cols == 0:
                 self.cell_size = 0
             else:
-                root.update_idletasks()
-                root.update()
+                get_root().update_idletasks()
+                get_root().update()
                 desired_size = min(
                     (self.winfo_height() - (self.DEFAULT_BORDER_WIDTH * 2))/self.num_rows,
                     (self.winfo_width() - (self.DEFAULT_BORDER_WIDTH * 2))/self.num_cols
@@ -503,8 +781,12 @@ class GridPanel(tk.Frame):
                 else:
                     while (self.cell_size // 2) >= max(desired_size, min_size):
                         self.cell_size //= 2
+                    if self.allow_raster and desired_size < min_size:
+                        # too small for sprites: draw a heatmap instead
+                        self.cell_size = max(0, int(desired_size))
         if previous_cell_size != self.cell_size:
             self.used_images.clear()
+            self._drawn_range = None
         # self.cell_size = self.DEFAULT_CELL_SIZE
 
     def move_location(self, dr, dc):
@@ -574,8 +856,10 @@ class GridPanel(tk.Frame):
 
 class GUIController(tk.Frame):
     INDEFINITE, FIXED_STEPS, PROMPT_STEPS = 0, 1, 2
-    MIN_DELAY_MSECS, MAX_DELAY_MSECS = 20, 1000
-    INITIAL_DELAY = MIN_DELAY_MSECS + (MAX_DELAY_MSECS - MIN_DELAY_MSECS) / 2
+    # never 0: the timer thread would take world_lock again straight after
+    # every step and the Tk thread could wait indefinitely to paint
+    MIN_DELAY_MSECS, MAX_DELAY_MSECS = 1, 1000
+    INITIAL_DELAY = (MIN_DELAY_MSECS + MAX_DELAY_MSECS) // 2
 
     timer:RepeatTimer
     step_button: tk.Button
@@ -606,7 +890,7 @@ class GUIController(tk.Frame):
         self.running = False
 
     def __make_controls(self):
-        self.step_button = tk.Button(self, text="Step", command=self.step)
+        self.step_button = tk.Button(self, text="Step", command=self.step_once)
         self.step_button.pack(side="left", pady=2, ipadx=10, ipady=1)
         self.run_button = tk.Button(self, text="Run", command=self.run)
         self.run_button.pack(side="left", padx=10, pady=2, ipadx=10, ipady=1)
@@ -635,7 +919,7 @@ class GUIController(tk.Frame):
 
     def __update_delay_time(self, delay):
         if self.timer is not None:
-            self.timer.delay_ms = int(delay)
+            self.timer.delay_ms = max(self.MIN_DELAY_MSECS, int(delay))
 
     def run(self):
         self.display.tooltips_enabled = False
@@ -648,8 +932,9 @@ class GUIController(tk.Frame):
         if(hasattr(self, 'timer') and self.timer is not None):
             self.timer.stop()
             self.timer.join()
-        self.timer = RepeatTimer(self.step, self.delay_time.get())
+        self.timer = RepeatTimer(self.step, max(self.MIN_DELAY_MSECS, self.delay_time.get()))
         self.timer.start()
+        self.parent_frame.wake()
 
     def stop(self):
         self.running = False
@@ -661,16 +946,25 @@ class GUIController(tk.Frame):
         self.timer.stop()
         self.timer.join(0.01)
 
+    def step_once(self):
+        # the Step button, on the Tk thread, so the frame can be painted at once
+        self.step()
+        self.parent_frame.wake()
+
     def step(self):
-        self.parent_frame.world.step()
+        # runs on the timer thread while running, so Tk is only touched
+        # through the frame's action queue
+        with self.parent_frame.world_lock:
+            self.parent_frame.world.step()
         self.num_steps_so_far += 1
         if self.num_steps_so_far == self.num_steps_to_run:
-            self.stop()
+            self.parent_frame.post(self.stop)
 
     def __action__create_object_default(self, object_type):
         def action():
             occupant = object_type()
-            self.parent_frame.world.add(occupant, self.display.current_location)
+            with self.parent_frame.world_lock:
+                self.parent_frame.world.add(occupant, self.display.current_location)
             self.display.draw_occupants()
         return action
 
@@ -678,7 +972,8 @@ class GUIController(tk.Frame):
         def action():
             occupant = InstanceBuilder(self.parent_frame, object_type).evaluate()
             if occupant: # this can come back none if cancelled
-                self.parent_frame.world.add(occupant, self.display.current_location)
+                with self.parent_frame.world_lock:
+                    self.parent_frame.world.add(occupant, self.display.current_location)
                 self.display.draw_occupants()
         return action
 
@@ -702,7 +997,7 @@ class GUIController(tk.Frame):
         if name not in self.menu_images: # checking the cache
             img_src = self.display.get_source_image(class_type)
             if img_src is not None:
-                img_src.thumbnail((12,12), Image.ANTIALIAS)
+                img_src.thumbnail((12,12), Image.LANCZOS)
                 # cache the image
                 self.menu_images[name] = ImageTk.PhotoImage(img_src)
 
@@ -718,7 +1013,7 @@ class GUIController(tk.Frame):
                 if name not in self.menu_images: # checking the cache
                     img_src = self.display.get_source_image(occ_type)
                     if img_src is not None:
-                        img_src.thumbnail((12,12), Image.ANTIALIAS)
+                        img_src.thumbnail((12,12), Image.LANCZOS)
                         # cache the image
                         self.menu_images[name] = ImageTk.PhotoImage(img_src)
 
@@ -778,8 +1073,10 @@ class GUIController(tk.Frame):
         world = self.parent_frame.world
         loc = self.display.current_location
         if loc is not None:
-            world.remove(loc)
+            with self.parent_frame.world_lock:
+                world.remove(loc)
             self.parent_frame.rerender()
+            self.parent_frame.wake()
 
     def handle_click(self, event):
         if not self.running:
@@ -0,0 +1,546 @@
+'''
+* Records a run step by step into an append-only directory of keyframe
+* snapshots and per-step cell changes, so it can be played back, or resumed,
+* from any step without simulating everything before it:
+*
+*   world.start_journal('run.journal')
+*   ReplayWorld('run.journal').show()
+'''
+
+from gridworld.actor import ActorWorld
+from gridworld.grid import Grid, Location
+from gridworld.snapshot import NO_COLOR, _pack, _qualified_name, _resolve, _unpack
+from gridworld import snapshot
+
+import array
+import bisect
+import itertools
+import json
+import os
+import struct
+import typing
+import zlib
+
+# journal.json holds the grid, world type, keyframe interval and engine;
+# types.txt the actor types seen so far; key-<step>.gws a snapshot every
+# keyframe_interval steps; steps.idx the offset of every step's block in
+# steps.bin. A block is a BLOCK header (step, flags, cell count, payload
+# length) and zlib-compressed row-major columns of the cells that changed:
+# row and col as deltas, type (EMPTY_TYPE once emptied), direction and color
+VERSION = 1
+
+BLOCK = struct.Struct('<QIII')
+EMPTY_TYPE = 0xFFFF
+# a block flagged FULL lists every occupant and replaces the grid's contents
+FULL = 1
+
+ARRAY_ENGINE = 'gridworld.engine.ArrayEngine'
+PARALLEL_ENGINE = 'gridworld.parallel.ParallelEngine'
+
+
+def _keyframe_name(step:int) -> str:
+    return 'key-{:09d}.gws'.format(step)
+
+
+def _grid_spec(grid:Grid) -> dict:
+    return {
+        'type': _qualified_name(type(grid)),
+        'rows': grid.row_count,
+        'cols': grid.col_count,
+    }
+
+
+def _engine_spec(engine, step:int) -> typing.Optional[dict]:
+    # what resume() needs to step like engine, which has just made step
+    if engine is None:
+        return None
+    spec = {'type': _qualified_name(type(engine))}
+    if spec['type'] == PARALLEL_ENGINE:
+        spec['seed'] = engine.seed
+        spec['stripe_rows'] = engine.stripe_rows
+        # the stripes' streams depend on the engine's own step count
+        spec['first_step'] = step - engine.step_count + 1
+    return spec
+
+
+def _use_engine(world:ActorWorld, spec:typing.Optional[dict], step:int, switched:bool):
+    '''
+    * Has world step on from step as spec says. A parallel engine the run
+    * switched to at this point draws its seed from the world's stream
+    * again, so it must come out as recorded.
+    * @raise ValueError if the run cannot be stepped the same way
+    '''
+    kind = None if spec is None else spec['type']
+    if kind is None:
+        world.use_array_engine(False)
+        world.use_parallel_engine(False)
+    elif kind == ARRAY_ENGINE:
+        world.use_array_engine()
+    elif kind == PARALLEL_ENGINE:
+        if switched:
+            world.use_parallel_engine(stripe_rows=spec['stripe_rows'])
+            if world.engine.seed != spec['seed']:
+                world.use_parallel_engine(False)
+                raise ValueError(
+                    "Step {} cannot be reproduced: the world's random stream "
+                    "differs from the recorded run".format(step + 1)
+                )
+        else:
+            world.use_parallel_engine(stripe_rows=spec['stripe_rows'], seed=spec['seed'])
+        world.engine.step_count = step - spec['first_step'] + 1
+    else:
+        raise ValueError("Cannot resume a run stepped by " + kind)
+
+
+def _build_grid(spec:dict) -> Grid:
+    grid_type = _resolve(spec['type'])
+    if spec['rows'] > 0 and spec['cols'] > 0:
+        return grid_type(spec['rows'], spec['cols'])
+    return grid_type()
+
+
+def _encode(rows, cols, types, directions, colors) -> bytes:
+    # rows and cols must be in row-major order
+    drows = array.array('i', rows)
+    dcols = array.array('i', cols)
+    previous_row = previous_col = 0
+    for i in range(len(drows)):
+        row, col = drows[i], dcols[i]
+        drows[i] = row - previous_row
+        if row == previous_row:
+            dcols[i] = col - previous_col
+        previous_row, previous_col = row, col
+    return b''.join((
+        drows.tobytes(),
+        dcols.tobytes(),
+        array.array('H', types).tobytes(),
+        array.array('H', directions).tobytes(),
+        array.array('I', colors).tobytes(),
+    ))
+
+
+def _encode_arrays(rows, cols, types, directions, colors) -> bytes:
+    # _encode for the NumPy columns of the engine path
+    import numpy as np
+    drows = np.diff(rows, prepend=0).astype(np.int32)
+    dcols = np.where(drows == 0, np.diff(cols, prepend=0), cols).astype(np.int32)
+    return b''.join((
+        drows.tobytes(),
+        dcols.tobytes(),
+        types.astype(np.uint16).tobytes(),
+        directions.astype(np.uint16).tobytes(),
+        colors.astype(np.uint32).tobytes(),
+    ))
+
+
+class JournalWriter:
+    '''
+    * Appends a block for the world's state after each step; ActorWorld.step
+    * calls record() while the writer is its journal.
+    '''
+
+    world:ActorWorld
+    path:str
+    keyframe_interval:int
+    step:int
+
+    def __init__(self, world:ActorWorld, path:str, keyframe_interval:int = 1000, level:int = 1):
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval < 1")
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, 'journal.json')):
+            raise ValueError(path + " already holds a journal")
+        self.world = world
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.level = level
+        self.step = 0
+        self.types = dict()
+        self._grid = None
+        self._changes = None
+        self._engine = None
+        self._previous = None
+        self._engine_spec = _engine_spec(world.engine, 0)
+
+        with open(os.path.join(path, 'journal.json'), 'w') as f:
+            json.dump({
+                'version': VERSION,
+                'world': _qualified_name(type(world)),
+                'grid': _grid_spec(world.grid),
+                'keyframe_interval': keyframe_interval,
+                'engine': self._engine_spec,
+            }, f)
+        self._types_file = open(os.path.join(path, 'types.txt'), 'a')
+        self._blocks = open(os.path.join(path, 'steps.bin'), 'ab')
+        self._index = open(os.path.join(path, 'steps.idx'), 'ab')
+        self._follow(world.grid)
+        self.keyframe()
+
+    def _follow(self, grid:Grid):
+        if self._grid is not None:
+            self._grid.unwatch_changes(self._changes)
+        self._grid = grid
+        self._changes = grid.watch_changes()
+
+    def _type_index(self, cls:type) -> int:
+        index = self.types.get(cls)
+        if index is None:
+            index = self.types[cls] = len(self.types)
+            self._types_file.write(_qualified_name(cls) + '\n')
+            self._types_file.flush()
+        return index
+
+    def keyframe(self):
+        snapshot.save(self.world, os.path.join(self.path, _keyframe_name(self.step)))
+        # the next block is a delta against what the keyframe holds
+        engine = getattr(self.world, 'array_engine', None)
+        if engine is not None:
+            self._engine_changes(engine, True)
+        self._changes.clear()
+
+    def record(self):
+        self.step += 1
+        world = self.world
+        flags = 0
+        header = dict()
+        if world.grid is not self._grid:
+            self._follow(world.grid)
+            flags = FULL
+            header['grid'] = _grid_spec(world.grid)
+        engine = getattr(world, 'array_engine', None)
+        if engine is not None:
+            if engine is not self._engine:
+                flags = FULL
+            columns = self._engine_changes(engine, flags & FULL)
+            # syncs for keyframes mark every cell; the arrays are the truth here
+            self._changes.clear()
+        else:
+            self._engine = self._previous = None
+            # any other engine has to write its actors back to the grid first
+            world.flush()
+            columns = self._grid_changes(flags & FULL)
+        spec = _engine_spec(world.engine, self.step)
+        if spec != self._engine_spec or self.step % self.keyframe_interval == 0:
+            header['engine'] = self._engine_spec = spec
+        self._write(flags, header, columns)
+        if self.step % self.keyframe_interval == 0:
+            self.keyframe()
+
+    def _grid_changes(self, full:bool):
+        grid = self._grid
+        changes, self._changes = self._changes, grid.watch_changes()
+        grid.unwatch_changes(changes)
+        locs = grid.occupied_locations if full else changes
+        locs = sorted(locs, key=lambda loc: (loc.row, loc.col))
+        types = list()
+        directions = list()
+        colors = list()
+        get = grid.get
+        for loc in locs:
+            occupant = get(loc)
+            if occupant is None:
+                types.append(EMPTY_TYPE)
+                directions.append(0)
+                colors.append(NO_COLOR)
+            else:
+                types.append(self._type_index(type(occupant)))
+                directions.append(occupant.direction)
+                colors.append(_pack(getattr(occupant, 'color', None)))
+        return [loc.row for loc in locs], [loc.col for loc in locs], types, directions, colors
+
+    def _engine_changes(self, engine, full:bool):
+        import numpy as np
+        from gridworld.engine import EMPTY
+        engine.settle_colors()
+        size = engine.size
+        kind = engine.kind[:size]
+        rgb = engine.color[:size].astype(np.uint32)
+        packed = (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+        direction = engine.direction[:size]
+        if full or self._previous is None:
+            cells = np.flatnonzero(kind != EMPTY)
+        else:
+            old_kind, old_direction, old_packed = self._previous
+            occupied = kind != EMPTY
+            cells = np.flatnonzero(
+                (kind != old_kind) | (occupied & ((direction != old_direction) | (packed != old_packed)))
+            )
+        self._engine = engine
+        self._previous = (kind.copy(), direction.copy(), packed)
+
+        lookup = np.full(256, EMPTY_TYPE, dtype=np.uint16)
+        for cls, value in engine.actor_kinds.items():
+            lookup[value] = self._type_index(cls)
+        kinds = kind[cells]
+        empty = kinds == EMPTY
+        rows, cols = np.divmod(cells, engine.cols)
+        return (
+            rows.astype(np.int32),
+            cols.astype(np.int32),
+            lookup[kinds],
+            np.where(empty, 0, direction[cells]).astype(np.uint16),
+            np.where(empty, NO_COLOR, packed[cells]).astype(np.uint32),
+        )
+
+    def _write(self, flags:int, header:dict, columns):
+        count = len(columns[0])
+        meta = json.dumps(header).encode() if header else b''
+        encode = _encode if isinstance(columns[0], list) else _encode_arrays
+        payload = zlib.compress(
+            struct.pack('<I', len(meta)) + meta + encode(*columns), self.level
+        )
+        offset = self._blocks.tell()
+        self._blocks.write(BLOCK.pack(self.step, flags, count, len(payload)))
+        self._blocks.write(payload)
+        self._blocks.flush()
+        # the index entry goes last, so a reader never sees half a block
+        self._index.write(struct.pack('<Q', offset))
+        self._index.flush()
+
+    def close(self):
+        if self._grid is not None:
+            self._grid.unwatch_changes(self._changes)
+            self._grid = None
+        for f in (self._types_file, self._blocks, self._index):
+            f.close()
+
+
+class Delta:
+    '''
+    * The cells one step changed. types holds None for a cell that emptied.
+    '''
+
+    step:int
+    full:bool
+    grid:typing.Optional[dict]
+    locations:typing.List[Location]
+    types:typing.List[typing.Optional[type]]
+    directions:typing.List[int]
+    colors:typing.List[int]
+
+    def __init__(self, step, full, grid, locations, types, directions, colors):
+        self.step = step
+        self.full = full
+        self.grid = grid
+        self.locations = locations
+        self.types = types
+        self.directions = directions
+        self.colors = colors
+
+
+class JournalReader:
+
+    path:str
+    meta:dict
+    keyframes:typing.List[int]
+
+    def __init__(self, path:str):
+        self.path = path
+        try:
+            with open(os.path.join(path, 'journal.json')) as f:
+                self.meta = json.load(f)
+        except FileNotFoundError:
+            raise ValueError(path + " is not a journal")
+        if self.meta.get('version') != VERSION:
+            raise ValueError("Unsupported journal version: " + str(self.meta.get('version')))
+        self._blocks = open(os.path.join(path, 'steps.bin'), 'rb')
+        self._colors = dict()
+        self.refresh()
+
+    def refresh(self):
+        '''
+        * Picks up steps and keyframes written since the journal was opened.
+        '''
+        with open(os.path.join(self.path, 'steps.idx'), 'rb') as f:
+            data = f.read()
+        self.offsets = array.array('Q')
+        self.offsets.frombytes(data[:len(data) - len(data) % 8])
+        with open(os.path.join(self.path, 'types.txt')) as f:
+            self._type_names = f.read().split()
+        self._types = dict()
+        self.keyframes = sorted(
+            int(name[4:-4]) for name in os.listdir(self.path)
+            if name.startswith('key-') and name.endswith('.gws')
+        )
+
+    @property
+    def steps(self) -> int:
+        return len(self.offsets)
+
+    def _type(self, index:int) -> type:
+        cls = self._types.get(index)
+        if cls is None:
+            cls = self._types[index] = _resolve(self._type_names[index])
+        return cls
+
+    def _color(self, packed:int):
+        # colors are shared per value, like the named ones they often are
+        color = self._colors.get(packed, self)
+        if color is self:
+            color = self._colors[packed] = _unpack(packed)
+        return color
+
+    def _block(self, step:int) -> typing.Tuple[int, int, int, dict, bytes, int]:
+        # the block of step: number, flags, cell count, header, payload and
+        # where its columns start in the payload
+        if not 1 <= step <= self.steps:
+            raise ValueError("No step {} in {}".format(step, self.path))
+        self._blocks.seek(self.offsets[step - 1])
+        number, flags, count, length = BLOCK.unpack(self._blocks.read(BLOCK.size))
+        data = zlib.decompress(self._blocks.read(length))
+        meta_length, = struct.unpack_from('<I', data)
+        header = json.loads(data[4:4 + meta_length]) if meta_length else dict()
+        return number, flags, count, header, data, 4 + meta_length
+
+    def delta(self, step:int) -> Delta:
+        number, flags, count, header, data, position = self._block(step)
+        columns = list()
+        for code in ('i', 'i', 'H', 'H', 'I'):
+            column = array.array(code)
+            size = column.itemsize * count
+            column.frombytes(data[position:position + size])
+            position += size
+            columns.append(column)
+        drows, dcols, type_column, directions, colors = columns
+
+        rows = list(itertools.accumulate(drows))
+        # a column is relative to the previous cell's only within a row
+        cols = [dcol for _, dcol in itertools.accumulate(
+            zip(drows, dcols),
+            lambda previous, delta: delta if delta[0] else (0, previous[1] + delta[1]),
+        )]
+        types = [None if t == EMPTY_TYPE else self._type(t) for t in type_column]
+        return Delta(
+            number, bool(flags & FULL), header.get('grid'),
+            list(map(Location, rows, cols)), types, directions.tolist(), colors.tolist()
+        )
+
+    def apply(self, grid:Grid, delta:Delta):
+        '''
+        * Brings grid from the state before delta's step to the state after
+        * it, with stand-in actors that draw like the recorded ones.
+        '''
+        if delta.full:
+            for loc in list(grid.occupied_locations):
+                grid.remove(loc).grid = None
+        for loc, cls, direction, packed in zip(delta.locations, delta.types, delta.directions, delta.colors):
+            if cls is None:
+                old = grid.remove(loc)
+            else:
+                actor = cls.__new__(cls)
+                actor._direction = direction
+                actor._color = self._color(packed)
+                actor.grid = grid
+                actor.location = loc
+                old = grid.put(loc, actor)
+            if old is not None:
+                old.grid = None
+
+    def load_keyframe(self, grid:Grid, step:int):
+        '''
+        * Replaces grid's contents with the keyframe taken at step.
+        '''
+        path = os.path.join(self.path, _keyframe_name(step))
+        with snapshot.SnapshotReader(path) as reader:
+            palette = reader.palette()
+            types = reader.types()
+            for loc in list(grid.occupied_locations):
+                grid.remove(loc).grid = None
+            for row, col, t, direction, color in zip(
+                    reader.column('row'), reader.column('col'), reader.column('type'),
+                    reader.column('direction'), reader.column('color')):
+                cls = types[t]
+                actor = cls.__new__(cls)
+                actor._direction = direction
+                actor._color = palette[color]
+                loc = Location(row, col)
+                actor.grid = grid
+                actor.location = loc
+                grid.put(loc, actor)
+
+    def keyframe_grid(self, step:int) -> dict:
+        # the type and size of the grid in the keyframe taken at step
+        with snapshot.SnapshotReader(os.path.join(self.path, _keyframe_name(step))) as reader:
+            return reader.footer['grid']
+
+    def keyframe_before(self, step:int) -> int:
+        # the last keyframe at or before step
+        i = bisect.bisect_right(self.keyframes, step)
+        if i == 0:
+            raise ValueError("No keyframe at or before step " + str(step))
+        return self.keyframes[i - 1]
+
+    def resume(self, step:int) -> ActorWorld:
+        '''
+        * @return the recorded world as it was after step, rebuilt exactly by
+        * restoring the keyframe before it and stepping on from there with
+        * the engine the run used, which the world keeps
+        * @raise ValueError if that engine cannot step the same way here
+        '''
+        if not 0 <= step <= self.steps:
+            raise ValueError("No step {} in {}".format(step, self.path))
+        key = self.keyframe_before(step)
+        world = ActorWorld.restore(os.path.join(self.path, _keyframe_name(key)))
+        if key == 0:
+            spec = self.meta.get('engine')
+        else:
+            spec = self._block(key)[3].get('engine')
+        _use_engine(world, spec, key, False)
+        for s in range(key + 1, step + 1):
+            header = self._block(s)[3]
+            if 'engine' in header and header['engine'] != spec:
+                spec = header['engine']
+                _use_engine(world, spec, s - 1, True)
+            world.step()
+        return world
+
+    def close(self):
+        self._blocks.close()
+
+
+class ReplayWorld(ActorWorld):
+    '''
+    * Plays a journal back instead of simulating: step() moves to the next
+    * recorded step and seek() jumps anywhere through the nearest keyframe.
+    * Every change goes through the grid, so a GridPanel only redraws the
+    * cells that changed.
+    '''
+
+    DEFAULT_MESSAGE = "Replaying a recorded run."
+
+    journal_reader:JournalReader
+    position:int
+
+    def __init__(self, path:str):
+        self.journal_reader = JournalReader(path)
+        self.position = 0
+        super().__init__(_build_grid(self.journal_reader.meta['grid']))
+        self.journal_reader.load_keyframe(self.grid, 0)
+
+    def step(self):
+        if self.position >= self.journal_reader.steps:
+            self.journal_reader.refresh()
+        if self.position < self.journal_reader.steps:
+            self._apply(self.journal_reader.delta(self.position + 1))
+        self.repaint()
+
+    def seek(self, step:int):
+        reader = self.journal_reader
+        step = max(0, min(step, reader.steps))
+        key = reader.keyframe_before(step)
+        # replaying on from here is never slower than from the keyframe
+        if not key <= self.position <= step:
+            spec = reader.keyframe_grid(key)
+            if _grid_spec(self.grid) != spec:
+                self.grid = _build_grid(spec)
+            reader.load_keyframe(self.grid, key)
+            self.position = key
+        while self.position < step:
+            self._apply(reader.delta(self.position + 1))
+        self.repaint()
+
+    def _apply(self, delta:Delta):
+        if delta.grid is not None:
+            self.grid = _build_grid(delta.grid)
+        self.journal_reader.apply(self.grid, delta)
+        self.position = delta.step
@@ -0,0 +1,327 @@
+'''
+* Steps a large ActorWorld on several cores by cutting its BoundedGrid into
+* stripes of stripe_rows rows. Every even stripe acts, then every odd one;
+* actors only touch the cells next to theirs, so stripes of one parity never
+* share a cell. Each worker keeps its stripes' actors between steps and only
+* trades the row on either side of them. A run depends on the world seed and
+* stripe_rows but not on the number of workers, and differs from
+* ActorWorld.step.
+'''
+
+from gridworld.grid import BoundedGrid, Grid, Location
+from gridworld.world import WorldRandom, derive_seed
+
+import multiprocessing
+import os
+import random
+import typing
+
+STRIPE_ROWS = 16
+
+
+def stripe_layout(rows:int, stripe_rows:int) -> typing.List[typing.Tuple[int, int]]:
+    '''
+    * @return the (top, bottom) rows of every stripe, bottom exclusive
+    '''
+    return [(top, min(top + stripe_rows, rows)) for top in range(0, rows, stripe_rows)]
+
+
+class PartitionGrid(BoundedGrid):
+    '''
+    * The rows of a BoundedGrid that one worker holds. Locations keep their
+    * place in the whole grid, so is_valid still sees its true edges; rows
+    * outside first..last-1 have no storage at all.
+    '''
+
+    def __init__(self, rows:int, cols:int, first:int, last:int):
+        super().__init__(1, cols)
+        self._rows = rows
+        self.first = first
+        self.last = last
+        self.occupant_array = [None] * rows
+        for r in range(first, last):
+            self.occupant_array[r] = [None] * cols
+
+    @property
+    def occupied_locations(self):
+        return self.occupied_locations_in(self.first, 0, self.last, self._cols)
+
+    @property
+    def occupants(self) -> list:
+        return [
+            item for row in self.occupant_array[self.first:self.last]
+            for item in row if item is not None
+        ]
+
+    @property
+    def empty_count(self) -> int:
+        return sum(row.count(None) for row in self.occupant_array[self.first:self.last])
+
+    def random_empty_location(self, generator:random.Random) -> Location:
+        raise NotImplementedError("A partition cannot pick a location for the whole grid")
+
+
+def pack_row(grid:Grid, row:int, acted:set = frozenset(), left:int = 0, right:int = None) -> list:
+    '''
+    * @return the occupants of one row, or of its columns left..right-1, as
+    * picklable (col, type, fields, acted) tuples, without their grid,
+    * location and random stream
+    '''
+    cells = list()
+    get = grid.get
+    for c in range(left, grid.col_count if right is None else right):
+        occupant = get(Location(row, c))
+        if occupant is not None:
+            fields = dict(vars(occupant))
+            for name in ('grid', 'location', 'rng'):
+                fields.pop(name, None)
+            cells.append((c, type(occupant), fields, occupant in acted))
+    return cells
+
+
+def unpack_row(grid:Grid, row:int, cells:list, acted:set = None, rng = None,
+               left:int = 0, right:int = None):
+    '''
+    * Replaces the occupants of one row, or of its columns left..right-1,
+    * with those pack_row described.
+    '''
+    for c in range(left, grid.col_count if right is None else right):
+        loc = Location(row, c)
+        old = grid.get(loc)
+        if old is not None:
+            grid.remove(loc)
+            old.grid = None
+            old.location = None
+    for c, cls, fields, was_acted in cells:
+        occupant = cls.__new__(cls)
+        occupant.__dict__.update(fields)
+        if rng is not None:
+            occupant.rng = rng
+        loc = Location(row, c)
+        grid.put(loc, occupant)
+        occupant.grid = grid
+        occupant.location = loc
+        if was_acted and acted is not None:
+            acted.add(occupant)
+
+
+class Partition:
+    '''
+    * The worker side: rows top..bottom-1 of the grid plus a halo row on
+    * each side, and the stripes that lie in them.
+    '''
+
+    grid:PartitionGrid
+    stripes:typing.List[typing.Tuple[int, int, int]]
+    # actors that already acted this step; cleared when a step begins
+    acted:set
+
+    def __init__(self, rows:int, cols:int, top:int, bottom:int,
+                 stripes:typing.List[typing.Tuple[int, int, int]], seed:int):
+        self.rows = rows
+        self.top = top
+        self.bottom = bottom
+        self.grid = PartitionGrid(rows, cols, max(top - 1, 0), min(bottom + 1, rows))
+        self.stripes = stripes
+        self.seed = seed
+        self.acted = set()
+
+    def apply(self, incoming:typing.Dict[int, list]):
+        for row, cells in incoming.items():
+            unpack_row(self.grid, row, cells, self.acted)
+
+    def load(self, incoming:typing.Dict[int, list]):
+        self.apply(incoming)
+
+    def sync(self, incoming:typing.Dict[int, list], top:int = None, left:int = 0,
+             bottom:int = None, right:int = None) -> typing.Dict[int, list]:
+        # the rows it owns, or those of them in top..bottom-1
+        self.apply(incoming)
+        rows = range(
+            self.top if top is None else max(top, self.top),
+            self.bottom if bottom is None else min(bottom, self.bottom),
+        )
+        return {row: pack_row(self.grid, row, left=left, right=right) for row in rows}
+
+    def phase(self, step:int, phase:int, incoming:typing.Dict[int, list]) -> typing.Dict[int, list]:
+        '''
+        * Runs this worker's stripes of one parity.
+        * @return the halo row it may have changed, for the worker that owns
+        * it, along with its own row next to it, which that worker reads in
+        * the next phase
+        '''
+        self.apply(incoming)
+        if phase == 0:
+            self.acted.clear()
+        grid = self.grid
+        acted = self.acted
+        for index, top, bottom in self.stripes:
+            if index % 2 != phase:
+                continue
+            rng = WorldRandom(derive_seed(self.seed, 'stripe', step, index))
+            rng.next_step()
+            actors = [
+                a for row in grid.occupant_array[top:bottom] for a in row
+                if a is not None and a not in acted
+            ]
+            for a in actors:
+                if a.grid is grid:
+                    a.rng = rng
+                    a.act()
+                    acted.add(a)
+        if phase == 0 and self.top > 0:
+            rows = (self.top - 1, self.top)
+        elif phase == 1 and self.bottom < self.rows:
+            rows = (self.bottom, self.bottom - 1)
+        else:
+            return dict()
+        return {row: pack_row(grid, row, acted) for row in rows}
+
+
+def _serve(conn, *args):
+    partition = Partition(*args)
+    while True:
+        command, *message = conn.recv()
+        if command == 'close':
+            break
+        try:
+            conn.send((True, getattr(partition, command)(*message)))
+        except Exception as e:
+            conn.send((False, e))
+    conn.close()
+
+
+class ParallelEngine:
+    '''
+    * Keeps the occupants of a BoundedGrid in worker processes and steps
+    * them there; see the module docstring. Like the array engine, it only
+    * writes actors back to the grid on sync().
+    '''
+
+    grid:BoundedGrid
+    seed:int
+    stripe_rows:int
+    step_count:int
+    # (top, bottom) rows each worker owns
+    partitions:typing.List[typing.Tuple[int, int]]
+
+    def __init__(self, grid:Grid, seed:int, rng = random, workers:int = None,
+                 stripe_rows:int = None):
+        if stripe_rows is None:
+            stripe_rows = STRIPE_ROWS
+        if not isinstance(grid, BoundedGrid):
+            raise ValueError("Parallel stepping requires a BoundedGrid")
+        from gridworld.shared import SharedBoundedGrid
+        if isinstance(grid, SharedBoundedGrid):
+            # publishing every step would mean fetching every actor back
+            raise ValueError("A SharedBoundedGrid cannot be stepped in parallel")
+        if stripe_rows < 2:
+            raise ValueError("stripe_rows < 2")
+        if workers is not None and workers <= 0:
+            raise ValueError("workers <= 0")
+        self.grid = grid
+        self.seed = seed
+        self.stripe_rows = stripe_rows
+        self.rng = rng
+        self.rows = grid.row_count
+        self.cols = grid.col_count
+        self.step_count = 0
+
+        stripes = stripe_layout(self.rows, stripe_rows)
+        pairs = (len(stripes) + 1) // 2
+        workers = min(workers or os.cpu_count() or 1, pairs)
+        bounds = [2 * (pairs * w // workers) for w in range(workers + 1)]
+        self.partitions = list()
+        self._connections = list()
+        self._processes = list()
+        for first, last in zip(bounds, bounds[1:]):
+            owned = [(i, top, bottom) for i, (top, bottom) in enumerate(stripes[first:last], first)]
+            top, bottom = owned[0][1], owned[-1][2]
+            conn, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_serve, args=(child, self.rows, self.cols, top, bottom, owned, seed),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self.partitions.append((top, bottom))
+            self._connections.append(conn)
+            self._processes.append(process)
+        self._pending = [dict() for _ in self._processes]
+        self.load()
+
+    @property
+    def workers(self) -> int:
+        return len(self._processes)
+
+    def _call(self, command:str, messages:typing.List[tuple]) -> list:
+        if not self._connections:
+            raise ValueError("The parallel engine is closed")
+        # send to every worker before waiting on any, so they run together
+        for conn, message in zip(self._connections, messages):
+            conn.send((command,) + message)
+        replies = [conn.recv() for conn in self._connections]
+        for ok, value in replies:
+            if not ok:
+                raise value
+        return [value for ok, value in replies]
+
+    def load(self):
+        messages = list()
+        for top, bottom in self.partitions:
+            rows = range(max(top - 1, 0), min(bottom + 1, self.rows))
+            messages.append(({row: pack_row(self.grid, row) for row in rows},))
+        self._call('load', messages)
+        self._pending = [dict() for _ in self._processes]
+
+    def sync(self):
+        # the rows handed down at the end of the last step reach their owners first
+        replies = self._call('sync', [(pending,) for pending in self._pending])
+        self._pending = [dict() for _ in self._processes]
+        for loc in list(self.grid.occupied_locations):
+            self.grid.get(loc).remove_self_from_grid()
+        for rows in replies:
+            for row, cells in rows.items():
+                unpack_row(self.grid, row, cells, rng=self.rng)
+
+    def sync_range(self, top:int, left:int, bottom:int, right:int):
+        '''
+        * Like sync(), but only fetches the actors in rows top..bottom-1 and
+        * columns left..right-1, so a view of part of the grid costs what
+        * it shows.
+        '''
+        left, right = max(left, 0), min(right, self.cols)
+        if left >= right:
+            return
+        replies = self._call(
+            'sync', [(pending, top, left, bottom, right) for pending in self._pending]
+        )
+        self._pending = [dict() for _ in self._processes]
+        for rows in replies:
+            for row, cells in rows.items():
+                unpack_row(self.grid, row, cells, rng=self.rng, left=left, right=right)
+
+    def step(self):
+        self.step_count += 1
+        incoming = self._pending
+        for phase in (0, 1):
+            replies = self._call('phase', [(self.step_count, phase, rows) for rows in incoming])
+            incoming = [dict() for _ in replies]
+            # even stripes reach up into the worker above, odd ones down
+            target = -1 if phase == 0 else 1
+            for w, rows in enumerate(replies):
+                if rows:
+                    incoming[w + target].update(rows)
+        self._pending = incoming
+
+    def close(self):
+        for conn in self._connections:
+            try:
+                conn.send(('close',))
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+        for process in self._processes:
+            process.join()
+        self._connections = list()
+        self._processes = list()
@@ -0,0 +1,176 @@
+from gridworld.grid import Grid
+
+import functools
+import inspect
+import json
+import time
+import typing
+
+
+class StepProfiler:
+    '''
+    * Collects where the time of ActorWorld.step goes: act() time and calls
+    * per actor class, a histogram of whole-step latency, the time spent in
+    * repaint, and calls and time per Grid operation. Grid operations are
+    * counted by wrapping the methods of the world's grid while attached,
+    * so an unprofiled world pays nothing. Times are inclusive: a neighbors
+    * call also counts the get calls it makes.
+    '''
+
+    GRID_OPERATIONS = (
+        'get', 'put', 'remove', 'is_valid',
+        'neighbors', 'valid_adjacent_locations', 'empty_adjacent_locations',
+        'occupied_adjacent_locations', 'neighborhoods', 'neighbor_counts',
+    )
+
+    steps:int
+    step_time:float
+    repaint_time:float
+    # class name -> [calls, seconds]
+    actors:typing.Dict[str, list]
+    # operation name -> [calls, seconds]
+    grid_ops:typing.Dict[str, list]
+    # bucket k holds the steps that took under 2**k microseconds
+    histogram:typing.Dict[int, int]
+    grid:Grid = None
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.steps = 0
+        self.step_time = 0.0
+        self.repaint_time = 0.0
+        self.actors = dict()
+        self.grid_ops = {name: [0, 0.0] for name in self.GRID_OPERATIONS}
+        self.histogram = dict()
+        self._step_start = None
+
+    def attach(self, grid:Grid):
+        self.detach()
+        for name in self.GRID_OPERATIONS:
+            method = getattr(grid, name, None)
+            if method is not None:
+                # an instance attribute shadows the class method until detach
+                setattr(grid, name, self._wrap(method, self.grid_ops[name]))
+        self.grid = grid
+
+    def detach(self):
+        if self.grid is None:
+            return
+        for name in self.GRID_OPERATIONS:
+            self.grid.__dict__.pop(name, None)
+        self.grid = None
+
+    @staticmethod
+    def _wrap(method, stat:list):
+        clock = time.perf_counter
+        if inspect.isgeneratorfunction(method):
+            @functools.wraps(method)
+            def timed_generator(*args, **kwargs):
+                stat[0] += 1
+                it = method(*args, **kwargs)
+                while True:
+                    start = clock()
+                    try:
+                        item = next(it)
+                    except StopIteration:
+                        stat[1] += clock() - start
+                        return
+                    stat[1] += clock() - start
+                    yield item
+            return timed_generator
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            stat[0] += 1
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                stat[1] += clock() - start
+        return timed
+
+    def begin_step(self, grid:Grid = None):
+        # the world's grid may have been swapped since the last step, e.g.
+        # from the GUI's grid menu, so follow it like JournalWriter does
+        if grid is not None and grid is not self.grid:
+            self.attach(grid)
+        self._step_start = time.perf_counter()
+
+    def end_step(self):
+        elapsed = time.perf_counter() - self._step_start
+        self.steps += 1
+        self.step_time += elapsed
+        bucket = int(elapsed * 1e6).bit_length()
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    def act(self, actor):
+        start = time.perf_counter()
+        try:
+            actor.act()
+        finally:
+            self.record(actor.__class__.__name__, time.perf_counter() - start)
+
+    def record(self, name:str, seconds:float):
+        stat = self.actors.get(name)
+        if stat is None:
+            stat = self.actors[name] = [0, 0.0]
+        stat[0] += 1
+        stat[1] += seconds
+
+    def repaint(self, world):
+        start = time.perf_counter()
+        try:
+            world.repaint()
+        finally:
+            self.repaint_time += time.perf_counter() - start
+
+    def as_dict(self) -> dict:
+        return {
+            'steps': self.steps,
+            'step_seconds': self.step_time,
+            'repaint_seconds': self.repaint_time,
+            'actors': {
+                name: {'calls': calls, 'seconds': seconds}
+                for name, (calls, seconds) in sorted(self.actors.items())
+            },
+            'grid': {
+                name: {'calls': calls, 'seconds': seconds}
+                for name, (calls, seconds) in self.grid_ops.items() if calls
+            },
+            'step_histogram_us': {
+                str(1 << bucket): count for bucket, count in sorted(self.histogram.items())
+            },
+        }
+
+    def to_json(self, fp:typing.TextIO = None) -> str:
+        text = json.dumps(self.as_dict(), indent=2)
+        if fp is not None:
+            fp.write(text)
+        return text
+
+    def report(self) -> str:
+        lines = list()
+        mean = self.step_time / self.steps if self.steps else 0.0
+        lines.append("{} steps, {:.3f} s total, {:.3f} ms per step, {:.3f} s repainting".format(
+            self.steps, self.step_time, mean * 1000, self.repaint_time
+        ))
+        lines.append("")
+        lines.append("{:<24} {:>10} {:>10} {:>10}".format("actor", "calls", "total s", "us/call"))
+        for name, (calls, seconds) in sorted(self.actors.items(), key=lambda item: -item[1][1]):
+            lines.append("{:<24} {:>10} {:>10.3f} {:>10.2f}".format(
+                name, calls, seconds, seconds * 1e6 / calls
+            ))
+        lines.append("")
+        lines.append("{:<28} {:>10} {:>10} {:>10}".format("grid operation", "calls", "total s", "us/call"))
+        for name, (calls, seconds) in sorted(self.grid_ops.items(), key=lambda item: -item[1][1]):
+            if calls:
+                lines.append("{:<28} {:>10} {:>10.3f} {:>10.2f}".format(
+                    name, calls, seconds, seconds * 1e6 / calls
+                ))
+        lines.append("")
+        lines.append("step latency")
+        for bucket, count in sorted(self.histogram.items()):
+            lines.append("  < {:>10} us {:>8}".format(1 << bucket, count))
+        return "\n".join(lines)
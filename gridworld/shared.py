@@ -0,0 +1,359 @@
+'''
+* A BoundedGrid that mirrors every cell into columns in a shared_memory
+* block, so other processes can read the world without pickling an actor:
+*
+*   grid = SharedBoundedGrid(1000, 1000, actor_ids=True)
+*   generation, columns = SharedGridReader(grid.name).read()
+*
+* The generation counter is odd while the grid changes and even once
+* published; ActorWorld.step publishes after every step. The parallel engine
+* keeps the actors in other processes, so it cannot step one.
+'''
+
+from gridworld.grid import BoundedGrid, Location
+from gridworld.snapshot import NO_COLOR, _pack, _qualified_name
+
+from multiprocessing import resource_tracker, shared_memory
+import itertools
+import struct
+import sys
+import time
+import typing
+
+MAGIC = b'GWSHARE\x01'
+# magic, rows, cols, flags, then the generation and the type table length
+HEADER = struct.Struct('<8sIII')
+GENERATION_OFFSET = 24
+TYPES_LENGTH_OFFSET = 32
+HEADER_SIZE = 64
+TYPE_TABLE_SIZE = 16384
+
+ACTOR_IDS = 1
+
+# names of the blocks this process (or the one it forked from) created; its
+# resource tracker already holds them
+_created:set = set()
+
+# rows x cols each, row-major: type is 0 for an empty cell, else 1 + its
+# index into the type table; color is packed, NO_COLOR for none; actor_id is
+# the number _actor_id gives the occupant, only with ACTOR_IDS
+COLUMNS = (
+    ('type', 'H'),
+    ('direction', 'H'),
+    ('color', 'I'),
+    ('actor_id', 'Q'),
+)
+
+
+_actor_ids = itertools.count(1)
+
+
+def _actor_id(obj) -> int:
+    # numbered the first time it is shared and never reused, unlike id(); 0
+    # for an occupant that cannot keep a number
+    actor_id = getattr(obj, '_shared_id', None)
+    if actor_id is None:
+        actor_id = next(_actor_ids)
+        try:
+            obj._shared_id = actor_id
+        except AttributeError:
+            return 0
+    return actor_id
+
+
+def _layout(rows:int, cols:int, flags:int) -> typing.Tuple[typing.Dict[str, typing.Tuple[int, str]], int]:
+    # name -> (offset, format) of every column, and the total size
+    size = rows * cols
+    offset = HEADER_SIZE + TYPE_TABLE_SIZE
+    columns = dict()
+    for name, fmt in COLUMNS:
+        if name == 'actor_id' and not flags & ACTOR_IDS:
+            continue
+        columns[name] = (offset, fmt)
+        offset += -(-size * struct.calcsize(fmt) // 8) * 8
+    return columns, offset
+
+
+class SharedBoundedGrid(BoundedGrid):
+    '''
+    * A BoundedGrid whose cells are also written to shared memory; see the
+    * module docstring. The process that creates it owns the block and
+    * removes it on close().
+    '''
+
+    memory:shared_memory.SharedMemory
+    # type -> its id in the type column
+    type_ids:typing.Dict[type, int]
+
+    def __init__(self, rows:int=10, cols:int=10, name:str = None, actor_ids:bool = False):
+        super().__init__(rows, cols)
+        flags = ACTOR_IDS if actor_ids else 0
+        self._layout, size = _layout(rows, cols, flags)
+        self.memory = shared_memory.SharedMemory(name, create=True, size=size)
+        _created.add(self.memory.name)
+        buf = self.memory.buf
+        HEADER.pack_into(buf, 0, MAGIC, rows, cols, flags)
+        self._generation = buf[GENERATION_OFFSET:GENERATION_OFFSET + 8].cast('Q')
+        self._types_length = buf[TYPES_LENGTH_OFFSET:TYPES_LENGTH_OFFSET + 4].cast('I')
+        self._type_names = b''
+        self.type_ids = dict()
+        columns = dict()
+        for column, (offset, fmt) in self._layout.items():
+            columns[column] = buf[offset:offset + rows * cols * struct.calcsize(fmt)].cast(fmt)
+        self._type = columns['type']
+        self._direction = columns['direction']
+        self._color = columns['color']
+        self._actor_id = columns.get('actor_id')
+        self._color[:] = memoryview(struct.pack('<I', NO_COLOR) * (rows * cols)).cast('I')
+        self._writing = False
+        self._stepping = False
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    @property
+    def generation(self) -> int:
+        return self._generation[0]
+
+    def _type_id(self, cls:type) -> int:
+        type_id = self.type_ids.get(cls)
+        if type_id is None:
+            names = self._type_names + (_qualified_name(cls) + '\n').encode()
+            if len(names) > TYPE_TABLE_SIZE:
+                raise ValueError("Too many actor types to share")
+            start = HEADER_SIZE + len(self._type_names)
+            self.memory.buf[start:HEADER_SIZE + len(names)] = names[len(self._type_names):]
+            self._type_names = names
+            self._types_length[0] = len(names)
+            type_id = self.type_ids[cls] = len(self.type_ids) + 1
+        return type_id
+
+    def _begin(self):
+        if not self._writing:
+            self._writing = True
+            self._generation[0] += 1
+
+    def _end(self):
+        if self._writing:
+            self._writing = False
+            self._generation[0] += 1
+
+    def _write(self, loc:Location, obj):
+        if not self._writing:
+            self._begin()
+        i = loc.row * self._cols + loc.col
+        if obj is None:
+            self._type[i] = 0
+            self._direction[i] = 0
+            self._color[i] = NO_COLOR
+            if self._actor_id is not None:
+                self._actor_id[i] = 0
+        else:
+            self._type[i] = self._type_id(type(obj))
+            self._direction[i] = getattr(obj, 'direction', 0) & 0xFFFF
+            self._color[i] = _pack(getattr(obj, 'color', None))
+            if self._actor_id is not None:
+                self._actor_id[i] = _actor_id(obj)
+        # a change made between steps is published on its own
+        if not self._stepping:
+            self._end()
+
+    def put(self, loc:Location, obj):
+        old_occupant = super().put(loc, obj)
+        self._write(loc, obj)
+        return old_occupant
+
+    def remove(self, loc:Location):
+        old_occupant = super().remove(loc)
+        self._write(loc, None)
+        return old_occupant
+
+    def touch(self, loc:Location):
+        super().touch(loc)
+        self._write(loc, self.occupant_array[loc.row][loc.col])
+
+    def begin_step(self):
+        '''
+        * Holds back every change until publish(), so readers never see half
+        * a step. ActorWorld.step calls it before any actor acts.
+        '''
+        self._stepping = True
+
+    def publish(self, world = None):
+        '''
+        * Marks the columns consistent. An array engine's arrays are copied
+        * in first, since it leaves the grid alone while it steps.
+        '''
+        engine = getattr(world, 'array_engine', None)
+        if engine is not None:
+            self._copy_engine(engine)
+        self._stepping = False
+        self._end()
+
+    def _copy_engine(self, engine):
+        import numpy as np
+        from gridworld.engine import EMPTY
+        self._begin()
+        engine.settle_colors()
+        kind = engine.kind[:engine.size]
+        lookup = np.zeros(256, dtype=np.uint16)
+        for cls, value in engine.actor_kinds.items():
+            if np.any(kind == value):
+                lookup[value] = self._type_id(cls)
+        empty = kind == EMPTY
+        rgb = engine.color[:engine.size].astype(np.uint32)
+        np.asarray(self._type)[:] = lookup[kind]
+        np.asarray(self._direction)[:] = np.where(empty, 0, engine.direction[:engine.size])
+        np.asarray(self._color)[:] = np.where(
+            empty, NO_COLOR, (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+        )
+        if self._actor_id is not None:
+            # the engine has no actor objects to name
+            np.asarray(self._actor_id)[:] = 0
+
+    def close(self):
+        '''
+        * Releases the shared block; readers that are still attached keep
+        * their mapping until they close too.
+        '''
+        if self.memory is None:
+            return
+        self._release_views()
+        self.memory.close()
+        self.memory.unlink()
+        _created.discard(self.memory.name)
+        self.memory = None
+
+    def _release_views(self):
+        for view in (self._type, self._direction, self._color, self._actor_id,
+                     self._generation, self._types_length):
+            if view is not None:
+                view.release()
+
+    def __del__(self):
+        # SharedMemory's own finalizer cannot unmap the block while these exist
+        if getattr(self, 'memory', None) is not None:
+            self._release_views()
+
+
+class SharedGridReader:
+    '''
+    * Attaches to the block of a SharedBoundedGrid by name, from any process.
+    '''
+
+    rows:int
+    cols:int
+    flags:int
+
+    def __init__(self, name:str):
+        if sys.version_info >= (3, 13):
+            self.memory = shared_memory.SharedMemory(name, track=False)
+        else:
+            # attaching registers the block with this process's resource
+            # tracker, which would remove it when this process exits; the
+            # owner does that
+            self.memory = shared_memory.SharedMemory(name)
+            if self.memory.name not in _created:
+                resource_tracker.unregister(self.memory._name, 'shared_memory')
+        buf = self.memory.buf
+        magic, self.rows, self.cols, self.flags = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            self.memory.close()
+            raise ValueError(name + " is not a shared grid")
+        self._layout, _ = _layout(self.rows, self.cols, self.flags)
+        self._generation = buf[GENERATION_OFFSET:GENERATION_OFFSET + 8].cast('Q')
+        self._types_length = buf[TYPES_LENGTH_OFFSET:TYPES_LENGTH_OFFSET + 4].cast('I')
+        self._views = list()
+
+    @property
+    def generation(self) -> int:
+        return self._generation[0]
+
+    @property
+    def column_names(self) -> typing.List[str]:
+        return list(self._layout)
+
+    def types(self) -> typing.List[typing.Optional[str]]:
+        '''
+        * @return the qualified name of every type id, None for id 0 (empty)
+        '''
+        length = self._types_length[0]
+        names = bytes(self.memory.buf[HEADER_SIZE:HEADER_SIZE + length]).decode()
+        return [None] + names.splitlines()
+
+    def column(self, name:str) -> memoryview:
+        '''
+        * @return a rows x cols view straight onto the shared column; it is
+        * not copied, so it changes under the reader while the grid does
+        '''
+        offset, fmt = self._layout[name]
+        size = self.rows * self.cols * struct.calcsize(fmt)
+        view = self.memory.buf[offset:offset + size].cast(fmt, (self.rows, self.cols))
+        self._views.append(view)
+        return view
+
+    def read(self, names:typing.Iterable[str] = None,
+             timeout:float = 1.0) -> typing.Tuple[int, typing.Dict[str, memoryview]]:
+        '''
+        * Copies the named columns (all by default) from one published state.
+        * @return the generation copied and a rows x cols view of each copy
+        * @raise TimeoutError if the grid kept changing for timeout seconds
+        '''
+        names = list(self._layout) if names is None else list(names)
+        buf = self.memory.buf
+        deadline = time.monotonic() + timeout
+        while True:
+            generation = self._generation[0]
+            if generation % 2 == 0:
+                copies = dict()
+                for name in names:
+                    offset, fmt = self._layout[name]
+                    size = self.rows * self.cols * struct.calcsize(fmt)
+                    copies[name] = bytes(buf[offset:offset + size])
+                if self._generation[0] == generation:
+                    return generation, {
+                        name: memoryview(data).cast(self._layout[name][1], (self.rows, self.cols))
+                        for name, data in copies.items()
+                    }
+            if time.monotonic() > deadline:
+                raise TimeoutError("The shared grid did not settle within " + str(timeout) + " s")
+            time.sleep(0.001)
+
+    def wait(self, generation:int, timeout:float = None) -> typing.Optional[int]:
+        '''
+        * Waits for a published generation newer than generation.
+        * @return that generation, or None after timeout seconds
+        '''
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._generation[0]
+            if current > generation and current % 2 == 0:
+                return current
+            if deadline is not None and time.monotonic() > deadline:
+                return None
+            time.sleep(0.001)
+
+    def close(self):
+        if self.memory is None:
+            return
+        self._release_views()
+        self.memory.close()
+        self.memory = None
+
+    def _release_views(self):
+        for view in self._views:
+            view.release()
+        self._views = list()
+        self._generation.release()
+        self._types_length.release()
+
+    def __del__(self):
+        if getattr(self, 'memory', None) is not None:
+            self._release_views()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
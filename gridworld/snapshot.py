@@ -0,0 +1,413 @@
+'''
+* Saves a world and everything on its grid to one file of columns, one per
+* attribute, and rebuilds it so that later steps come out exactly as they
+* would have:
+*
+*   world.snapshot('run.gws')
+*   world = ActorWorld.restore('run.gws')
+'''
+
+from gridworld.colors import Color
+from gridworld.grid import Grid, Location
+
+import array
+import contextlib
+import importlib
+import itertools
+import json
+import mmap
+import os
+import struct
+import sys
+import typing
+from operator import attrgetter
+
+# the file is MAGIC, then the row, col, type, direction and color columns in
+# grid.occupied_locations order, a palette of packed colors, one column per
+# extra field per type, a JSON footer and a TRAILER giving its offset, length
+# and MAGIC again; columns are read back through mmap without copying
+MAGIC = b'GWSNAP\x00\x01'
+TRAILER = struct.Struct('<QQ8s')
+ALIGNMENT = 8
+# a palette entry for an occupant whose color is not a Color
+NO_COLOR = 0xFFFFFFFF
+
+# attributes every actor has, saved in their own columns or given back on restore
+BASE_FIELDS = frozenset(('grid', 'location', 'rng'))
+
+_MISSING = object()
+
+
+def _qualified_name(cls:type) -> str:
+    return cls.__module__ + '.' + cls.__qualname__
+
+
+def _resolve(name:str) -> type:
+    module_name, _, class_name = name.rpartition('.')
+    module = sys.modules.get(module_name) or importlib.import_module(module_name)
+    return getattr(module, class_name)
+
+
+def _pack(color) -> int:
+    if not isinstance(color, Color):
+        return NO_COLOR
+    return color.packed
+
+
+def _unpack(packed:int, name:str = None) -> typing.Optional[Color]:
+    if packed == NO_COLOR:
+        return None
+    return Color.of(packed, name)
+
+
+class SnapshotWriter:
+    '''
+    * Streams columns to a file and records where each one went.
+    '''
+
+    def __init__(self, fp:typing.BinaryIO):
+        self.fp = fp
+        self.columns = dict()
+        self.offset = 0
+        self._write(MAGIC)
+
+    def _write(self, data):
+        self.fp.write(data)
+        self.offset += memoryview(data).nbytes
+
+    def column(self, name:str, values):
+        '''
+        * @param values - an array.array, or any buffer such as a NumPy array
+        '''
+        padding = -self.offset % ALIGNMENT
+        if padding:
+            self._write(bytes(padding))
+        view = memoryview(values)
+        self.columns[name] = {
+            'offset': self.offset,
+            'format': view.format,
+            'count': len(view),
+        }
+        self._write(view)
+
+    def close(self, footer:dict):
+        footer = dict(footer, columns=self.columns)
+        data = json.dumps(footer, separators=(',', ':')).encode()
+        start = self.offset
+        self._write(data)
+        self._write(TRAILER.pack(start, len(data), MAGIC))
+
+
+class SnapshotReader:
+    '''
+    * Opens a snapshot through mmap; column() hands out zero-copy views.
+    '''
+
+    footer:dict
+
+    def __init__(self, path:str):
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(path + " is not a world snapshot")
+        try:
+            if len(self._map) < len(MAGIC) + TRAILER.size or self._map[:len(MAGIC)] != MAGIC:
+                raise ValueError(path + " is not a world snapshot")
+            start, length, magic = TRAILER.unpack_from(self._map, len(self._map) - TRAILER.size)
+            if magic != MAGIC:
+                raise ValueError(path + " is truncated")
+            self.footer = json.loads(bytes(self._map[start:start + length]))
+        except Exception:
+            self.close()
+            raise
+        self._views = list()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def count(self) -> int:
+        return self.footer['count']
+
+    def has_column(self, name:str) -> bool:
+        return name in self.footer['columns']
+
+    def column(self, name:str) -> memoryview:
+        spec = self.footer['columns'][name]
+        size = struct.calcsize(spec['format'])
+        start = spec['offset']
+        view = memoryview(self._map)[start:start + size * spec['count']].cast(spec['format'])
+        self._views.append(view)
+        return view
+
+    def palette(self) -> typing.List[typing.Optional[Color]]:
+        # named colors come back as the shared Color.colordict entries
+        names = self.footer['color_names']
+        return [
+            _unpack(packed, names.get(str(i)))
+            for i, packed in enumerate(self.column('palette'))
+        ]
+
+    def types(self) -> typing.List[type]:
+        return [_resolve(name) for name in self.footer['types']]
+
+    def close(self):
+        for view in getattr(self, '_views', ()):
+            view.release()
+        self._views = list()
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+def _field_column(values:list):
+    '''
+    * @return the array.array typecode and values for a field, or None and a
+    * JSON-able list where every entry is [value], or [] where it was missing
+    '''
+    kinds = set(map(type, values))
+    if kinds == {int}:
+        try:
+            return 'q', array.array('q', values)
+        except OverflowError:
+            pass
+    elif kinds == {float}:
+        return 'd', array.array('d', values)
+    elif kinds == {bool}:
+        return 'B', array.array('B', values)
+    return None, [list() if v is _MISSING else [v] for v in values]
+
+
+def _field_names(cls:type, sample) -> typing.List[str]:
+    '''
+    * @return the extra attributes saved for actors of cls: the public ones
+    * annotated on the class or set on the sample actor. Instance __dict__s
+    * are never touched otherwise, since reading one makes Python build it.
+    '''
+    names = set(vars(sample))
+    for base in cls.__mro__:
+        names.update(getattr(base, '__annotations__', dict()))
+    return sorted(n for n in names if not n.startswith('_') and n not in BASE_FIELDS)
+
+
+@contextlib.contextmanager
+def _replacing(path:str):
+    '''
+    * Writes to a file next to path and moves it over path only once the
+    * block succeeds, so a failed save leaves the previous snapshot as it was.
+    '''
+    temp = path + '.tmp'
+    try:
+        with open(temp, 'wb') as fp:
+            yield fp
+        os.replace(temp, path)
+    finally:
+        if os.path.exists(temp):
+            os.remove(temp)
+
+
+def _footer(world, count:int, types:typing.List[type]) -> dict:
+    grid = world.grid
+    return {
+        'version': 1,
+        'count': count,
+        'world': _qualified_name(type(world)),
+        'grid': {
+            'type': _qualified_name(type(grid)),
+            'rows': grid.row_count,
+            'cols': grid.col_count,
+        },
+        'seed': world.seed,
+        'random': world.generator.getstate(),
+        'message': world.message,
+        'engine': getattr(world, 'array_engine', None) is not None,
+        'types': [_qualified_name(cls) for cls in types],
+        'color_names': dict(),
+        'fields': {str(i): dict() for i in range(len(types))},
+    }
+
+
+def _save_engine(world, engine, path:str):
+    # straight from the engine's arrays, without syncing the grid first; its
+    # actor types have no fields beyond location, direction and color
+    import numpy as np
+    from gridworld.engine import EMPTY
+    engine.settle_colors()
+    kind = engine.kind[:engine.size]
+    cells = np.flatnonzero(kind != EMPTY)
+    kinds = kind[cells]
+    present, first = np.unique(kinds, return_index=True)
+    present = present[np.argsort(first)]
+    classes = {value: cls for cls, value in engine.actor_kinds.items()}
+    types = [classes[value] for value in present.tolist()]
+    lookup = np.zeros(256, dtype=np.uint16)
+    lookup[present] = np.arange(len(present), dtype=np.uint16)
+    rgb = engine.color[cells].astype(np.uint32)
+    palette, color_column = np.unique(
+        (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2], return_inverse=True
+    )
+    rows, cols = np.divmod(cells, engine.cols)
+    with _replacing(path) as fp:
+        writer = SnapshotWriter(fp)
+        writer.column('row', rows.astype(np.int32))
+        writer.column('col', cols.astype(np.int32))
+        writer.column('type', lookup[kinds])
+        writer.column('direction', engine.direction[cells].astype(np.int32))
+        writer.column('color', color_column.astype(np.uint32))
+        writer.column('palette', palette.astype(np.uint32))
+        writer.close(_footer(world, len(cells), types))
+
+
+def save(world, path:str):
+    '''
+    * Writes world, its grid and its occupants to path.
+    '''
+    from gridworld.actor import Actor
+    engine = getattr(world, 'array_engine', None)
+    if engine is not None:
+        _save_engine(world, engine, path)
+        return
+    world.flush()
+    grid = world.grid
+    # columns are built with map and attrgetter so a million actors never
+    # run a Python-level loop body
+    actors = grid.occupants
+    types = list(dict.fromkeys(map(type, actors)))
+    for cls in types:
+        if not issubclass(cls, Actor):
+            raise ValueError("Only Actor occupants can be saved, found " + cls.__name__)
+    if len(types) > 0xFFFF:
+        raise ValueError("Too many actor types to save: " + str(len(types)))
+    type_index = {cls: i for i, cls in enumerate(types)}
+    type_list = list(map(type_index.__getitem__, map(type, actors)))
+
+    # equal colors may still differ in name, so keep every distinct object once
+    colors = list(map(attrgetter('_color'), actors))
+    palette = list(dict(zip(map(id, colors), colors)).values())
+    palette_index = {id(c): i for i, c in enumerate(palette)}
+    color_column = array.array('I', map(palette_index.__getitem__, map(id, colors)))
+
+    footer = _footer(world, len(actors), types)
+    footer['color_names'] = {
+        str(i): c.name for i, c in enumerate(palette)
+        if isinstance(c, Color) and c.name is not None
+    }
+
+    with _replacing(path) as fp:
+        writer = SnapshotWriter(fp)
+        writer.column('row', array.array('i', map(attrgetter('location.row'), actors)))
+        writer.column('col', array.array('i', map(attrgetter('location.col'), actors)))
+        writer.column('type', array.array('H', type_list))
+        writer.column('direction', array.array('i', map(attrgetter('_direction'), actors)))
+        writer.column('color', color_column)
+        writer.column('palette', array.array('I', map(_pack, palette)))
+
+        for index, cls in enumerate(types):
+            if len(types) == 1:
+                members = actors
+            else:
+                members = list(itertools.compress(actors, map(index.__eq__, type_list)))
+            fields = dict()
+            for name in _field_names(cls, members[0]):
+                try:
+                    values = list(map(attrgetter(name), members))
+                except AttributeError:
+                    values = [getattr(a, name, _MISSING) for a in members]
+                code, values = _field_column(values)
+                if code is None:
+                    try:
+                        json.dumps(values)
+                    except (TypeError, ValueError) as e:
+                        raise ValueError(
+                            "Cannot save {}.{}: {}".format(cls.__name__, name, e)
+                        ) from None
+                    fields[name] = values
+                else:
+                    writer.column('{}.{}'.format(index, name), values)
+                    fields[name] = None
+            footer['fields'][str(index)] = fields
+
+        writer.close(footer)
+
+
+def restore(path:str, world_type:type = None):
+    '''
+    * Rebuilds the world saved at path, as an instance of the saved World
+    * class, or of world_type when the saved class is not a subclass of it.
+    '''
+    with SnapshotReader(path) as reader:
+        footer = reader.footer
+        if footer.get('version') != 1:
+            raise ValueError("Unsupported snapshot version: " + str(footer.get('version')))
+        spec = footer['grid']
+        grid_type = _resolve(spec['type'])
+        if spec['rows'] > 0 and spec['cols'] > 0:
+            grid:Grid = grid_type(spec['rows'], spec['cols'])
+        else:
+            grid = grid_type()
+        try:
+            saved = _resolve(footer['world'])
+        except (ImportError, AttributeError):
+            # e.g. a World subclass defined in a script's __main__
+            saved = None
+        if saved is not None and (world_type is None or issubclass(saved, world_type)):
+            world_type = saved
+        if world_type is None:
+            raise ValueError("Cannot find the world type " + footer['world'])
+        world = world_type(grid, footer['seed'])
+        state = footer['random']
+        world.generator.setstate((state[0], tuple(state[1]), state[2]))
+        if footer.get('message') is not None:
+            world.message = footer['message']
+
+        palette = reader.palette()
+        types = reader.types()
+        # per type: [(name, values, wrapped)], indexed by the nth actor of the type
+        fields = list()
+        for index in range(len(types)):
+            columns = list()
+            for name, values in footer['fields'][str(index)].items():
+                wrapped = values is not None
+                if not wrapped:
+                    column = reader.column('{}.{}'.format(index, name))
+                    values = column.tolist()
+                    if column.format == 'B':
+                        values = [bool(v) for v in values]
+                columns.append((name, values, wrapped))
+            fields.append(columns)
+        seen = [0] * len(types)
+
+        rng = world.generator
+        put = grid.put
+        for row, col, t, direction, color in zip(
+                reader.column('row'), reader.column('col'), reader.column('type'),
+                reader.column('direction'), reader.column('color')):
+            cls = types[t]
+            actor = cls.__new__(cls)
+            actor._direction = direction
+            actor._color = palette[color]
+            actor.rng = rng
+            if fields[t]:
+                i = seen[t]
+                seen[t] = i + 1
+                for name, values, wrapped in fields[t]:
+                    if not wrapped:
+                        setattr(actor, name, values[i])
+                    elif values[i]:
+                        setattr(actor, name, values[i][0])
+            loc = Location(row, col)
+            put(loc, actor)
+            actor.grid = grid
+            actor.location = loc
+
+    for cls in types:
+        world.occupant_types[cls.__module__ + '.' + cls.__name__] = cls
+    if footer.get('engine') and hasattr(world, 'use_array_engine'):
+        world.use_array_engine()
+    return world
@@ -0,0 +1,298 @@
+from gridworld.colors import Color
+from gridworld.grid import Location
+
+import collections
+import hashlib
+import os
+import time
+import typing
+
+from PIL import Image, ImageOps
+
+
+def default_directory() -> str:
+    if os.environ.get('GRIDWORLD_SPRITE_CACHE'):
+        return os.environ['GRIDWORLD_SPRITE_CACHE']
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'gridworld', 'sprites')
+
+
+class ImageIndex:
+    '''
+    * Finds the image for a class name, e.g. Bug -> .../Bug.png. The roots
+    * are walked once with os.scandir and every image file is indexed by
+    * name, so names that have no image are answered from the index too.
+    * Earlier roots win, then extensions in EXTENSIONS order. The index is
+    * rebuilt when the roots change, or the mtime of a root or of a directory
+    * an image was found in does, checked at most once every CHECK_INTERVAL
+    * seconds; images added deeper down need an explicit rebuild(). Paths
+    * registered by hand take precedence over anything found on disk.
+    '''
+
+    EXTENSIONS = ("jpg", "jpeg", "png", "gif")
+    CHECK_INTERVAL:float = 2.0
+
+    roots:typing.Callable[[], typing.List[str]]
+    registered:typing.Dict[str, str]
+    _paths:typing.Dict[str, str] = None
+    _mtimes:typing.Dict[str, int]
+    # the directories _stale stats: the roots, plus those find() has hit in
+    _watched:typing.Dict[str, int]
+    _indexed_roots:typing.List[str] = None
+    _checked:float = 0.0
+
+    def __init__(self, roots:typing.Callable[[], typing.List[str]]):
+        '''
+        * @param roots - returns the directories to search, in priority order;
+        * called again on every staleness check
+        '''
+        self.roots = roots
+        self.registered = dict()
+        self._mtimes = dict()
+        self._watched = dict()
+
+    def register(self, name, path:str):
+        '''
+        * Uses path as the image for name, a class or class name.
+        '''
+        if isinstance(name, type):
+            name = name.__name__
+        self.registered[name] = path
+
+    def find(self, name:str) -> typing.Optional[str]:
+        path = self.registered.get(name)
+        if path is not None:
+            return path
+        if self._stale():
+            self.rebuild()
+        path = self._paths.get(name)
+        if path is not None:
+            directory = os.path.dirname(path)
+            if directory not in self._watched:
+                self._watched[directory] = self._mtimes.get(directory)
+        return path
+
+    def _stale(self) -> bool:
+        if self._paths is None:
+            return True
+        now = time.monotonic()
+        if now - self._checked < self.CHECK_INTERVAL:
+            return False
+        self._checked = now
+        if list(self.roots()) != self._indexed_roots:
+            return True
+        for directory, mtime in self._watched.items():
+            try:
+                if os.stat(directory).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def rebuild(self):
+        roots = list(self.roots())
+        rank = {ending: i for i, ending in enumerate(self.EXTENSIONS)}
+        best = dict()
+        mtimes = dict()
+        for root_rank, root in enumerate(roots):
+            stack = [root]
+            while stack:
+                directory = os.path.realpath(stack.pop())
+                # a directory reached through an earlier root already won
+                if directory in mtimes:
+                    continue
+                try:
+                    mtimes[directory] = os.stat(directory).st_mtime_ns
+                    with os.scandir(directory) as it:
+                        entries = list(it)
+                except OSError:
+                    continue
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                            continue
+                    except OSError:
+                        continue
+                    name, dot, ending = entry.name.rpartition('.')
+                    if not dot or ending not in rank:
+                        continue
+                    candidate = (root_rank, rank[ending], entry.path)
+                    if name not in best or candidate[:2] < best[name][:2]:
+                        best[name] = candidate
+        self._paths = {name: candidate[2] for name, candidate in best.items()}
+        self._mtimes = mtimes
+        self._watched = {
+            root: mtimes[root] for root in map(os.path.realpath, roots) if root in mtimes
+        }
+        self._indexed_roots = roots
+        self._checked = time.monotonic()
+
+
+def colorize(source:Image.Image, size:int, rgb:typing.Tuple[int, int, int]) -> Image.Image:
+    '''
+    * Tints a copy of the source image, scaled down to fit the cell, so its
+    * mid tones take on the given color.
+    '''
+    image = source.copy()
+    image.thumbnail((size, size))
+    greyscale = ImageOps.grayscale(image)
+    color = Color(*rgb)
+    h,s,v = color.hsv
+    white_map = Color.from_hsv(h,s,min(1.0, v*2))
+    colorized = ImageOps.colorize(
+        greyscale,
+        Color.GRAY15.rgb,
+        white_map.rgb,
+        mid=color.rgb,
+        midpoint=80
+    )
+    try:
+        a = image.getchannel('A')
+        colorized.putalpha(a)
+    except:
+        pass
+    return colorized
+
+
+class SpriteCache:
+    '''
+    * Colorized, rotated actor sprites, cached in memory (a bounded LRU) and
+    * on disk. Colors are rounded to multiples of color_step and directions
+    * to the nearest compass heading, so a Flower that darkens a little each
+    * step keeps reusing a handful of sprites. A miss renders all eight
+    * headings of a (source, size, color) at once. Files on disk are named
+    * after a hash of the source image's pixels, so an edited sprite never
+    * picks up stale renders.
+    '''
+
+    HEADINGS = tuple(range(Location.NORTH, Location.FULL_CIRCLE, Location.HALF_RIGHT))
+
+    directory:str
+    capacity:int
+    color_step:int
+    _sprites:collections.OrderedDict
+    _hashes:typing.Dict[int, tuple]
+    _scaled:typing.Dict[tuple, Image.Image]
+
+    def __init__(self, directory:str = None, capacity:int = 4096, color_step:int = 8):
+        '''
+        * @param directory - where sprites persist between runs; None keeps
+        * them in memory only
+        '''
+        self.directory = directory
+        self.capacity = capacity
+        self.color_step = color_step
+        self._sprites = collections.OrderedDict()
+        self._hashes = dict()
+        self._scaled = dict()
+
+    def quantize(self, color:Color) -> typing.Optional[typing.Tuple[int, int, int]]:
+        if not isinstance(color, Color):
+            return None
+        step = self.color_step
+        return tuple(min(255, (c + step // 2) // step * step) for c in color.rgb)
+
+    @staticmethod
+    def heading(direction:int) -> int:
+        return (
+            (int(direction) + Location.HALF_RIGHT // 2) % Location.FULL_CIRCLE
+        ) // Location.HALF_RIGHT * Location.HALF_RIGHT
+
+    def key(self, color:Color, direction:int) -> tuple:
+        '''
+        * @return the (color, heading) pair that decides which sprite is drawn
+        '''
+        rgb = self.quantize(color)
+        return rgb, self.heading(direction) if rgb is not None else None
+
+    def source_hash(self, source:Image.Image) -> str:
+        # sources are long-lived, so the hash is kept per image object
+        entry = self._hashes.get(id(source))
+        if entry is None or entry[0] is not source:
+            digest = hashlib.blake2b(digest_size=12)
+            digest.update(repr((source.mode, source.size)).encode())
+            digest.update(source.tobytes())
+            entry = (source, digest.hexdigest())
+            self._hashes[id(source)] = entry
+        return entry[1]
+
+    def get(self, source:Image.Image, size:int, color:Color, direction:int) -> Image.Image:
+        '''
+        * @return the sprite for an occupant of the given color and direction,
+        * drawn from source and scaled to fit a size x size cell
+        '''
+        rgb, heading = self.key(color, direction)
+        key = (self.source_hash(source), size, rgb, heading)
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            return sprite
+        sprite = self._load(key)
+        if sprite is None:
+            rendered = self._render(source, key)
+            for other_key, other in rendered.items():
+                self._save(other_key, other)
+                self._remember(other_key, other)
+            sprite = rendered[key]
+        self._remember(key, sprite)
+        return sprite
+
+    def clear(self):
+        self._sprites.clear()
+        self._scaled.clear()
+
+    def _render(self, source:Image.Image, key:tuple) -> typing.Dict[tuple, Image.Image]:
+        source_hash, size, rgb, _ = key
+        # every color of a class at one cell size starts from the same thumbnail
+        scaled = self._scaled.get((source_hash, size))
+        if scaled is None:
+            scaled = source.copy()
+            scaled.thumbnail((size, size))
+            self._scaled[source_hash, size] = scaled
+        if rgb is None:
+            return {key: scaled.copy()}
+        colorized = colorize(scaled, size, rgb)
+        return {
+            (source_hash, size, rgb, heading): colorized.rotate(-heading)
+            for heading in self.HEADINGS
+        }
+
+    def _remember(self, key:tuple, sprite:Image.Image):
+        self._sprites[key] = sprite
+        self._sprites.move_to_end(key)
+        while len(self._sprites) > self.capacity:
+            self._sprites.popitem(last=False)
+
+    def _path(self, key:tuple) -> str:
+        source_hash, size, rgb, heading = key
+        if rgb is None:
+            name = 'plain.png'
+        else:
+            name = '{:02x}{:02x}{:02x}-{:03d}.png'.format(*rgb, heading)
+        return os.path.join(self.directory, source_hash, str(size), name)
+
+    def _load(self, key:tuple) -> typing.Optional[Image.Image]:
+        if self.directory is None:
+            return None
+        try:
+            with Image.open(self._path(key)) as image:
+                image.load()
+                return image
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, key:tuple, sprite:Image.Image):
+        if self.directory is None:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # several viewers may share the cache, so never expose a partial file
+            temp = "{}.{}.tmp".format(path, os.getpid())
+            sprite.save(temp, format='PNG')
+            os.replace(temp, path)
+        except OSError:
+            pass # a read-only or full cache just means rendering again next time
@@ -0,0 +1,399 @@
+'''
+* A bounded grid that keeps its actors in typed arrays instead of as Python
+* objects. An actor put into a StoreGrid becomes, in place, a handle whose
+* location, direction, color and other fields read and write the arrays, so
+* act() and the rest of the Actor API run unchanged:
+*
+*   world = ActorWorld(StoreGrid(1000, 1000))
+*   world.add(Flower(), Location(3, 4))
+*
+* Colors are kept by value, and all actors of a store share one random
+* stream, the last one assigned to any of them.
+'''
+
+from gridworld.colors import Color
+from gridworld.grid import AbstractGrid, Location, Neighborhood
+from gridworld.snapshot import NO_COLOR, _pack
+
+import array
+import functools
+import random
+import typing
+import weakref
+
+
+class StoredActor:
+    '''
+    * Mixed in ahead of an actor's class to make a handle for its slot.
+    '''
+
+    # set on each handle class an ActorStore makes
+    _store:"ActorStore" = None
+    _actor_type:type = None
+
+    @property
+    def grid(self):
+        return self._store.grid
+
+    @grid.setter
+    def grid(self, grid):
+        if grid is not self._store.grid:
+            self._store.release(self, grid)
+
+    @property
+    def location(self) -> Location:
+        cell = self._store.cell[self._slot]
+        return Location.of(*divmod(cell, self._store.cols)) if cell >= 0 else None
+
+    @location.setter
+    def location(self, loc:Location):
+        self._store.cell[self._slot] = -1 if loc is None else loc.row * self._store.cols + loc.col
+
+    @property
+    def _direction(self) -> int:
+        return self._store.direction[self._slot]
+
+    @_direction.setter
+    def _direction(self, direction:int):
+        self._store.direction[self._slot] = direction
+
+    @property
+    def _color(self) -> Color:
+        return self._store.palette.get(self._store.color[self._slot])
+
+    @_color.setter
+    def _color(self, color:Color):
+        self._store.color[self._slot] = self._store.intern(color)
+
+    @property
+    def rng(self) -> random.Random:
+        return self._store.rng
+
+    @rng.setter
+    def rng(self, rng:random.Random):
+        self._store.rng = rng
+
+
+class ActorStore:
+    '''
+    * Columns of actor state for one StoreGrid, indexed by slot. A slot is
+    * reused once its actor leaves the grid; serial counts the reuses.
+    '''
+
+    cell:array.array
+    direction:array.array
+    color:array.array
+    kind:array.array
+    serial:array.array
+    # kind -> the actor class, and the handle class made for it
+    classes:typing.List[type]
+    handle_types:typing.List[type]
+    # slot -> fields beyond the ones in the columns
+    extras:typing.Dict[int, dict]
+    # packed RGB -> the Color handed back for it
+    palette:typing.Dict[int, Color]
+
+    def __init__(self, grid:"StoreGrid"):
+        self.grid = grid
+        self.cols = grid.col_count
+        self.cell = array.array('i')
+        self.direction = array.array('H')
+        self.color = array.array('I')
+        self.kind = array.array('H')
+        self.serial = array.array('I')
+        self.classes = list()
+        self.handle_types = list()
+        self._kinds = dict()
+        self.extras = dict()
+        self.palette = dict()
+        self.free = list()
+        self.rng = None
+        self._handles = dict()
+
+    def __len__(self) -> int:
+        return len(self.cell) - len(self.free)
+
+    def intern(self, color:Color) -> int:
+        packed = _pack(color)
+        if packed != NO_COLOR and packed not in self.palette:
+            self.palette[packed] = color
+        return packed
+
+    def _kind(self, cls:type) -> int:
+        kind = self._kinds.get(cls)
+        if kind is None:
+            handle_type = type(cls.__name__, (StoredActor, cls), {
+                '__module__': cls.__module__,
+                '__qualname__': cls.__qualname__,
+                '_store': self,
+                '_actor_type': cls,
+            })
+            kind = self._kinds[cls] = self._kinds[handle_type] = len(self.classes)
+            self.classes.append(cls)
+            self.handle_types.append(handle_type)
+        return kind
+
+    def absorb(self, actor, cell:int) -> int:
+        '''
+        * Moves actor's state into a fresh slot and makes it the handle for it.
+        * @return the slot
+        '''
+        if isinstance(actor, StoredActor):
+            # a handle from another StoreGrid leaves that one first
+            actor._store.release(actor, None)
+        fields = actor.__dict__
+        direction = fields.pop('_direction', 0)
+        color = fields.pop('_color', None)
+        rng = fields.pop('rng', None)
+        fields.pop('grid', None)
+        fields.pop('location', None)
+        kind = self._kind(type(actor))
+        if rng is not None:
+            self.rng = rng
+        if self.free:
+            slot = self.free.pop()
+            self.cell[slot] = cell
+            self.direction[slot] = direction
+            self.color[slot] = self.intern(color)
+            self.kind[slot] = kind
+        else:
+            slot = len(self.cell)
+            self.cell.append(cell)
+            self.direction.append(direction)
+            self.color.append(self.intern(color))
+            self.kind.append(kind)
+            self.serial.append(0)
+        fields['_slot'] = slot
+        self._keep(slot, fields)
+        actor.__class__ = self.handle_types[kind]
+        self._track(slot, actor, fields)
+        return slot
+
+    def handle(self, slot:int):
+        ref = self._handles.get(slot)
+        if ref is not None:
+            handle = ref()
+            if handle is not None:
+                return handle
+        handle_type = self.handle_types[self.kind[slot]]
+        handle = handle_type.__new__(handle_type)
+        fields = self.extras.get(slot)
+        if fields is None:
+            fields = {'_slot': slot}
+        handle.__dict__ = fields
+        self._track(slot, handle, fields)
+        return handle
+
+    def _track(self, slot:int, handle, fields:dict):
+        self._handles[slot] = weakref.ref(handle, functools.partial(self._retire, slot, fields))
+
+    def _retire(self, slot:int, fields:dict, ref):
+        # the last reference to a handle went away
+        if self._handles.get(slot) is not ref:
+            return
+        del self._handles[slot]
+        if self.grid.slot_at(self.cell[slot]) != slot:
+            # taken off the grid and then forgotten
+            self._free(slot)
+        else:
+            self._keep(slot, fields)
+
+    def _keep(self, slot:int, fields:dict):
+        # fields that only repeat the class default, like a Critter's
+        # cleared neighbourhood, are not worth a dict per actor
+        if len(fields) == 1:
+            self.extras.pop(slot, None)
+            return
+        cls = self.classes[self.kind[slot]]
+        for name in [name for name, value in fields.items() if getattr(cls, name, fields) is value]:
+            del fields[name]
+        if len(fields) > 1:
+            self.extras[slot] = fields
+        else:
+            self.extras.pop(slot, None)
+
+    def _free(self, slot:int):
+        self.extras.pop(slot, None)
+        self.cell[slot] = -1
+        self.serial[slot] += 1
+        self.free.append(slot)
+
+    def release(self, handle, grid):
+        '''
+        * Turns handle back into a plain actor, holding what its slot held,
+        * and frees the slot.
+        '''
+        slot = handle._slot
+        fields = handle.__dict__
+        state = {name: value for name, value in fields.items() if name != '_slot'}
+        cell = self.cell[slot]
+        state['location'] = Location.of(*divmod(cell, self.cols)) if cell >= 0 else None
+        state['_direction'] = self.direction[slot]
+        state['_color'] = self.palette.get(self.color[slot])
+        state['rng'] = self.rng
+        state['grid'] = grid
+        if self.grid.slot_at(cell) == slot:
+            self.grid.clear_cell(cell)
+        fields.clear()
+        del self._handles[slot]
+        self._free(slot)
+        handle.__class__ = self.classes[self.kind[slot]]
+        handle.__dict__ = state
+
+
+class StoreGrid(AbstractGrid):
+    '''
+    * A bounded grid whose occupants live in an ActorStore; see the module
+    * docstring. Each cell holds a slot number, or -1 when it is empty. An
+    * actor removed from the grid turns back into a plain instance of its class.
+    '''
+
+    store:ActorStore
+    cells:array.array
+
+    def __init__(self, rows:int=10, cols:int=10):
+        if rows <= 0:
+            raise ValueError("rows <= 0")
+        if cols <= 0:
+            raise ValueError("cols <= 0")
+        self._rows = rows
+        self._cols = cols
+        self.cells = array.array('i', [-1]) * (rows * cols)
+        self.store = ActorStore(self)
+
+    @property
+    def rng(self) -> random.Random:
+        return self.store.rng
+
+    @rng.setter
+    def rng(self, rng:random.Random):
+        self.store.rng = rng
+
+    @property
+    def row_count(self) -> int:
+        return self._rows
+
+    @property
+    def col_count(self) -> int:
+        return self._cols
+
+    def is_valid(self, loc:Location) -> bool:
+        return 0 <= loc.row < self._rows and 0 <= loc.col < self._cols
+
+    def _cell(self, loc:Location) -> int:
+        r, c = loc.row, loc.col
+        if not (0 <= r < self._rows and 0 <= c < self._cols):
+            raise ValueError("Location" + str(loc) + "is not valid")
+        return r * self._cols + c
+
+    def slot_at(self, cell:int) -> int:
+        return self.cells[cell] if cell >= 0 else -1
+
+    def clear_cell(self, cell:int):
+        self.cells[cell] = -1
+        if self._change_sets:
+            self._record_change(Location.of(*divmod(cell, self._cols)))
+
+    @property
+    def occupied_locations(self):
+        cols = self._cols
+        for cell, slot in enumerate(self.cells):
+            if slot >= 0:
+                yield Location.of(*divmod(cell, cols))
+
+    def occupied_locations_in(self, top:int, left:int, bottom:int, right:int) -> typing.Iterable[Location]:
+        top, left = max(top, 0), max(left, 0)
+        bottom, right = min(bottom, self._rows), min(right, self._cols)
+        cells = self.cells
+        for r in range(top, bottom):
+            base = r * self._cols
+            for c in range(left, right):
+                if cells[base + c] >= 0:
+                    yield Location.of(r, c)
+
+    @property
+    def occupants(self) -> list:
+        handle = self.store.handle
+        return [handle(slot) for slot in self.cells if slot >= 0]
+
+    def iter_occupants(self) -> typing.Iterator:
+        '''
+        * Yields the actors on the grid now, in row-major order, one handle
+        * at a time; those that leave the grid before their turn are skipped.
+        '''
+        store = self.store
+        slots = array.array('i', (slot for slot in self.cells if slot >= 0))
+        serials = array.array('I', map(store.serial.__getitem__, slots))
+        for slot, serial in zip(slots, serials):
+            if store.serial[slot] == serial and self.slot_at(store.cell[slot]) == slot:
+                yield store.handle(slot)
+
+    @property
+    def empty_count(self) -> int:
+        return self.cells.count(-1)
+
+    def random_empty_location(self, generator:random.Random) -> Location:
+        empty = [cell for cell, slot in enumerate(self.cells) if slot < 0]
+        if len(empty) == 0:
+            return None
+        return Location.of(*divmod(empty[int(generator.random() * len(empty))], self._cols))
+
+    def get(self, loc:Location):
+        slot = self.cells[self._cell(loc)]
+        return None if slot < 0 else self.store.handle(slot)
+
+    def put(self, loc:Location, obj):
+        if obj is None:
+            raise ValueError("obj is None")
+        cell = self._cell(loc)
+        old_occupant = self.get(loc)
+        if getattr(type(obj), '_store', None) is self.store:
+            slot = obj._slot
+            self.store.cell[slot] = cell
+        else:
+            slot = self.store.absorb(obj, cell)
+        self.cells[cell] = slot
+        if self._change_sets:
+            self._record_change(loc)
+        return old_occupant
+
+    def remove(self, loc:Location):
+        cell = self._cell(loc)
+        old_occupant = self.get(loc)
+        self.cells[cell] = -1
+        if self._change_sets:
+            self._record_change(loc)
+        return old_occupant
+
+    def _is_empty(self, loc:Location) -> bool:
+        return self.cells[loc.row * self._cols + loc.col] < 0
+
+    def empty_adjacent_locations(self, loc:Location) -> typing.Iterable[Location]:
+        for n in self.valid_adjacent_locations(loc):
+            if self._is_empty(n):
+                yield n
+
+    def occupied_adjacent_locations(self, loc:Location) -> typing.Iterable[Location]:
+        for n in self.valid_adjacent_locations(loc):
+            if not self._is_empty(n):
+                yield n
+
+    def neighborhoods(self, locs:typing.Iterable[Location]) -> typing.List[Neighborhood]:
+        # the slots alone tell empty from occupied, so no handles are made
+        rows, cols = self._rows, self._cols
+        cells = self.cells
+        hoods = list()
+        for loc in locs:
+            valid = list()
+            occupied = list()
+            empty = list()
+            for n in loc.getAdjacentLocations():
+                r, c = n.row, n.col
+                if 0 <= r < rows and 0 <= c < cols:
+                    valid.append(n)
+                    if cells[r * cols + c] < 0:
+                        empty.append(n)
+                    else:
+                        occupied.append(n)
+            hoods.append(Neighborhood(loc, valid, occupied, empty))
+        return hoods
@@ -0,0 +1,211 @@
+'''
+* Runs one ActorWorld scenario over many seeds and grid sizes in a process
+* pool, without a GUI. A (scenario, seed, size) run always gives the same
+* grid, and its digest is part of the summary.
+'''
+
+from gridworld.actor import ActorWorld
+from gridworld.colors import Color
+from gridworld.grid import Grid, BoundedGrid, IndexedBoundedGrid, UnboundedGrid, TiledUnboundedGrid
+from gridworld.store import StoreGrid
+
+import argparse
+import collections
+import hashlib
+import importlib
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+import typing
+
+GRID_TYPES = {
+    cls.__name__: cls
+    for cls in (BoundedGrid, IndexedBoundedGrid, UnboundedGrid, TiledUnboundedGrid, StoreGrid)
+}
+# the grid types a size applies to; unbounded grids have none
+SIZED_GRID_TYPES = frozenset(
+    name for name, cls in GRID_TYPES.items() if issubclass(cls, (BoundedGrid, StoreGrid))
+)
+
+
+def resolve_type(name:str) -> type:
+    module_name, _, class_name = name.rpartition('.')
+    module = importlib.import_module(module_name or 'gridworld.actor')
+    return getattr(module, class_name)
+
+
+def build_grid(spec:dict) -> Grid:
+    spec = dict(spec)
+    grid_type = GRID_TYPES[spec.pop('type', 'BoundedGrid')]
+    return grid_type(**spec)
+
+
+def build_world(scenario:dict, seed:int) -> ActorWorld:
+    '''
+    * @param scenario e.g. {"grid": {"type": "BoundedGrid", "rows": 50, "cols": 50},
+    *     "actors": [{"type": "critters.CrabCritter", "count": 20}], "steps": 500};
+    *     actor types without a module are looked up in gridworld.actor
+    '''
+    world = ActorWorld(build_grid(scenario.get('grid', dict())), seed)
+    for spec in scenario.get('actors', ()):
+        actor_type = resolve_type(spec['type'])
+        kwargs = dict(spec.get('kwargs', dict()))
+        if isinstance(kwargs.get('color'), str):
+            kwargs['color'] = Color.colordict[kwargs['color']]
+        for _ in range(spec.get('count', 1)):
+            world.add(actor_type(**kwargs))
+    if scenario.get('engine', 'object') == 'array':
+        world.use_array_engine()
+    return world
+
+
+def population(world:ActorWorld) -> typing.Dict[str, int]:
+    grid = world.grid
+    counts = collections.Counter(
+        grid.get(loc).__class__.__name__ for loc in grid.occupied_locations
+    )
+    return dict(sorted(counts.items()))
+
+
+def digest(world:ActorWorld) -> str:
+    '''
+    * @return a hash of every occupant's location, class, direction and color;
+    * equal grids give equal digests on any machine or worker
+    '''
+    h = hashlib.blake2b(digest_size=16)
+    grid = world.grid
+    for loc in sorted(grid.occupied_locations, key=lambda l: (l.row, l.col)):
+        a = grid.get(loc)
+        h.update(repr((loc.row, loc.col, a.__class__.__name__, a.direction, a.color.rgb)).encode())
+    return h.hexdigest()
+
+
+def run_scenario(scenario:dict, seed:int) -> dict:
+    world = build_world(scenario, seed)
+    steps = scenario.get('steps', 100)
+    start = time.perf_counter()
+    for _ in range(steps):
+        world.step()
+    elapsed = time.perf_counter() - start
+    if world.engine is not None:
+        world.use_array_engine(False)
+    grid = world.grid
+    return {
+        'scenario': scenario.get('name'),
+        'seed': seed,
+        'rows': grid.row_count,
+        'cols': grid.col_count,
+        'steps': steps,
+        'seconds': elapsed,
+        'steps_per_second': steps / elapsed if elapsed > 0 else None,
+        'population': population(world),
+        'digest': digest(world),
+    }
+
+
+def check_scenario(scenario:dict, seed:int) -> dict:
+    '''
+    * Runs the scenario twice with the same seed and records whether both
+    * runs left bit-identical grids.
+    '''
+    first = run_scenario(scenario, seed)
+    second = run_scenario(scenario, seed)
+    first['reproducible'] = first['digest'] == second['digest']
+    return first
+
+
+def _run_task(task:typing.Tuple[dict, int, bool]) -> dict:
+    scenario, seed, check = task
+    try:
+        if check:
+            return check_scenario(scenario, seed)
+        return run_scenario(scenario, seed)
+    except Exception as e:
+        return {'scenario': scenario.get('name'), 'seed': seed, 'error': repr(e)}
+
+
+def expand(scenarios:typing.Iterable[dict], seeds:typing.Iterable[int],
+           sizes:typing.Iterable[typing.Tuple[int, int]] = None) -> typing.Iterator[typing.Tuple[dict, int]]:
+    '''
+    * @return every (scenario, seed) pair, with one copy of each scenario per
+    * grid size when sizes are given; a scenario on an unbounded grid is
+    * left as it is
+    '''
+    seeds = list(seeds)
+    for scenario in scenarios:
+        variants = [scenario]
+        if sizes and scenario.get('grid', dict()).get('type', 'BoundedGrid') in SIZED_GRID_TYPES:
+            variants = list()
+            for rows, cols in sizes:
+                variant = dict(scenario)
+                variant['grid'] = dict(scenario.get('grid', dict()), rows=rows, cols=cols)
+                variants.append(variant)
+        for variant, seed in itertools.product(variants, seeds):
+            yield variant, seed
+
+
+def run_sweep(scenarios:typing.Iterable[dict], seeds:typing.Iterable[int],
+              output:typing.TextIO, sizes:typing.Iterable[typing.Tuple[int, int]] = None,
+              processes:int = None, check:bool = False) -> int:
+    '''
+    * Runs every task on a pool with one worker per core (by default) and
+    * writes one JSON line per run to output as soon as it finishes.
+    * @return the number of runs written
+    '''
+    tasks = ((scenario, seed, check) for scenario, seed in expand(scenarios, seeds, sizes))
+    written = 0
+    with multiprocessing.Pool(processes or os.cpu_count()) as pool:
+        for result in pool.imap_unordered(_run_task, tasks, chunksize=1):
+            output.write(json.dumps(result) + '\n')
+            output.flush()
+            written += 1
+    return written
+
+
+def _parse_range(text:str) -> typing.List[int]:
+    values = list()
+    for part in text.split(','):
+        low, _, high = part.partition('-')
+        values.extend(range(int(low), int(high) + 1) if high else [int(low)])
+    return values
+
+
+def _parse_sizes(text:str) -> typing.List[typing.Tuple[int, int]]:
+    sizes = list()
+    for part in text.split(','):
+        rows, _, cols = part.partition('x')
+        sizes.append((int(rows), int(cols or rows)))
+    return sizes
+
+
+def main(argv:typing.List[str]):
+    parser = argparse.ArgumentParser(prog='python -m gridworld.sweep')
+    parser.add_argument('scenarios', help='JSON file holding a scenario or a list of them')
+    parser.add_argument('--seeds', default='0', help='e.g. 0-99 or 1,5,9')
+    parser.add_argument('--sizes', default=None, help='bounded grid sizes, e.g. 50x50,100x100')
+    parser.add_argument('--steps', type=int, default=None, help='override the steps of every scenario')
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--check', action='store_true', help='run every task twice and compare the grids')
+    parser.add_argument('--out', default='-', help='JSON lines output file, - for stdout')
+    args = parser.parse_args(argv)
+
+    with open(args.scenarios) as f:
+        scenarios = json.load(f)
+    if isinstance(scenarios, dict):
+        scenarios = [scenarios]
+    if args.steps is not None:
+        scenarios = [dict(s, steps=args.steps) for s in scenarios]
+    sizes = _parse_sizes(args.sizes) if args.sizes else None
+
+    if args.out == '-':
+        run_sweep(scenarios, _parse_range(args.seeds), sys.stdout, sizes, args.processes, args.check)
+    else:
+        with open(args.out, 'a') as output:
+            run_sweep(scenarios, _parse_range(args.seeds), output, sizes, args.processes, args.check)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
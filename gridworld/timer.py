@@ -1,6 +1,7 @@
 from threading import Event, Thread
-from time import time, sleep
+from time import time, sleep, monotonic
 from typing import Callable
+import math
 
 class RepeatTimerSimple(Thread):
     delay_ms:int
@@ -52,7 +53,122 @@ class RepeatTimerBusyWait(Thread):
         self.stopped = True
         self.join(0.01)
 
-RepeatTimer = RepeatTimerSimple
+
+class TickStats:
+    '''
+    * Running statistics of a RepeatTimerScheduled. Lateness is how long after
+    * its deadline a tick actually started; jitter is its standard deviation.
+    '''
+
+    ticks:int
+    # times the schedule fell behind; the catch-up ticks that follow one
+    # are not counted again
+    overruns:int
+    skipped:int
+    max_lateness:float
+
+    def __init__(self):
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.max_lateness = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def record(self, lateness:float):
+        self.ticks += 1
+        delta = lateness - self._mean
+        self._mean += delta / self.ticks
+        self._m2 += delta * (lateness - self._mean)
+        self.max_lateness = max(self.max_lateness, lateness)
+
+    @property
+    def mean_lateness(self) -> float:
+        return self._mean
+
+    @property
+    def jitter(self) -> float:
+        return math.sqrt(self._m2 / self.ticks) if self.ticks else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            'ticks': self.ticks,
+            'overruns': self.overruns,
+            'skipped': self.skipped,
+            'mean_lateness_ms': self.mean_lateness * 1000,
+            'max_lateness_ms': self.max_lateness * 1000,
+            'jitter_ms': self.jitter * 1000,
+        }
+
+
+class RepeatTimerScheduled(Thread):
+    '''
+    * Calls back at a fixed rate: tick n is due at start + n * delay_ms, no
+    * matter how long earlier callbacks took, and the thread sleeps on the OS
+    * timer in between. When a callback runs past one or more deadlines, the
+    * policy decides what happens to the ticks that were missed:
+    *   CATCH_UP - run them back to back, up to max_catch_up of them, and
+    *              drop the rest
+    *   SKIP     - drop them and carry on with the next deadline still ahead
+    * Changing delay_ms restarts the schedule from the current time.
+    '''
+
+    CATCH_UP, SKIP = 'catch_up', 'skip'
+
+    delay_ms:int
+    policy:str
+    max_catch_up:int
+    stats:TickStats
+
+    def __init__(self, callback:Callable[[], None], delay_ms = 500, policy:str = SKIP, max_catch_up:int = 5):
+        super().__init__(daemon=True)
+        if policy not in (self.CATCH_UP, self.SKIP):
+            raise ValueError("Unknown overrun policy: " + str(policy))
+        self.stopped = Event()
+        self.delay_ms = delay_ms
+        self.callback = callback
+        self.policy = policy
+        self.max_catch_up = max_catch_up
+        self.stats = TickStats()
+
+    def run(self):
+        delay_ms = self.delay_ms
+        period = delay_ms / 1000
+        deadline = monotonic() + period
+        behind_schedule = False
+        while not self.stopped.is_set():
+            if self.delay_ms != delay_ms:
+                delay_ms = self.delay_ms
+                period = delay_ms / 1000
+                deadline = monotonic() + period
+                behind_schedule = False
+            timeout = deadline - monotonic()
+            if timeout > 0 and self.stopped.wait(timeout):
+                break
+            self.stats.record(max(0.0, monotonic() - deadline))
+            self.callback()
+            deadline += period
+            behind = monotonic() - deadline
+            if behind > 0 and period > 0:
+                if not behind_schedule:
+                    self.stats.overruns += 1
+                    behind_schedule = True
+                missed = math.ceil(behind / period)
+                if self.policy == self.SKIP:
+                    dropped = missed
+                else:
+                    # up to max_catch_up missed ticks run back to back
+                    dropped = max(0, missed - self.max_catch_up)
+                self.stats.skipped += dropped
+                deadline += dropped * period
+            else:
+                behind_schedule = False
+
+    def stop(self):
+        self.stopped.set()
+        self.join(0.01)
+
+RepeatTimer = RepeatTimerScheduled
 
 if __name__ == "__main__":
     pass
\ No newline at end of file
@@ -1,6 +1,49 @@
-from gridworld.grid import Location, Grid, BoundedGrid, UnboundedGrid
+from gridworld.grid import Location, Grid, BoundedGrid, IndexedBoundedGrid, UnboundedGrid, TiledUnboundedGrid
+import hashlib
 import random
-import tkinter as tk
+import typing
+
+
+def derive_seed(seed:int, *path) -> int:
+    '''
+    * Derives an independent seed from a parent seed and a path such as a
+    * worker or run index, so parallel streams never overlap or share state.
+    '''
+    data = repr((seed,) + path).encode()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=16).digest(), 'big')
+
+
+MASK64 = (1 << 64) - 1
+# splitmix64's finalizer; gridworld.engine hashes cells with the same steps
+MIX_INCREMENT = 0x9E3779B97F4A7C15
+MIX_STEPS = ((30, 0xBF58476D1CE4E5B9), (27, 0x94D049BB133111EB))
+MIX_FINAL_SHIFT = 31
+
+
+class WorldRandom(random.Random):
+    '''
+    * A world's random stream, plus a key drawn from it at the start of every
+    * step. randbelow_at hashes that key with a location, so the draw an actor
+    * makes there does not depend on how many draws were made before it, and
+    * actors can be stepped in any order or all at once.
+    '''
+
+    step_key:int = 0
+
+    def next_step(self):
+        # ActorWorld.step calls this before any actor acts
+        self.step_key = self.getrandbits(64)
+
+    def randbelow_at(self, n:int, loc:Location) -> int:
+        '''
+        * @return a number in 0..n-1 fixed by this step's key and loc
+        '''
+        z = self.step_key ^ ((loc.row & 0xFFFFFFFF) << 32) ^ (loc.col & 0xFFFFFFFF)
+        z = (z + MIX_INCREMENT) & MASK64
+        for shift, multiplier in MIX_STEPS:
+            z = ((z ^ (z >> shift)) * multiplier) & MASK64
+        z ^= z >> MIX_FINAL_SHIFT
+        return ((z >> 32) * n) >> 32
 
 
 class World:
@@ -11,19 +54,58 @@ class World:
     message: str = None
     frame = None
 
-    generator:random.Random = random.Random()
+    generator:WorldRandom = None
+    seed:int = None
 
     DEFAULT_ROWS = 10
     DEFAULT_COLS = 10
 
-    def __init__(self, g:Grid=None):
+    def __init__(self, g:Grid=None, seed:int=None):
+        self.generator = WorldRandom()
+        self.reseed(seed)
         if g is None:
             g = BoundedGrid(self.DEFAULT_ROWS, self.DEFAULT_COLS)
         self.grid = g
         self.grid_types = dict()
         self.occupant_types = dict()
         self.add_grid_type(BoundedGrid)
+        self.add_grid_type(IndexedBoundedGrid)
         self.add_grid_type(UnboundedGrid)
+        self.add_grid_type(TiledUnboundedGrid)
+
+    def reseed(self, seed:int = None):
+        '''
+        * Restarts this world's random stream. Without a seed a fresh one is
+        * drawn from the OS and kept in self.seed, so any run can be replayed.
+        '''
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.seed = seed
+        self.generator.seed(seed)
+
+    def split(self, count:int) -> typing.List[WorldRandom]:
+        '''
+        * @return count independent streams derived from this world's seed,
+        * e.g. one per worker process
+        '''
+        return [WorldRandom(derive_seed(self.seed, i)) for i in range(count)]
+
+    def snapshot(self, path:str):
+        '''
+        * Saves this world, its grid, its random state and every occupant to
+        * path in the columnar format of gridworld.snapshot.
+        '''
+        from gridworld.snapshot import save
+        save(self, path)
+
+    @classmethod
+    def restore(cls, path:str) -> "World":
+        '''
+        * @return the world saved to path by snapshot, ready to step on from
+        * where it was saved
+        '''
+        from gridworld.snapshot import restore
+        return restore(path, cls)
 
     def show(self):
         if self.frame is None:
@@ -38,10 +120,12 @@ class World:
     @grid.setter
     def grid(self, newGrid:Grid):
         self._grid = newGrid
+        if newGrid is not None:
+            newGrid.rng = self.generator
         self.repaint()
 
     def add_grid_type(self, grid_type:type):
-        qual_class_name = grid_type.__module__ + '.' + grid_type.__class__.__name__
+        qual_class_name = grid_type.__module__ + '.' + grid_type.__name__
         self.grid_types[qual_class_name] = grid_type
 
     @property
@@ -66,15 +150,7 @@ class World:
         rows = self.grid.row_count
         cols = self.grid.col_count
         if rows > 0 and cols > 0: # bounded grid
-            emptyLocs = list()
-            for r, row in enumerate(self.grid.occupant_array):
-                for c, item in enumerate(row):
-                    if item is None:
-                        emptyLocs.append(Location(r,c))
-            if(len(emptyLocs) == 0):
-                return None
-            r = int(self.generator.random() * len(emptyLocs))
-            return emptyLocs[r]
+            return self.grid.random_empty_location(self.generator)
         else:
             while True:
                 r = None
@@ -88,7 +164,7 @@ class World:
                 else:
                     c = self.generator.randint(0, cols)
                 loc = Location(r,c)
-                if(self.grid.isValid(loc) and self.grid.get(loc) is None):
+                if(self.grid.is_valid(loc) and self.grid.get(loc) is None):
                     return loc
 
     def add(self, occupant, loc:Location):
@@ -105,29 +181,41 @@ class World:
         self.repaint()
         return r
 
+    def flush(self):
+        '''
+        * Brings the grid up to date with any state kept outside of it, before
+        * the grid is drawn or inspected.
+        '''
+        pass
+
+    def flush_range(self, top:int, left:int, bottom:int, right:int):
+        '''
+        * Like flush(), for when only rows top..bottom-1 and columns
+        * left..right-1 will be read; the rest of the grid may stay behind
+        * until the next flush().
+        '''
+        self.flush()
+
     def repaint(self): 
         if self.frame != None:
             self.frame.rerender()
 
     def __str__(self):
         s = "World:\n"
-        gr = self.grid()
+        gr = self.grid
         rmin = 0
-        rmax = gr.rowCount
+        rmax = gr.row_count
         cmin = 0
-        cmax = gr.colCount
+        cmax = gr.col_count
         if rmax < 0 or cmax < 0:
-            for loc in gr.occupiedLocations:
-                r = loc.row
-                c = loc.col
-                if r < rmin:
-                    rmin = r
-                if r > rmax:
-                    rmax = r
-                if c < cmin:
-                    cmin = c
-                if c > cmax:
-                    cmax = c
+            rmax = 0
+            cmax = 0
+            bounds = gr.occupied_bounds
+            if bounds is not None:
+                rmin = min(rmin, bounds[0])
+                cmin = min(cmin, bounds[1])
+                rmax = max(rmax, bounds[2] + 1)
+                cmax = max(cmax, bounds[3] + 1)
 
         s += "#" * (cmax-cmin) + "\n"
         for i in range(rmin, rmax):
@@ -140,18 +228,3 @@ class World:
             s += "\n"
         s += "#" * (cmax-cmin)
         return s
-
-
-    
-
-    
-
-
-
-
-                            
-
-
-
-
-        
@@ -0,0 +1,32 @@
+from gridworld.colors import Color
+
+import unittest
+
+
+class ColorTest(unittest.TestCase):
+
+    def test_named_color_is_not_registered(self):
+        color = Color(10, 20, 30, name='unfiled')
+        self.assertIs(Color(10, 20, 30, name='unfiled'), color)
+        self.assertNotIn('unfiled', Color.colordict)
+        self.assertFalse(hasattr(Color, 'UNFILED'))
+
+    def test_named_color_does_not_replace_builtin(self):
+        Color(1, 2, 3, name='RED')
+        self.assertEqual(Color.RED.rgb, (255, 0, 0))
+        self.assertEqual(Color.colordict['red'].rgb, (255, 0, 0))
+
+    def test_register(self):
+        color = Color.register(Color(10, 20, 40, name='filed'))
+        self.assertIs(Color.FILED, color)
+        self.assertIs(Color.colordict['filed'], color)
+        with self.assertRaises(ValueError):
+            Color.register(Color(1, 2, 3, name='red'))
+
+    def test_colordict_on_instance(self):
+        self.assertIs(Color.RED.colordict, Color.colordict)
+        self.assertIs(Color(1, 2, 3).colordict['BLUE'], Color.BLUE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+from gridworld.actor import Actor, ActorWorld, Bug, Critter, Flower, Rock
+from gridworld.colors import Color
+from gridworld.grid import BoundedGrid, Location
+
+import random
+import unittest
+
+
+def build_world(rows:int, cols:int, count:int, seed:int) -> ActorWorld:
+    layout = random.Random(seed)
+    grid = BoundedGrid(rows, cols)
+    for cell in layout.sample(range(rows * cols), count):
+        actor = layout.choice((Actor, Bug, Bug, Rock, Flower, Critter, Critter))()
+        actor.color = Color(layout.randrange(256), layout.randrange(256), layout.randrange(256))
+        actor.direction = layout.randrange(0, Location.FULL_CIRCLE, Location.HALF_RIGHT)
+        actor.put_self_in_grid(grid, Location(*divmod(cell, cols)))
+    return ActorWorld(grid, seed)
+
+
+def contents(world:ActorWorld) -> list:
+    grid = world.grid
+    return [
+        (loc, type(grid.get(loc)), grid.get(loc).direction, grid.get(loc).color.rgb)
+        for loc in grid.occupied_locations
+    ]
+
+
+class ArrayEngineTest(unittest.TestCase):
+
+    def assertSameRun(self, rows:int, cols:int, count:int, seed:int, steps:int = 10):
+        expected = build_world(rows, cols, count, seed)
+        actual = build_world(rows, cols, count, seed)
+        actual.use_array_engine()
+        for _ in range(steps):
+            expected.step()
+            actual.step()
+        actual.use_array_engine(False)
+        self.assertEqual(contents(expected), contents(actual))
+
+    def test_small_world_matches_object_path(self):
+        for seed in range(5):
+            self.assertSameRun(10, 10, 40, seed)
+
+    def test_waves_match_object_path(self):
+        for seed in range(3):
+            self.assertSameRun(60, 60, 900, seed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,23 @@
+from gridworld.actor import ActorWorld, Bug
+from gridworld.grid import BoundedGrid, Location
+
+import unittest
+
+
+class StepProfilerTest(unittest.TestCase):
+
+    def test_follows_a_replaced_grid(self):
+        world = ActorWorld(BoundedGrid(5, 5), 1)
+        profiler = world.enable_profiling()
+        old = world.grid
+        grid = BoundedGrid(5, 5)
+        Bug().put_self_in_grid(grid, Location(4, 4))
+        world.grid = grid
+        world.step()
+        self.assertIs(profiler.grid, grid)
+        self.assertNotIn('get', old.__dict__)
+        self.assertGreater(profiler.grid_ops['get'][0], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
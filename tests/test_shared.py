@@ -0,0 +1,57 @@
+from gridworld.actor import ActorWorld, Bug, Rock
+from gridworld.grid import Location
+from gridworld.shared import SharedBoundedGrid, SharedGridReader
+
+import unittest
+
+
+class SharedGridTest(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = SharedBoundedGrid(5, 5, actor_ids=True)
+        self.world = ActorWorld(self.grid, 1)
+        self.reader = SharedGridReader(self.grid.name)
+
+    def tearDown(self):
+        self.reader.close()
+        self.grid.close()
+
+    def test_read_after_add(self):
+        self.world.add(Rock(), Location(1, 2))
+        self.assertEqual(self.grid.generation % 2, 0)
+        generation, columns = self.reader.read(timeout=0.1)
+        self.assertEqual(generation, self.grid.generation)
+        self.assertEqual(self.reader.types()[columns['type'][1, 2]], 'gridworld.actor.Rock')
+
+    def test_read_after_remove(self):
+        self.world.add(Rock(), Location(1, 2))
+        self.world.remove(Location(1, 2))
+        _, columns = self.reader.read(timeout=0.1)
+        self.assertEqual(columns['type'][1, 2], 0)
+
+    def test_step_publishes_once(self):
+        self.world.add(Bug(), Location(4, 4))
+        before = self.grid.generation
+        self.world.step()
+        self.assertEqual(self.grid.generation, before + 2)
+        _, columns = self.reader.read(timeout=0.1)
+        self.assertEqual(self.reader.types()[columns['type'][3, 4]], 'gridworld.actor.Bug')
+
+    def test_actor_id_follows_the_actor(self):
+        bug = Bug()
+        self.world.add(bug, Location(4, 4))
+        self.world.add(Rock(), Location(0, 0))
+        _, columns = self.reader.read(timeout=0.1)
+        first = columns['actor_id'][4, 4]
+        self.assertNotEqual(first, columns['actor_id'][0, 0])
+        self.world.step()
+        _, columns = self.reader.read(timeout=0.1)
+        self.assertEqual(columns['actor_id'][3, 4], first)
+
+    def test_parallel_engine_is_refused(self):
+        with self.assertRaises(ValueError):
+            self.world.use_parallel_engine(workers=1)
+
+
+if __name__ == '__main__':
+    unittest.main()